@@ -1,5 +1,7 @@
 """Agents package."""
+from .mention_matcher import MentionMatcher
+from .phrase_matcher import PhraseMatcher
 from .sentiment_agent import SentimentAgent, sentiment_agent
 from .browser_scout import BrowserScout, browser_scout
 
-__all__ = ["SentimentAgent", "sentiment_agent", "BrowserScout", "browser_scout"]
+__all__ = ["MentionMatcher", "PhraseMatcher", "SentimentAgent", "sentiment_agent", "BrowserScout", "browser_scout"]
@@ -4,9 +4,13 @@ Uses official APIs (OpenAI, Google AI, Perplexity) for reliable access.
 Includes mock data fallback for development/demo.
 """
 import asyncio
-from typing import Dict, List, Optional
-import httpx
+from typing import Awaitable, Callable, Dict, List, Optional
 from config import settings
+from services.http_clients import provider_clients
+from services.response_cache import response_cache
+from services.single_flight import provider_flights
+from services.rate_limiter import provider_governors
+from .mention_matcher import MentionMatcher
 import json
 import random
 
@@ -17,6 +21,10 @@ class BrowserScout:
     Uses official APIs to avoid CAPTCHA issues.
     """
     
+    PLATFORMS = ("chatgpt", "gemini", "perplexity")
+    CLIENTS = {"chatgpt": "openai", "gemini": "gemini", "perplexity": "perplexity"}
+    MAX_TOKENS = 1000
+    
     # Query templates
     INDUSTRY_QUERY = "What are the top recommended {industry} tools for {use_case}?"
     REPUTATION_QUERY = "Explain the reputation of {brand_name}."
@@ -113,176 +121,356 @@ The brand has an established presence with the following reputation indicators:
         self.google_key = settings.GOOGLE_AI_API_KEY
         self.perplexity_key = settings.PERPLEXITY_API_KEY
     
-    async def query_chatgpt(self, query: str) -> Dict:
-        """Query ChatGPT via OpenAI API."""
-        if not self.openai_key:
-            # Return mock data for demo
-            query_type = "industry" if "top recommended" in query.lower() else "reputation"
-            return {
-                "source": "chatgpt",
-                "query": query,
-                "response": self.MOCK_RESPONSES["chatgpt"][query_type],
-                "is_mock": True
-            }
+    def _mock_response(self, source: str, query: str) -> Dict:
+        """Build a mock response for a platform (no API key configured)."""
+        query_type = "industry" if "top recommended" in query.lower() else "reputation"
+        return {
+            "source": source,
+            "query": query,
+            "response": self.MOCK_RESPONSES[source][query_type],
+            "is_mock": True
+        }
+    
+    async def _query_provider(
+        self,
+        source: str,
+        model: str,
+        query: str,
+        fetch: Callable[[str], Awaitable[Dict]]
+    ) -> Dict:
+        """
+        Query a platform through the response cache.
+        Identical concurrent queries share one in-flight request, and
+        outbound calls run under the provider's rate limits and retries.
+        If the provider still fails, returns an empty response carrying
+        the error (or mock data when MOCK_FALLBACK_ON_ERROR is set).
+        """
+        governor = provider_governors.get(source)
+        estimated_tokens = len(query) // 4 + self.MAX_TOKENS
+        
+        def governed_fetch() -> Awaitable[Dict]:
+            return governor.call(
+                lambda: fetch(query),
+                estimated_tokens=estimated_tokens,
+                tokens_used=lambda result: result.get("tokens_used")
+            )
+        
+        def lookup() -> Awaitable[Dict]:
+            return response_cache.get_or_fetch(source, model, query, governed_fetch)
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.openai_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "gpt-4o",
-                        "messages": [
-                            {"role": "system", "content": "You are a helpful assistant providing information about business tools and brand reputations."},
-                            {"role": "user", "content": query}
-                        ],
-                        "max_tokens": 1000
-                    },
-                    timeout=30.0
-                )
-                data = response.json()
-                return {
-                    "source": "chatgpt",
-                    "query": query,
-                    "response": data["choices"][0]["message"]["content"],
-                    "is_mock": False
-                }
+            if not settings.SINGLE_FLIGHT_ENABLED:
+                return await lookup()
+            key = response_cache.make_key(source, model, query)
+            # Copy so callers sharing one flight never share a mutable dict
+            return dict(await provider_flights.do(key, lookup))
         except Exception as e:
+            if settings.MOCK_FALLBACK_ON_ERROR:
+                return {**self._mock_response(source, query), "error": str(e)}
             return {
-                "source": "chatgpt",
+                "source": source,
                 "query": query,
-                "response": self.MOCK_RESPONSES["chatgpt"]["industry"],
-                "is_mock": True,
+                "response": "",
+                "is_mock": False,
                 "error": str(e)
             }
     
-    async def query_gemini(self, query: str) -> Dict:
+    def _cutoff_applies(self, brand_name: Optional[str]) -> bool:
+        return bool(brand_name) and settings.PROVIDER_STREAMING and settings.EARLY_CUTOFF_ENABLED
+    
+    def _cache_model(self, model: str, brand_name: Optional[str]) -> str:
+        # Cut-off answers are truncated, so they never stand in for full ones
+        return f"{model}+cutoff" if self._cutoff_applies(brand_name) else model
+    
+    async def _stream_completion(
+        self,
+        source: str,
+        query: str,
+        brand_name: Optional[str],
+        path: str,
+        request: Dict,
+        extract_text: Callable[[Dict], Optional[str]],
+        extract_tokens: Callable[[Dict], Optional[int]]
+    ) -> Dict:
+        """
+        POST a streaming completion request and read its SSE events.
+        
+        With a brand name, the text feeds a MentionMatcher as it arrives
+        and the result carries its analysis under "mention". In early-cutoff
+        mode the stream is closed once the matcher has enough signal,
+        which stops generation on the provider side.
+        """
+        client = provider_clients.get(self.CLIENTS[source])
+        matcher = MentionMatcher(brand_name) if brand_name else None
+        cutoff = self._cutoff_applies(brand_name)
+        parts: List[str] = []
+        tokens_used = None
+        citations = None
+        truncated = False
+        
+        async with client.stream("POST", path, **request) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                payload = line[5:].strip()
+                if payload == "[DONE]":
+                    break
+                event = json.loads(payload)
+                tokens_used = extract_tokens(event) or tokens_used
+                citations = event.get("citations") or citations
+                text = extract_text(event)
+                if not text:
+                    continue
+                parts.append(text)
+                if matcher is None:
+                    continue
+                matcher.feed(text)
+                if cutoff and matcher.has_enough_signal(
+                    settings.EARLY_CUTOFF_MIN_CONTEXTS, settings.EARLY_CUTOFF_MIN_CHARS
+                ):
+                    truncated = True
+                    break
+        
+        response_text = "".join(parts)
+        result = {
+            "source": source,
+            "query": query,
+            "response": response_text,
+            "is_mock": False,
+            # Usage arrives in the final event, which a cut-off stream never sees
+            "tokens_used": tokens_used or (len(query) + len(response_text)) // 4,
+            "streamed": True
+        }
+        if source == "perplexity":
+            result["citations"] = citations or []
+        if matcher is not None:
+            result["mention"] = matcher.finish()
+        if truncated:
+            result["truncated"] = True
+        return result
+    
+    async def query_chatgpt(self, query: str, brand_name: Optional[str] = None) -> Dict:
+        """Query ChatGPT via OpenAI API."""
+        if not self.openai_key:
+            # Return mock data for demo
+            return self._mock_response("chatgpt", query)
+        return await self._query_provider(
+            "chatgpt",
+            self._cache_model(settings.OPENAI_MODEL, brand_name),
+            query,
+            lambda q: self._fetch_chatgpt(q, brand_name)
+        )
+    
+    async def _fetch_chatgpt(self, query: str, brand_name: Optional[str] = None) -> Dict:
+        headers = {
+            "Authorization": f"Bearer {self.openai_key}",
+            "Content-Type": "application/json"
+        }
+        body = {
+            "model": settings.OPENAI_MODEL,
+            "messages": [
+                {"role": "system", "content": "You are a helpful assistant providing information about business tools and brand reputations."},
+                {"role": "user", "content": query}
+            ],
+            "max_tokens": self.MAX_TOKENS
+        }
+        if settings.PROVIDER_STREAMING:
+            return await self._stream_completion(
+                "chatgpt", query, brand_name, "/chat/completions",
+                {"headers": headers, "json": {**body, "stream": True, "stream_options": {"include_usage": True}}},
+                self._openai_delta,
+                self._openai_tokens
+            )
+        
+        client = provider_clients.get("openai")
+        response = await client.post("/chat/completions", headers=headers, json=body)
+        response.raise_for_status()
+        data = response.json()
+        return {
+            "source": "chatgpt",
+            "query": query,
+            "response": data["choices"][0]["message"]["content"],
+            "is_mock": False,
+            "tokens_used": data.get("usage", {}).get("total_tokens")
+        }
+    
+    async def query_gemini(self, query: str, brand_name: Optional[str] = None) -> Dict:
         """Query Gemini via Google AI API."""
         if not self.google_key:
-            query_type = "industry" if "top recommended" in query.lower() else "reputation"
-            return {
-                "source": "gemini",
-                "query": query,
-                "response": self.MOCK_RESPONSES["gemini"][query_type],
-                "is_mock": True
-            }
+            return self._mock_response("gemini", query)
+        return await self._query_provider(
+            "gemini",
+            self._cache_model(settings.GEMINI_MODEL, brand_name),
+            query,
+            lambda q: self._fetch_gemini(q, brand_name)
+        )
+    
+    async def _fetch_gemini(self, query: str, brand_name: Optional[str] = None) -> Dict:
+        body = {
+            "contents": [{"parts": [{"text": query}]}],
+            "generationConfig": {"maxOutputTokens": self.MAX_TOKENS}
+        }
+        if settings.PROVIDER_STREAMING:
+            return await self._stream_completion(
+                "gemini", query, brand_name, f"/models/{settings.GEMINI_MODEL}:streamGenerateContent",
+                {"params": {"key": self.google_key, "alt": "sse"}, "json": body},
+                self._gemini_text,
+                self._gemini_tokens
+            )
         
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent?key={self.google_key}",
-                    json={
-                        "contents": [{"parts": [{"text": query}]}]
-                    },
-                    timeout=30.0
-                )
-                data = response.json()
-                text = data["candidates"][0]["content"]["parts"][0]["text"]
-                return {
-                    "source": "gemini",
-                    "query": query,
-                    "response": text,
-                    "is_mock": False
-                }
-        except Exception as e:
-            return {
-                "source": "gemini",
-                "query": query,
-                "response": self.MOCK_RESPONSES["gemini"]["industry"],
-                "is_mock": True,
-                "error": str(e)
-            }
+        client = provider_clients.get("gemini")
+        response = await client.post(
+            f"/models/{settings.GEMINI_MODEL}:generateContent",
+            params={"key": self.google_key},
+            json=body
+        )
+        response.raise_for_status()
+        data = response.json()
+        text = data["candidates"][0]["content"]["parts"][0]["text"]
+        return {
+            "source": "gemini",
+            "query": query,
+            "response": text,
+            "is_mock": False,
+            "tokens_used": data.get("usageMetadata", {}).get("totalTokenCount")
+        }
     
-    async def query_perplexity(self, query: str) -> Dict:
+    async def query_perplexity(self, query: str, brand_name: Optional[str] = None) -> Dict:
         """Query Perplexity via their API."""
         if not self.perplexity_key:
-            query_type = "industry" if "top recommended" in query.lower() else "reputation"
-            return {
-                "source": "perplexity",
-                "query": query,
-                "response": self.MOCK_RESPONSES["perplexity"][query_type],
-                "is_mock": True
-            }
+            return self._mock_response("perplexity", query)
+        return await self._query_provider(
+            "perplexity",
+            self._cache_model(settings.PERPLEXITY_MODEL, brand_name),
+            query,
+            lambda q: self._fetch_perplexity(q, brand_name)
+        )
+    
+    async def _fetch_perplexity(self, query: str, brand_name: Optional[str] = None) -> Dict:
+        headers = {
+            "Authorization": f"Bearer {self.perplexity_key}",
+            "Content-Type": "application/json"
+        }
+        body = {
+            "model": settings.PERPLEXITY_MODEL,
+            "messages": [
+                {"role": "user", "content": query}
+            ],
+            "max_tokens": self.MAX_TOKENS
+        }
+        if settings.PROVIDER_STREAMING:
+            return await self._stream_completion(
+                "perplexity", query, brand_name, "/chat/completions",
+                {"headers": headers, "json": {**body, "stream": True}},
+                self._openai_delta,
+                self._openai_tokens
+            )
         
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.perplexity.ai/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.perplexity_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "llama-3.1-sonar-small-128k-online",
-                        "messages": [
-                            {"role": "user", "content": query}
-                        ]
-                    },
-                    timeout=30.0
-                )
-                data = response.json()
-                return {
-                    "source": "perplexity",
-                    "query": query,
-                    "response": data["choices"][0]["message"]["content"],
-                    "is_mock": False,
-                    "citations": data.get("citations", [])
-                }
-        except Exception as e:
-            return {
-                "source": "perplexity",
-                "query": query,
-                "response": self.MOCK_RESPONSES["perplexity"]["industry"],
-                "is_mock": True,
-                "error": str(e)
-            }
+        client = provider_clients.get("perplexity")
+        response = await client.post("/chat/completions", headers=headers, json=body)
+        response.raise_for_status()
+        data = response.json()
+        return {
+            "source": "perplexity",
+            "query": query,
+            "response": data["choices"][0]["message"]["content"],
+            "is_mock": False,
+            "citations": data.get("citations", []),
+            "tokens_used": data.get("usage", {}).get("total_tokens")
+        }
+    
+    # Stream event parsers (OpenAI-compatible chunks and Gemini candidates)
+    
+    @staticmethod
+    def _openai_delta(event: Dict) -> Optional[str]:
+        choices = event.get("choices") or []
+        return choices[0].get("delta", {}).get("content") if choices else None
+    
+    @staticmethod
+    def _openai_tokens(event: Dict) -> Optional[int]:
+        return (event.get("usage") or {}).get("total_tokens")
+    
+    @staticmethod
+    def _gemini_text(event: Dict) -> Optional[str]:
+        candidates = event.get("candidates") or []
+        parts = candidates[0].get("content", {}).get("parts", []) if candidates else []
+        return "".join(part.get("text", "") for part in parts)
+    
+    @staticmethod
+    def _gemini_tokens(event: Dict) -> Optional[int]:
+        return (event.get("usageMetadata") or {}).get("totalTokenCount")
+    
+    async def query_platform(self, source: str, query: str, brand_name: Optional[str] = None) -> Dict:
+        """
+        Query a single platform by name.
+        
+        Pass brand_name when the answer is about that brand (reputation
+        queries): streamed answers are then matched as they arrive and
+        may be cut off early.
+        """
+        if source == "chatgpt":
+            return await self.query_chatgpt(query, brand_name)
+        if source == "gemini":
+            return await self.query_gemini(query, brand_name)
+        if source == "perplexity":
+            return await self.query_perplexity(query, brand_name)
+        raise ValueError(f"Unknown platform: {source}")
+    
+    async def query_all_platforms(self, query: str, brand_name: Optional[str] = None) -> Dict[str, Dict]:
+        """Send one query to every platform concurrently."""
+        results = await asyncio.gather(
+            *(self.query_platform(source, query, brand_name) for source in self.PLATFORMS)
+        )
+        return dict(zip(self.PLATFORMS, results))
+    
+    def build_queries(self, brand_name: str, industry: str, use_case: str) -> Dict[str, str]:
+        """Audit queries keyed by query type."""
+        return {
+            "industry": self.INDUSTRY_QUERY.format(industry=industry, use_case=use_case),
+            "reputation": self.REPUTATION_QUERY.format(brand_name=brand_name),
+        }
     
     async def run_audit(
         self,
         brand_name: str,
         industry: str = "software",
-        use_case: str = "business operations"
+        use_case: str = "business operations",
+        industry_responses: Optional[Dict[str, Dict]] = None
     ) -> Dict:
         """
         Run a complete audit across all AI platforms.
         
+        Args:
+            industry_responses: Pre-fetched answers to the industry query,
+                keyed by platform. Batch audits share these across brands.
+        
         Returns:
             Dict containing all responses and analysis
         """
         # Build queries
-        industry_query = self.INDUSTRY_QUERY.format(industry=industry, use_case=use_case)
-        reputation_query = self.REPUTATION_QUERY.format(brand_name=brand_name)
+        queries = self.build_queries(brand_name, industry, use_case)
         
         # Query all platforms concurrently
-        results = await asyncio.gather(
-            self.query_chatgpt(industry_query),
-            self.query_chatgpt(reputation_query),
-            self.query_gemini(industry_query),
-            self.query_gemini(reputation_query),
-            self.query_perplexity(industry_query),
-            self.query_perplexity(reputation_query),
-        )
+        if industry_responses is None:
+            industry_results, reputation_results = await asyncio.gather(
+                self.query_all_platforms(queries["industry"]),
+                self.query_all_platforms(queries["reputation"], brand_name),
+            )
+        else:
+            industry_results = industry_responses
+            reputation_results = await self.query_all_platforms(queries["reputation"], brand_name)
         
         return {
             "brand_name": brand_name,
             "industry": industry,
             "use_case": use_case,
             "responses": {
-                "chatgpt": {
-                    "industry": results[0],
-                    "reputation": results[1]
-                },
-                "gemini": {
-                    "industry": results[2],
-                    "reputation": results[3]
-                },
-                "perplexity": {
-                    "industry": results[4],
-                    "reputation": results[5]
+                source: {
+                    "industry": industry_results[source],
+                    "reputation": reputation_results[source]
                 }
+                for source in self.PLATFORMS
             }
         }
 
@@ -0,0 +1,131 @@
+"""
+Mention Matcher - Incremental brand-mention detection over streamed text.
+Fed chunk by chunk as tokens arrive, it flags a mention the moment the
+brand name is complete and emits each context snippet as soon as the
+text around it has arrived.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def mention_contexts(text: str, spans: Iterable[Tuple[int, int]], context_chars: int = 100) -> List[str]:
+    """
+    Context snippets around (start, end) mention spans of a whole text,
+    cut exactly as MentionMatcher cuts them from a stream.
+    """
+    contexts = []
+    context_start = 0
+    for start, end in spans:
+        if start < context_start:
+            continue  # covered by the previous snippet
+        limit = end + context_chars
+        newline = text.find("\n", end, limit)
+        stop = newline if newline != -1 else min(limit, len(text))
+        line_start = text.rfind("\n", 0, start) + 1
+        contexts.append(text[max(context_start, line_start, start - context_chars):stop])
+        context_start = stop
+    return contexts
+
+
+class MentionMatcher:
+    """
+    Finds a brand in text that arrives in pieces.
+
+    Contexts are case-folded snippets of up to `context_chars` characters
+    either side of a mention, clipped to the mention's line. Snippets do
+    not overlap: a mention inside a previous snippet is covered by it.
+    Only whole-word mentions count ("heap" is not in "cheaper"), so a
+    mention at the end of the text so far waits for the next character.
+    """
+
+    def __init__(self, brand_name: str, context_chars: int = 100):
+        """Start matching `brand_name` against an empty text."""
+        self.brand = brand_name.lower()
+        self.context_chars = context_chars
+        self.text = ""
+        self.mentioned = False
+        self.first_offset: Optional[int] = None
+        self.contexts: List[str] = []
+        self._scan_from = 0  # where the next search for the brand starts
+        self._context_start = 0  # no snippet may start before this
+        self._pending: Optional[int] = None  # mention awaiting its right context
+
+    def feed(self, chunk: str) -> List[str]:
+        """Add streamed text; returns the contexts it completed."""
+        if not self.brand or not chunk:
+            return []
+        self.text += chunk.lower()
+        return self._advance(final=False)
+
+    def finish(self) -> Dict:
+        """Flush the last context at end of stream and return the analysis."""
+        if self.brand:
+            self._advance(final=True)
+        return {
+            "mentioned": self.mentioned,
+            "contexts": self.contexts,
+            "first_offset": self.first_offset,
+        }
+
+    def has_enough_signal(self, min_contexts: int, min_chars: int) -> bool:
+        """Whether enough brand context has arrived to stop generating."""
+        return len(self.contexts) >= min_contexts and len(self.text) >= min_chars
+
+    def _advance(self, final: bool) -> List[str]:
+        completed = []
+        while True:
+            if self._pending is None:
+                index = self.text.find(self.brand, self._scan_from)
+                if index == -1:
+                    # Keep a tail so a name split across chunks is still found
+                    self._scan_from = max(self._scan_from, len(self.text) - len(self.brand) + 1)
+                    return completed
+                boundary = self._word_boundary(index, final)
+                if boundary is None:
+                    self._scan_from = index
+                    return completed
+                if not boundary:
+                    self._scan_from = index + 1
+                    continue
+                if not self.mentioned:
+                    self.mentioned = True
+                    self.first_offset = index
+                self._pending = index
+
+            context = self._close_context(self._pending, final)
+            if context is None:
+                return completed
+            self.contexts.append(context)
+            completed.append(context)
+            self._pending = None
+
+    def _word_boundary(self, index: int, final: bool) -> Optional[bool]:
+        """Whether the match at `index` is a whole word; None until the next character arrives."""
+        if index > 0 and _is_word_char(self.brand[0]) and _is_word_char(self.text[index - 1]):
+            return False
+        end = index + len(self.brand)
+        if end == len(self.text):
+            return True if final else None
+        return not (_is_word_char(self.brand[-1]) and _is_word_char(self.text[end]))
+
+    def _close_context(self, index: int, final: bool) -> Optional[str]:
+        """Cut the snippet around a mention once its right side is known."""
+        brand_end = index + len(self.brand)
+        limit = brand_end + self.context_chars
+        newline = self.text.find("\n", brand_end, limit)
+        if newline != -1:
+            end = newline
+        elif len(self.text) >= limit:
+            end = limit
+        elif final:
+            end = len(self.text)
+        else:
+            return None
+
+        line_start = self.text.rfind("\n", 0, index) + 1
+        start = max(self._context_start, line_start, index - self.context_chars)
+        self._context_start = self._scan_from = end
+        return self.text[start:end]
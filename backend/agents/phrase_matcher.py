@@ -0,0 +1,82 @@
+"""
+Phrase Matcher - Finds many phrases in a text in one pass.
+Brand names, aliases, competitors and sentiment indicator words are
+compiled into a single trie-shaped automaton, built once per brand and
+competitor set, that reports every whole-word hit with its offsets.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Tuple
+
+
+class Hit(NamedTuple):
+    """One phrase occurrence; offsets index the lowercased text."""
+    kind: str  # "brand", "alias", "competitor", "positive", "negative" or "neutral"
+    name: str  # the phrase as it was registered
+    start: int
+    end: int
+
+
+def _trie_regex(phrases: Iterable[str]) -> str:
+    """
+    One regex for a set of phrases, shaped like their trie: the engine
+    follows a single path per position instead of retrying every
+    alternative, and a longer phrase wins over its prefix.
+    """
+    trie: Dict = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: Dict) -> str:
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(trie)
+
+
+class PhraseMatcher:
+    """
+    Case-insensitive whole-word matching of a fixed set of phrases.
+
+    Phrases map to (kind, name). Matches are leftmost-longest and do not
+    overlap, so "acme cloud" is reported once even when "acme" is also
+    registered, and "heap" is not found inside "cheaper".
+    """
+
+    def __init__(self, phrases: Sequence[Tuple[str, str]]):
+        """Compile (kind, phrase) pairs; the first kind given for a phrase wins."""
+        self.kinds: Dict[str, Tuple[str, str]] = {}
+        for kind, phrase in phrases:
+            key = phrase.lower().strip()
+            if key:
+                self.kinds.setdefault(key, (kind, phrase))
+        self.pattern = re.compile(rf"(?<!\w)(?:{_trie_regex(self.kinds)})(?!\w)") if self.kinds else None
+
+    def find(self, text_lower: str) -> List[Hit]:
+        """Every hit in an already-lowercased text, in order."""
+        if self.pattern is None or not text_lower:
+            return []
+        kinds = self.kinds
+        return [Hit(*kinds[m.group()], m.start(), m.end()) for m in self.pattern.finditer(text_lower)]
+
+
+@lru_cache(maxsize=256)
+def get_phrase_matcher(
+    brand_name: str = "",
+    aliases: Tuple[str, ...] = (),
+    competitors: Tuple[str, ...] = (),
+    lexicon: Tuple[Tuple[str, str], ...] = (),
+) -> PhraseMatcher:
+    """Matcher for a brand, its aliases, competitors and (kind, word) lexicon, built once per combination."""
+    return PhraseMatcher([
+        ("brand", brand_name),
+        *(("alias", alias) for alias in aliases),
+        *(("competitor", competitor) for competitor in competitors),
+        *lexicon,
+    ])
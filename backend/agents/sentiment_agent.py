@@ -2,14 +2,22 @@
 Sentiment Agent - Analyzes text for sentiment and brand mentions.
 Uses TextBlob for local sentiment analysis (no API key required).
 """
-from textblob import TextBlob
-import re
 from typing import Dict, List, Tuple, Optional
 
+from config import settings
+from services.analysis_cache import analysis_cache
+from services.lexicon_sentiment import get_lexicon_sentiment
+from services.sentiment_executor import classify_polarity, lexicon_backend, score_sentiment, sentiment_executor
+from .mention_matcher import mention_contexts
+from .phrase_matcher import get_phrase_matcher
+
 
 class SentimentAgent:
     """Analyzes sentiment of AI responses and detects brand mentions."""
     
+    # Bump when analysis results change so cached results are not reused
+    ANALYZER_VERSION = 1
+    
     # Brand sentiment lexicon - words that indicate specific sentiments about brands
     POSITIVE_INDICATORS = [
         "reliable", "trusted", "best", "leading", "recommended", "popular",
@@ -32,7 +40,15 @@ class SentimentAgent:
     
     def __init__(self):
         """Initialize the sentiment agent."""
-        pass
+        self.lexicon = tuple(
+            (kind, word)
+            for kind, words in (
+                ("positive", self.POSITIVE_INDICATORS),
+                ("negative", self.NEGATIVE_INDICATORS),
+                ("neutral", self.NEUTRAL_INDICATORS),
+            )
+            for word in words
+        )
     
     def analyze_sentiment(self, text: str) -> Tuple[str, float]:
         """
@@ -43,23 +59,88 @@ class SentimentAgent:
             - sentiment_label: "positive", "neutral", or "negative"
             - sentiment_score: -1.0 to 1.0
         """
-        if not text:
-            return "neutral", 0.0
-        
-        blob = TextBlob(text)
-        polarity = blob.sentiment.polarity  # -1 to 1
-        
-        # Classify based on polarity
-        if polarity > 0.1:
-            return "positive", polarity
-        elif polarity < -0.1:
-            return "negative", polarity
-        else:
-            return "neutral", polarity
+        label, score = analysis_cache.get_or_compute(
+            "sentiment", text, self._cache_params(), lambda: score_sentiment(text)
+        )
+        return label, score
+    
+    async def analyze_sentiment_batch(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """
+        Analyze many texts off the event loop, in the sentiment process pool.
+        Texts already in the analysis cache are not rescored.
+        
+        Returns:
+            One (sentiment_label, sentiment_score) tuple per text, in order
+        """
+        if not analysis_cache.enabled:
+            return await sentiment_executor.analyze_batch(texts)
+        
+        keys = [analysis_cache.make_key("sentiment", text, *self._cache_params()) for text in texts]
+        scores = await analysis_cache.get_many("sentiment", keys)
+        missing = [text for text, score in zip(texts, scores) if score is None]
+        if missing:
+            computed = dict(zip(missing, await sentiment_executor.analyze_batch(missing)))
+            for i, (text, key) in enumerate(zip(texts, keys)):
+                if scores[i] is None:
+                    scores[i] = computed[text]
+                    analysis_cache.set(key, scores[i])
+        return [(label, score) for label, score in scores]
+    
+    def _cache_params(self) -> tuple:
+        return self.ANALYZER_VERSION, settings.SENTIMENT_BACKEND
+    
+    def scan_text(
+        self,
+        text: str,
+        brand_name: str = "",
+        aliases: Optional[List[str]] = None,
+        competitors: Optional[List[str]] = None
+    ) -> Dict:
+        """
+        Find the brand, its aliases, competitors and lexicon indicators in
+        one pass over the text. Only whole words match.
+        
+        Returns:
+            Dict with:
+            - mentioned: bool (brand or an alias)
+            - first_offset: offset of the first brand/alias mention, or None
+            - contexts: List of text snippets where the brand appears
+            - competitors: competitor names in order of first appearance
+            - lexicon: positive, negative and neutral indicators found
+            - hits: every match as {kind, name, start, end}
+        """
+        matcher = get_phrase_matcher(
+            brand_name or "", tuple(aliases or ()), tuple(competitors or ()), self.lexicon
+        )
+        text_lower = (text or "").lower()
+        hits = matcher.find(text_lower)
+        
+        brand_spans = [(hit.start, hit.end) for hit in hits if hit.kind in ("brand", "alias")]
+        found = {kind: [] for kind in ("competitor", "positive", "negative", "neutral")}
+        for hit in hits:
+            names = found.get(hit.kind)
+            if names is not None and hit.name not in names:
+                names.append(hit.name)
+        
+        return {
+            "mentioned": bool(brand_spans),
+            "first_offset": brand_spans[0][0] if brand_spans else None,
+            "contexts": mention_contexts(text_lower, brand_spans),
+            "competitors": found["competitor"],
+            "lexicon": {kind: found[kind] for kind in ("positive", "negative", "neutral")},
+            "hits": [hit._asdict() for hit in hits],
+        }
     
-    def detect_brand_mention(self, text: str, brand_name: str) -> Dict:
+    def detect_brand_mention(
+        self,
+        text: str,
+        brand_name: str,
+        with_sentiment: bool = True,
+        aliases: Optional[List[str]] = None
+    ) -> Dict:
         """
-        Detect if a brand is mentioned and extract context.
+        Detect if a brand (or one of its aliases) is mentioned and extract context.
+        With with_sentiment=False the (neutral) brand sentiment is not scored.
         
         Returns:
             Dict with:
@@ -70,25 +151,22 @@ class SentimentAgent:
         if not text or not brand_name:
             return {"mentioned": False, "contexts": [], "sentiment_around_brand": "neutral"}
         
-        text_lower = text.lower()
-        brand_lower = brand_name.lower()
-        
-        # Check for exact match or partial match
-        mentioned = brand_lower in text_lower
+        aliases = tuple(aliases or ())
+        return dict(analysis_cache.get_or_compute(
+            "brand_mention", text, (*self._cache_params(), brand_name, aliases, with_sentiment),
+            lambda: self._detect_brand_mention(text, brand_name, with_sentiment, aliases)
+        ))
+    
+    def _detect_brand_mention(self, text: str, brand_name: str, with_sentiment: bool, aliases: Tuple[str, ...]) -> Dict:
+        analysis = self.scan_text(text, brand_name, aliases=aliases)
+        mentioned = analysis["mentioned"]
+        contexts = analysis["contexts"]
         
-        contexts = []
+        # Analyze sentiment around brand mentions
         brand_sentiment = "neutral"
-        
-        if mentioned:
-            # Extract context around brand mention (100 chars before and after)
-            pattern = rf'.{{0,100}}{re.escape(brand_lower)}.{{0,100}}'
-            matches = re.findall(pattern, text_lower, re.IGNORECASE)
-            contexts = matches
-            
-            # Analyze sentiment around brand mentions
-            if contexts:
-                combined_context = " ".join(contexts)
-                brand_sentiment, _ = self.analyze_sentiment(combined_context)
+        if contexts and with_sentiment:
+            combined_context = " ".join(contexts)
+            brand_sentiment, _ = self.analyze_sentiment(combined_context)
         
         return {
             "mentioned": mentioned,
@@ -96,30 +174,67 @@ class SentimentAgent:
             "sentiment_around_brand": brand_sentiment
         }
     
-    def detect_competitors(self, text: str, known_competitors: List[str] = None) -> List[Dict]:
+    def detect_competitors(
+        self,
+        text: str,
+        known_competitors: List[str] = None,
+        window: Optional[int] = None
+    ) -> List[Dict]:
         """
         Detect competitor mentions in the text.
         
+        Each competitor's sentiment comes from the text within `window`
+        characters of its mentions (COMPETITOR_SENTIMENT_WINDOW by
+        default); with window=0 every competitor gets the whole text's.
+        
         Returns:
             List of dicts with competitor name and sentiment
         """
-        if not text:
+        if not text or not known_competitors:
             return []
         
-        competitors_found = []
+        competitors = tuple(known_competitors)
+        window = settings.COMPETITOR_SENTIMENT_WINDOW if window is None else window
+        return [dict(found) for found in analysis_cache.get_or_compute(
+            "competitors", text, (*self._cache_params(), competitors, window),
+            lambda: self._detect_competitors(text, competitors, window)
+        )]
+    
+    def _detect_competitors(self, text: str, known_competitors: Tuple[str, ...], window: int) -> List[Dict]:
+        scan = self.scan_text(text, competitors=known_competitors)
+        found = [competitor for competitor in known_competitors if competitor in scan["competitors"]]
+        if not found:
+            return []
+        
+        if not window:
+            # Same text for every competitor: score it once
+            sentiment, score = self.analyze_sentiment(text)
+            return [{"name": competitor, "sentiment": sentiment, "score": score} for competitor in found]
+        
+        spans: Dict[str, List[Tuple[int, int]]] = {}
+        for hit in scan["hits"]:
+            if hit["kind"] == "competitor":
+                spans.setdefault(hit["name"], []).append((hit["start"], hit["end"]))
         
-        # If known competitors provided, search for them
-        if known_competitors:
-            for competitor in known_competitors:
-                if competitor.lower() in text.lower():
-                    sentiment, score = self.analyze_sentiment(text)
-                    competitors_found.append({
-                        "name": competitor,
-                        "sentiment": sentiment,
-                        "score": score
-                    })
+        competitor_sentiments = []
+        if lexicon_backend():
+            # Score the text once, then average per-word polarity around each competitor
+            polarities = get_lexicon_sentiment().window_polarities(
+                text, [spans[competitor] for competitor in found], window
+            )
+            for competitor, polarity in zip(found, polarities):
+                sentiment, score = classify_polarity(polarity)
+                competitor_sentiments.append({"name": competitor, "sentiment": sentiment, "score": score})
+            return competitor_sentiments
         
-        return competitors_found
+        # Other backends score the text around each competitor's mentions
+        for competitor in found:
+            excerpt = " ... ".join(
+                text[max(0, start - window):end + window] for start, end in spans[competitor]
+            )
+            sentiment, score = self.analyze_sentiment(excerpt)
+            competitor_sentiments.append({"name": competitor, "sentiment": sentiment, "score": score})
+        return competitor_sentiments
     
     def calculate_visibility_score(
         self,
@@ -169,12 +284,12 @@ class SentimentAgent:
         Returns:
             Dict with positive, negative, and neutral matches
         """
-        text_lower = text.lower()
+        found = self.scan_text(text)["lexicon"]
         
         return {
-            "positive": [w for w in self.POSITIVE_INDICATORS if w in text_lower],
-            "negative": [w for w in self.NEGATIVE_INDICATORS if w in text_lower],
-            "neutral": [w for w in self.NEUTRAL_INDICATORS if w in text_lower]
+            "positive": [w for w in self.POSITIVE_INDICATORS if w in found["positive"]],
+            "negative": [w for w in self.NEGATIVE_INDICATORS if w in found["negative"]],
+            "neutral": [w for w in self.NEUTRAL_INDICATORS if w in found["neutral"]]
         }
 
 
@@ -0,0 +1,84 @@
+"""
+Audit Throughput Benchmark - Measures BrowserScout audits/sec against a
+local stub LLM server in three modes: a new connection per request
+(keep-alive disabled), pooled HTTP/1.1 keep-alive, and pooled HTTP/2.
+
+Usage:
+    python -m benchmarks.bench_audit_throughput --audits 200 --concurrency 20
+"""
+import argparse
+import asyncio
+import time
+
+from config import settings
+from agents.browser_scout import BrowserScout
+from services.http_clients import provider_clients
+from benchmarks.stub_llm_server import StubLLMServer
+
+
+def configure_providers(server: StubLLMServer) -> None:
+    """Point every provider at the stub server with dummy keys."""
+    settings.OPENAI_API_KEY = "bench"
+    settings.GOOGLE_AI_API_KEY = "bench"
+    settings.PERPLEXITY_API_KEY = "bench"
+    settings.OPENAI_BASE_URL = f"{server.url}/v1"
+    settings.GEMINI_BASE_URL = f"{server.url}/v1beta"
+    settings.PERPLEXITY_BASE_URL = server.url
+
+
+async def run_mode(
+    server: StubLLMServer,
+    label: str,
+    keepalive: int,
+    http2: bool,
+    audits: int,
+    concurrency: int,
+) -> None:
+    settings.HTTP_MAX_KEEPALIVE_CONNECTIONS = keepalive
+    settings.HTTP2_ENABLED = http2
+    settings.HTTP2_PRIOR_KNOWLEDGE = http2
+    await provider_clients.shutdown()
+    await provider_clients.startup()
+
+    scout = BrowserScout()
+    semaphore = asyncio.Semaphore(concurrency)
+    server.requests = server.connections = 0
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            await scout.run_audit(brand_name=f"Brand {i}", industry="crm")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(audits)))
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{label:<10} {audits / elapsed:8.1f} audits/s  "
+        f"{server.requests:6d} requests  {server.connections:5d} connections  "
+        f"{elapsed:6.2f}s"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--audits", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2, help="stub response latency in seconds")
+    parser.add_argument("--connect-latency", type=float, default=0.1, help="simulated TCP+TLS setup per connection")
+    args = parser.parse_args()
+
+    pooled_keepalive = settings.HTTP_MAX_KEEPALIVE_CONNECTIONS
+    server = StubLLMServer(latency=args.latency, connect_latency=args.connect_latency)
+    await server.start()
+    configure_providers(server)
+    try:
+        await run_mode(server, "unpooled", 0, False, args.audits, args.concurrency)
+        await run_mode(server, "pooled", pooled_keepalive, False, args.audits, args.concurrency)
+        await run_mode(server, "pooled-h2", pooled_keepalive, True, args.audits, args.concurrency)
+    finally:
+        await provider_clients.shutdown()
+        await server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+"""
+Auth Benchmark - Measures per-request authentication overhead
+(get_current_user) for database-backed sessions, with and without the
+per-worker verification cache, and for signed JWT access tokens, on
+first sight (signature checked) and on repeat requests.
+
+Usage:
+    python -m benchmarks.bench_auth --requests 5000
+"""
+import argparse
+import asyncio
+import time
+
+from config import settings
+from models.database import init_db
+from routers.auth import ensure_demo_users, get_current_user, issue_tokens, get_user_by_email
+from services.access_tokens import access_tokens
+from services.session_store import session_store
+
+
+async def time_mode(label: str, requests: int) -> None:
+    user = await get_user_by_email("demo@geosight.ai")
+    token = (await issue_tokens(user))["access_token"]
+    await get_current_user(token)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await get_current_user(token)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<16} {elapsed / requests * 1e6:9.1f} us/request  {requests / elapsed:10.0f} requests/s")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    await init_db()
+    await ensure_demo_users()
+    cache_ttl, verify_cache = settings.SESSION_CACHE_TTL, settings.JWT_VERIFY_CACHE_SIZE
+    try:
+        settings.AUTH_TOKEN_MODE = "session"
+        settings.SESSION_CACHE_TTL = 0
+        await time_mode("session (db)", args.requests)
+        settings.SESSION_CACHE_TTL = cache_ttl
+        await time_mode("session (cached)", args.requests)
+
+        settings.AUTH_TOKEN_MODE = "jwt"
+        settings.JWT_VERIFY_CACHE_SIZE = 0
+        await time_mode("jwt (verify)", args.requests)
+        settings.JWT_VERIFY_CACHE_SIZE = verify_cache
+        await time_mode("jwt (repeat)", args.requests)
+    finally:
+        settings.SESSION_CACHE_TTL, settings.JWT_VERIFY_CACHE_SIZE = cache_ttl, verify_cache
+        await session_store.revoke_user((await get_user_by_email("demo@geosight.ai"))["id"])
+    print(f"\nrevocation filter: {access_tokens.revoked.current.size / 8 / 1024:.0f} KB, "
+          f"{access_tokens.revoked.current.hashes} hashes per generation")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
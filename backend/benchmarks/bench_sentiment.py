@@ -0,0 +1,118 @@
+"""
+Sentiment Throughput Benchmark - Scores a corpus of AI-style answers
+inline on the event loop, in one worker thread, in the sentiment
+process pool and with the vectorized lexicon backend, and reports
+texts/sec for each, then how closely the lexicon backend agrees with
+TextBlob's labels. Exits non-zero if any label differs on a fixed parity
+corpus, except for texts with emoticons or "(!)", which the lexicon
+backend does not model.
+
+Usage:
+    python -m benchmarks.bench_sentiment --texts 2000 --workers 4
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from typing import List
+
+from textblob._text import EMOTICONS
+
+from config import settings
+from agents.browser_scout import BrowserScout
+from services.lexicon_sentiment import LexiconSentiment, get_lexicon_sentiment
+from services.sentiment_executor import SentimentExecutor, classify_polarity, score_batch
+
+
+# Size of the fixed corpus labels are checked on, whatever --texts is
+PARITY_TEXTS = 500
+
+# What TextBlob scores that the lexicon backend does not model
+UNMODELLED = {emoticon for emoticons in EMOTICONS.values() for emoticon in emoticons} | {"(!)"}
+
+
+def build_corpus(count: int, seed: int = 7) -> List[str]:
+    """Unique texts stitched from the mock platform answers."""
+    rng = random.Random(seed)
+    sentences = [
+        sentence.strip()
+        for answers in BrowserScout.MOCK_RESPONSES.values()
+        for answer in answers.values()
+        for sentence in answer.replace("\n", " ").split(". ")
+        if sentence.strip()
+    ]
+    return [f"Answer {i}: " + ". ".join(rng.sample(sentences, 8)) for i in range(count)]
+
+
+async def run_mode(label: str, texts: List[str], workers: int) -> List:
+    settings.SENTIMENT_BACKEND = "lexicon" if label == "lexicon" else "textblob"
+    start = time.perf_counter()
+    if label in ("inline", "lexicon"):
+        scores = score_batch(texts)
+    else:
+        settings.SENTIMENT_PROCESS_POOL = label == "processes"
+        executor = SentimentExecutor(max_workers=workers)
+        await executor.startup()
+        start = time.perf_counter()  # exclude worker start-up
+        scores = await executor.analyze_batch(texts)
+        executor.shutdown()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {len(texts) / elapsed:9.1f} texts/s  {elapsed:6.2f}s  ({len(texts) / elapsed * 60:,.0f}/min)")
+    return scores
+
+
+def mock_answers() -> List[str]:
+    return [answer for answers in BrowserScout.MOCK_RESPONSES.values() for answer in answers.values()]
+
+
+def unmodelled(text: str) -> bool:
+    return "(!)" in text or any(token in UNMODELLED for token in text.split())
+
+
+def check_parity() -> int:
+    """Label mismatches between the backends on the fixed corpus; texts with emoticons or "(!)" are skipped."""
+    texts = [text for text in mock_answers() + build_corpus(PARITY_TEXTS) if not unmodelled(text)]
+    settings.SENTIMENT_BACKEND = "textblob"
+    reference = score_batch(texts)
+    settings.SENTIMENT_BACKEND = "lexicon"
+    lexicon = score_batch(texts)
+    mismatches = [(text, ours, theirs) for text, ours, theirs in zip(texts, lexicon, reference) if ours[0] != theirs[0]]
+    for text, ours, theirs in mismatches[:10]:
+        print(f"  lexicon {ours[0]} ({ours[1]:+.3f}) vs TextBlob {theirs[0]} ({theirs[1]:+.3f}): {text[:80]!r}")
+    print(f"parity corpus:                  {len(texts) - len(mismatches)}/{len(texts)} labels agree")
+    return len(mismatches)
+
+
+def report_parity(texts: List[str], reference: List, lexicon: List) -> None:
+    """Label agreement of the lexicon backend with TextBlob."""
+    agree = sum(ours[0] == theirs[0] for ours, theirs in zip(lexicon, reference))
+    print(f"\nlexicon vs TextBlob labels:     {agree}/{len(texts)} agree ({agree / len(texts):.1%})")
+
+    # Without the indicator words the lexicon scorer should reproduce TextBlob exactly
+    plain = [classify_polarity(p) for p in LexiconSentiment(indicators=False).polarities(texts).tolist()]
+    same = sum(abs(ours[1] - theirs[1]) < 1e-9 for ours, theirs in zip(plain, reference))
+    print(f"lexicon without indicators:     {same}/{len(texts)} identical polarities ({same / len(texts):.1%})")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=0, help="process pool size (0 = one per core)")
+    args = parser.parse_args()
+
+    texts = build_corpus(args.texts)
+    workers = args.workers or SentimentExecutor().max_workers
+    print(f"{len(texts)} texts, {workers} worker processes")
+    reference = await run_mode("inline", texts, workers)
+    await run_mode("thread", texts, workers)
+    await run_mode("processes", texts, workers)
+    get_lexicon_sentiment()  # exclude compiling the lexicon
+    lexicon = await run_mode("lexicon", texts, workers)
+    report_parity(texts, reference, lexicon)
+    if check_parity():
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
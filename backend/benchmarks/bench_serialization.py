@@ -0,0 +1,73 @@
+"""
+Serialization Benchmark - Compares encoding audit results the way
+FastAPI does by default (audit_result_to_dict, then jsonable_encoder,
+then the json module) against the orjson path in audit_serializer, for
+single results and large batches. Both outputs are checked to decode to
+the same document.
+
+Usage:
+    python -m benchmarks.bench_serialization --audits 200 --batch 50
+"""
+import argparse
+import json
+import time
+from typing import Callable, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from routers.enhanced_audit import audit_result_to_dict
+from services.audit_serializer import ORJSON_AVAILABLE, dumps
+from services.geo_audit_engine import AuditResult, GEOAuditEngine
+
+
+def default_path(obj) -> bytes:
+    """What returning audit_result_to_dict() from a route costs."""
+    if isinstance(obj, list):
+        content = [audit_result_to_dict(result) for result in obj]
+    else:
+        content = audit_result_to_dict(obj)
+    return JSONResponse(content=jsonable_encoder(content)).body
+
+
+def time_mode(label: str, encode: Callable, payloads: List, repeat: int) -> float:
+    start = time.perf_counter()
+    size = 0
+    for _ in range(repeat):
+        for payload in payloads:
+            size = len(encode(payload))
+    elapsed = time.perf_counter() - start
+    per_payload = elapsed / (repeat * len(payloads))
+    print(f"{label:<10} {per_payload * 1e3:8.3f} ms/response  {1 / per_payload:9.1f} responses/s  {size / 1024:8.1f} KB")
+    return per_payload
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--audits", type=int, default=200, help="distinct audit results to encode")
+    parser.add_argument("--batch", type=int, default=50, help="results per batch response")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = GEOAuditEngine()
+    results: List[AuditResult] = [
+        engine.run_audit(brand_name=f"Brand {i}", industry=("crm", "software", "ecommerce")[i % 3])
+        for i in range(args.audits)
+    ]
+    engine.shutdown()
+    batches = [results[i:i + args.batch] for i in range(0, len(results), args.batch)]
+
+    for payload in (results[0], batches[0]):
+        if json.loads(dumps(payload)) != json.loads(default_path(payload)):
+            raise SystemExit("serializer output differs from audit_result_to_dict")
+
+    print(f"encoder: {'orjson' if ORJSON_AVAILABLE else 'json (orjson not installed)'}")
+    for name, payloads in (("single", results), (f"batch x{args.batch}", batches)):
+        print(f"\n{name}:")
+        baseline = time_mode("default", default_path, payloads, args.repeat)
+        direct = time_mode("direct", dumps, payloads, args.repeat)
+        print(f"speedup    {baseline / direct:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
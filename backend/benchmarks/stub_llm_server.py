@@ -0,0 +1,238 @@
+"""
+Stub LLM Server - Minimal local server mimicking the OpenAI, Gemini and
+Perplexity completion endpoints for benchmarking.
+Speaks HTTP/1.1 with keep-alive and, when the client sends the HTTP/2
+preface, cleartext HTTP/2 (h2c). Supports a configurable response latency,
+a per-connection setup latency that models the TCP+TLS handshake a real
+provider costs, and a rate of 429 responses carrying Retry-After.
+Streaming requests ("stream": true, or Gemini's streamGenerateContent)
+are answered as SSE, one word per event with a per-token delay.
+"""
+import asyncio
+import json
+import random
+from typing import Optional
+
+import h2.config
+import h2.connection
+import h2.events
+import h2.exceptions
+
+
+STUB_TEXT = (
+    "Based on my analysis, the top recommended tools are Salesforce, HubSpot "
+    "and Pipedrive. Each is reliable and trusted by many businesses."
+)
+
+H2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+
+
+class StubLLMServer:
+    """Asyncio HTTP server returning canned completion payloads."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.05,
+        connect_latency: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 0.1,
+        token_latency: float = 0.0,
+    ):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.connect_latency = connect_latency
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.token_latency = token_latency
+        self.requests = 0
+        self.tokens_streamed = 0
+        self.throttled = 0
+        self.connections = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def _payload(self, path: str) -> bytes:
+        if "generateContent" in path:
+            body = {"candidates": [{"content": {"parts": [{"text": STUB_TEXT}]}}]}
+        else:
+            body = {
+                "choices": [{"message": {"role": "assistant", "content": STUB_TEXT}}],
+                "usage": {"prompt_tokens": 20, "completion_tokens": 30, "total_tokens": 50},
+            }
+        return json.dumps(body).encode()
+
+    @staticmethod
+    def _is_stream(path: str, body: bytes) -> bool:
+        if "streamGenerateContent" in path:
+            return True
+        try:
+            return bool(json.loads(body or b"{}").get("stream"))
+        except ValueError:
+            return False
+
+    def _stream_events(self, path: str):
+        """SSE events for a streamed answer, one word per event."""
+        words = STUB_TEXT.split(" ")
+        gemini = "streamGenerateContent" in path
+        for i, word in enumerate(words):
+            text = word if i == 0 else " " + word
+            if gemini:
+                event = {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+                if i == len(words) - 1:
+                    event["usageMetadata"] = {"totalTokenCount": 50}
+            else:
+                event = {"choices": [{"index": 0, "delta": {"content": text}}]}
+            yield f"data: {json.dumps(event)}\n\n".encode()
+        if not gemini:
+            usage = {"choices": [], "usage": {"prompt_tokens": 20, "completion_tokens": 30, "total_tokens": 50}}
+            yield f"data: {json.dumps(usage)}\n\n".encode()
+            yield b"data: [DONE]\n\n"
+
+    def _should_throttle(self) -> bool:
+        if self.throttle_rate and random.random() < self.throttle_rate:
+            self.throttled += 1
+            return True
+        return False
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        if self.connect_latency:
+            await asyncio.sleep(self.connect_latency)
+        try:
+            head = await reader.readexactly(len(H2_PREFACE))
+            if head == H2_PREFACE:
+                await self._serve_h2(head, reader, writer)
+            else:
+                await self._serve_h1(head, reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_h1(self, head: bytes, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        buffered = head
+        while True:
+            request_line = buffered + await reader.readline()
+            buffered = b""
+            if not request_line.strip():
+                break
+            _, path, _ = request_line.decode().split(" ", 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode().partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length", 0))
+            request_body = await reader.readexactly(length) if length else b""
+
+            self.requests += 1
+            await asyncio.sleep(self.latency)
+
+            throttled = self._should_throttle()
+            keep_alive = headers.get("connection", "").lower() != "close"
+            if not throttled and self._is_stream(path, request_body):
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                    b"Transfer-Encoding: chunked\r\n"
+                    + (b"Connection: keep-alive\r\n" if keep_alive else b"Connection: close\r\n")
+                    + b"\r\n"
+                )
+                for chunk in self._stream_events(path):
+                    if self.token_latency:
+                        await asyncio.sleep(self.token_latency)
+                    writer.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                    await writer.drain()
+                    self.tokens_streamed += 1
+                writer.write(b"0\r\n\r\n")
+                await writer.drain()
+                if not keep_alive:
+                    break
+                continue
+
+            body = b'{"error": "rate_limited"}' if throttled else self._payload(path)
+            writer.write(
+                (f"HTTP/1.1 429 Too Many Requests\r\nRetry-After: {self.retry_after}\r\n".encode()
+                 if throttled else b"HTTP/1.1 200 OK\r\n")
+                + b"Content-Type: application/json\r\n"
+                + f"Content-Length: {len(body)}\r\n".encode()
+                + (b"Connection: keep-alive\r\n" if keep_alive else b"Connection: close\r\n")
+                + b"\r\n"
+                + body
+            )
+            await writer.drain()
+            if not keep_alive:
+                break
+
+    async def _serve_h2(self, preface: bytes, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+        conn.initiate_connection()
+        writer.write(conn.data_to_send())
+        paths = {}
+        bodies = {}
+
+        async def respond(stream_id: int) -> None:
+            self.requests += 1
+            await asyncio.sleep(self.latency)
+            path = paths.pop(stream_id, "/")
+            request_body = bodies.pop(stream_id, b"")
+            throttled = self._should_throttle()
+            if not throttled and self._is_stream(path, request_body):
+                conn.send_headers(stream_id, [(":status", "200"), ("content-type", "text/event-stream")])
+                try:
+                    for chunk in self._stream_events(path):
+                        if self.token_latency:
+                            await asyncio.sleep(self.token_latency)
+                        conn.send_data(stream_id, chunk)
+                        writer.write(conn.data_to_send())
+                        await writer.drain()
+                        self.tokens_streamed += 1
+                    conn.end_stream(stream_id)
+                    writer.write(conn.data_to_send())
+                    await writer.drain()
+                except h2.exceptions.StreamClosedError:
+                    pass  # client cancelled the stream
+                return
+            if throttled:
+                body = b'{"error": "rate_limited"}'
+                status = [(":status", "429"), ("retry-after", str(self.retry_after))]
+            else:
+                body = self._payload(path)
+                status = [(":status", "200")]
+            conn.send_headers(stream_id, status + [
+                ("content-type", "application/json"),
+                ("content-length", str(len(body))),
+            ])
+            conn.send_data(stream_id, body, end_stream=True)
+            writer.write(conn.data_to_send())
+            await writer.drain()
+
+        data = preface
+        while data:
+            for event in conn.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    paths[event.stream_id] = dict(event.headers).get(b":path", b"/").decode()
+                elif isinstance(event, h2.events.DataReceived):
+                    bodies[event.stream_id] = bodies.get(event.stream_id, b"") + event.data
+                    conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                elif isinstance(event, h2.events.StreamEnded):
+                    asyncio.ensure_future(respond(event.stream_id))
+            writer.write(conn.data_to_send())
+            await writer.drain()
+            data = await reader.read(65535)
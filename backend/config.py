@@ -2,27 +2,153 @@
 GEO-Sight Backend Configuration
 """
 from pydantic_settings import BaseSettings
-from pydantic import field_validator
+from pydantic import BaseModel, field_validator
 from typing import Optional, Union, Any
 import json
 
 
+class ProviderLimits(BaseModel):
+    """Per-provider quota, concurrency and retry policy (0 disables a limit)."""
+    rpm: int = 0  # requests per minute
+    tpm: int = 0  # tokens per minute
+    max_concurrency: int = 8
+    max_retries: int = 4
+    backoff_base: float = 0.5  # seconds, doubled per attempt
+    backoff_max: float = 30.0
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
     
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./geosight.db"
+    DATABASE_POOL_SIZE: int = 10
+    DATABASE_MAX_OVERFLOW: int = 20
+    DATABASE_BUSY_TIMEOUT_MS: int = 5000  # SQLite: wait this long for a write lock
     
     # API Keys (optional - will use mock data if not provided)
     OPENAI_API_KEY: Optional[str] = None
     GOOGLE_AI_API_KEY: Optional[str] = None
     PERPLEXITY_API_KEY: Optional[str] = None
     
+    # AI provider endpoints (override to point at a proxy or local stub)
+    OPENAI_BASE_URL: str = "https://api.openai.com/v1"
+    GEMINI_BASE_URL: str = "https://generativelanguage.googleapis.com/v1beta"
+    PERPLEXITY_BASE_URL: str = "https://api.perplexity.ai"
+    
+    # AI provider models
+    OPENAI_MODEL: str = "gpt-4o"
+    GEMINI_MODEL: str = "gemini-pro"
+    PERPLEXITY_MODEL: str = "llama-3.1-sonar-small-128k-online"
+    
+    # Outbound HTTP connection pool (one long-lived client per provider)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 50
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_TIMEOUT: float = 30.0
+    HTTP_CONNECT_TIMEOUT: float = 10.0
+    HTTP2_ENABLED: bool = True
+    HTTP2_PRIOR_KNOWLEDGE: bool = False  # h2c to plain-http proxies/sidecars
+    
     # Server
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     DEBUG: bool = True
     
+    # Provider response cache (in-process LRU + SQLite tier)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 10000
+    RESPONSE_CACHE_PATH: str = "./response_cache.db"  # empty disables the SQLite tier
+    RESPONSE_CACHE_TTLS: dict[str, int] = {"chatgpt": 3600, "gemini": 3600, "perplexity": 900, "default": 3600}
+    RESPONSE_CACHE_STALE_SECONDS: int = 600  # serve stale while revalidating
+    
+    # Provider rate limits and retry policy, keyed by platform
+    PROVIDER_LIMITS: dict[str, ProviderLimits] = {
+        "chatgpt": ProviderLimits(rpm=500, tpm=30000, max_concurrency=16),
+        "gemini": ProviderLimits(rpm=60, tpm=32000, max_concurrency=8),
+        "perplexity": ProviderLimits(rpm=50, max_concurrency=8),
+    }
+    MOCK_FALLBACK_ON_ERROR: bool = False  # substitute mock answers when a provider fails
+    
+    # Stream completions token by token and match the brand as text arrives
+    PROVIDER_STREAMING: bool = True
+    EARLY_CUTOFF_ENABLED: bool = False  # stop reputation answers once enough signal is in
+    EARLY_CUTOFF_MIN_CONTEXTS: int = 2  # brand contexts required before cutting off
+    EARLY_CUTOFF_MIN_CHARS: int = 600  # keep enough text for sentiment analysis
+    
+    # Coalesce identical in-flight provider queries
+    SINGLE_FLIGHT_ENABLED: bool = True
+    
+    # Batch audits
+    BATCH_MAX_RECORDS: int = 10000
+    BATCH_TIER_LIMITS: dict[str, int] = {"free": 0, "pro": 1000, "agency": 10000}  # records per batch by tier; 0 = no batch audits
+    BATCH_MAX_CONCURRENCY: int = 32  # brands audited at once per batch
+    BATCH_PROGRESS_EVERY: int = 25  # emit a progress event every N audits
+    
+    # Sentiment scoring
+    SENTIMENT_BACKEND: str = "textblob"  # "textblob" or "lexicon" (vectorized NumPy scorer)
+    SENTIMENT_PROCESS_POOL: bool = True  # score batches in worker processes (else a thread)
+    SENTIMENT_WORKERS: int = 0  # worker processes; 0 = one per CPU core
+    SENTIMENT_BATCH_SIZE: int = 64  # texts per worker task
+    COMPETITOR_SENTIMENT_WINDOW: int = 0  # chars either side of a competitor mention scored; 0 = whole answer
+    
+    # Analysis cache (sentiment, brand mention and competitor results by content hash)
+    ANALYSIS_CACHE_ENABLED: bool = True
+    ANALYSIS_CACHE_MAX_ENTRIES: int = 50000
+    ANALYSIS_CACHE_PATH: str = ""  # SQLite file for a disk tier; empty keeps results in memory only
+    ANALYSIS_CACHE_TTL: int = 7 * 24 * 3600  # disk rows are purged after this many seconds
+    
+    # Enhanced audit engine
+    AUDIT_ENGINE_REAL_APIS: bool = False  # query platforms via BrowserScout instead of simulating
+    AUDIT_ENGINE_WORKERS: int = 4  # threads for CPU-bound audit sections
+    
+    # Background audit jobs
+    JOB_WORKERS: int = 4
+    JOB_POLL_INTERVAL: float = 1.0  # seconds between queue polls when idle
+    JOB_SHUTDOWN_TIMEOUT: float = 5.0  # grace for running jobs before workers are cancelled
+    JOB_LEASE_SECONDS: float = 60.0  # a running job unrenewed this long is taken to be orphaned
+    
+    # Auth tokens
+    AUTH_TOKEN_MODE: str = "session"  # "session" (opaque, database-backed) or "jwt" (signed access + refresh tokens)
+    SECRET_KEY: str = "your-secret-key-change-in-production"
+    JWT_ALGORITHM: str = "HS256"
+    JWT_ACCESS_TOKEN_MINUTES: int = 15
+    JWT_REFRESH_TOKEN_DAYS: int = 30  # refresh tokens are database-backed sessions
+    JWT_VERIFY_CACHE_SIZE: int = 10000  # verified access tokens remembered per worker
+    REVOCATION_BLOOM_CAPACITY: int = 100000  # revoked access tokens per generation
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001  # a false positive costs one refresh
+    REVOCATION_SYNC_INTERVAL: float = 5.0  # seconds between pulls of other workers' revocations
+    
+    # Auth sessions
+    SESSION_CACHE_TTL: float = 30.0  # seconds a verified token is trusted before rechecking the database
+    SESSION_CACHE_MAX_ENTRIES: int = 100000
+    SESSION_SWEEP_INTERVAL: float = 300.0  # seconds between deletions of expired session rows
+    
+    # Password hashing
+    PASSWORD_HASH_SCHEME: str = "argon2"  # "argon2" (Argon2id, needs argon2-cffi; else scrypt) or "scrypt"
+    PASSWORD_HASH_WORKERS: int = 4  # threads hashing at once; each holds its memory cost until done
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536  # KiB per hash
+    ARGON2_PARALLELISM: int = 1  # lanes per hash; the pool runs logins in parallel instead
+    SCRYPT_LOG_N: int = 15  # N = 2**15, 32 MiB per hash with r=8
+    SCRYPT_R: int = 8
+    SCRYPT_P: int = 1
+    
+    # User accounts
+    USER_CACHE_TTL: float = 10.0  # seconds a loaded user is reused before rereading it
+    USER_CACHE_MAX_ENTRIES: int = 50000
+    
+    # API keys
+    API_QUOTAS: dict[str, int] = {"free": 0, "pro": 1000, "agency": 10000}  # requests per window by tier; 0 = no API access
+    API_QUOTA_WINDOW: int = 3600  # seconds; quotas apply to any sliding window this long
+    API_QUOTA_FLUSH_INTERVAL: float = 5.0  # seconds between batched writes of request counts
+    
+    # Response compression
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # bytes; smaller responses are sent uncompressed
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5  # 0-11; higher is smaller but slower
+    
     # CORS
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://127.0.0.1:3000"]
 
@@ -8,8 +8,24 @@ from contextlib import asynccontextmanager
 
 from config import settings
 from routers import audit_router, schema_router
-from routers.auth import router as auth_router
+from routers.auth import router as auth_router, ensure_demo_users
 from routers.enhanced_audit import router as enhanced_audit_router
+from routers.batch_audit import router as batch_audit_router
+from routers.audit_jobs import router as audit_jobs_router
+from models.database import engine, init_db
+from services.http_clients import provider_clients
+from services.response_cache import response_cache
+from services.single_flight import provider_flights
+from services.rate_limiter import provider_governors
+from services.job_queue import audit_jobs
+from services.geo_audit_engine import audit_engine
+from services.sentiment_executor import sentiment_executor
+from services.analysis_cache import analysis_cache
+from services.compression import BROTLI_AVAILABLE, CompressionMiddleware
+from services.session_store import session_store
+from services.access_tokens import access_tokens
+from services.password_hasher import configured_scheme, password_hasher
+from services.api_quota import RATE_LIMIT_HEADERS, RateLimitHeadersMiddleware, api_quota
 
 
 @asynccontextmanager
@@ -23,9 +39,42 @@ async def lifespan(app: FastAPI):
     print(f"[API] Perplexity: {'Configured' if settings.PERPLEXITY_API_KEY else 'Mock mode'}")
     print("[AUTH] Authentication: Enabled")
     print("[GEO] Enhanced Audit Engine: Ready")
+    await init_db()
+    await ensure_demo_users()
+    await session_store.start()
+    if settings.AUTH_TOKEN_MODE == "jwt":
+        await access_tokens.revoked.start()
+        print(f"[AUTH] Tokens: signed access ({settings.JWT_ACCESS_TOKEN_MINUTES} min) + refresh sessions")
+    else:
+        print(f"[AUTH] Sessions: database-backed, verified tokens cached {settings.SESSION_CACHE_TTL:g}s per worker")
+    await api_quota.start()
+    print(f"[AUTH] API keys: {', '.join(f'{tier} {limit}' for tier, limit in settings.API_QUOTAS.items() if limit)} requests per {settings.API_QUOTA_WINDOW}s")
+    print(f"[AUTH] Password hashing: {configured_scheme()} on {password_hasher.max_workers} threads")
+    await audit_jobs.start()
+    print(f"[JOBS] Audit workers: {settings.JOB_WORKERS}")
+    await provider_clients.startup()
+    await sentiment_executor.startup()
+    if settings.SENTIMENT_BACKEND == "lexicon":
+        print("[NLP] Sentiment backend: lexicon (vectorized, one thread call per batch)")
+    else:
+        print(f"[NLP] Sentiment workers: {sentiment_executor.max_workers} ({'processes' if settings.SENTIMENT_PROCESS_POOL else 'thread'})")
+    if settings.COMPRESSION_ENABLED:
+        print(f"[HTTP] Response compression: {'brotli, gzip' if BROTLI_AVAILABLE else 'gzip'} (>= {settings.COMPRESSION_MINIMUM_SIZE} bytes)")
+    print(f"[HTTP] Provider clients: pooled (max {settings.HTTP_MAX_CONNECTIONS} connections, HTTP/2 {'on' if provider_clients.http2 else 'off'})")
     yield
     # Shutdown
     print("[SHUTDOWN] GEO-Sight Pro Backend shutting down...")
+    await audit_jobs.stop()
+    await session_store.stop()
+    await access_tokens.revoked.stop()
+    await api_quota.stop()
+    await provider_clients.shutdown()
+    await engine.dispose()
+    audit_engine.shutdown()
+    sentiment_executor.shutdown()
+    password_hasher.shutdown()
+    response_cache.close()
+    analysis_cache.close()
 
 
 app = FastAPI(
@@ -42,11 +91,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=list(RATE_LIMIT_HEADERS),
 )
 
+# Quota headers for API-key requests
+app.add_middleware(RateLimitHeadersMiddleware)
+
+# Compress large responses (audits, schemas) for clients that accept it
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
 # Include routers
 app.include_router(auth_router)
 app.include_router(enhanced_audit_router)
+app.include_router(batch_audit_router)
+app.include_router(audit_jobs_router)
 app.include_router(audit_router)
 app.include_router(schema_router)
 
@@ -92,6 +151,23 @@ async def health_check():
     }
 
 
+@app.get("/api/metrics")
+async def metrics():
+    """Runtime performance counters."""
+    return {
+        "response_cache": response_cache.stats(),
+        "single_flight": provider_flights.stats(),
+        "providers": provider_governors.stats(),
+        "jobs": audit_jobs.stats(),
+        "sentiment": sentiment_executor.stats(),
+        "analysis_cache": analysis_cache.stats(),
+        "sessions": session_store.stats(),
+        "access_tokens": access_tokens.stats(),
+        "passwords": password_hasher.stats(),
+        "api_quota": api_quota.stats()
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -1,4 +1,10 @@
 """Models package."""
-from .database import Base, Brand, Audit, Mention, CitationGap, HallucinationAlert
+from .database import (
+    Base, User, Brand, Audit, Mention, CitationGap, HallucinationAlert,
+    engine, async_session, init_db,
+)
 
-__all__ = ["Base", "Brand", "Audit", "Mention", "CitationGap", "HallucinationAlert"]
+__all__ = [
+    "Base", "User", "Brand", "Audit", "Mention", "CitationGap", "HallucinationAlert",
+    "engine", "async_session", "init_db",
+]
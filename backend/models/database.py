@@ -1,12 +1,15 @@
 """
 Database models for GEO-Sight
 """
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, JSON, ForeignKey, Float, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, JSON, ForeignKey, Float, Enum, Index, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
 
+from config import settings
+
 Base = declarative_base()
 
 
@@ -55,6 +58,12 @@ class User(Base):
     # Relationships
     brands = relationship("Brand", back_populates="user", cascade="all, delete-orphan")
     audits = relationship("Audit", back_populates="user", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Admin listing keyset pagination, filtered by tier or status
+        Index("ix_users_tier_id", "tier", "id"),
+        Index("ix_users_active_id", "is_active", "id"),
+    )
 
 
 class Brand(Base):
@@ -81,7 +90,7 @@ class Audit(Base):
     __tablename__ = "audits"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # Optional for anonymous audits
     brand_id = Column(Integer, ForeignKey("brands.id"), nullable=True)  # Optional for quick audits
     brand_name = Column(String(255))  # Store brand name for quick audits
     industry = Column(String(255))
@@ -93,8 +102,24 @@ class Audit(Base):
     status = Column(String(20), default="pending")  # pending, running, completed, failed
     duration_seconds = Column(Float)
     created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
     completed_at = Column(DateTime)
     
+    # Background job data
+    parameters = Column(JSON)  # audit request, including the engine to run
+    result = Column(JSON)  # full audit payload once completed
+    error = Column(Text)  # failure reason
+    claimed_by = Column(String(64))  # worker running the job
+    lease_expires_at = Column(DateTime)  # renewed while it runs; past it, the job is requeued
+    
+    __table_args__ = (
+        Index("ix_audits_status_id", "status", "id"),  # worker claims oldest pending
+        # History keyset pagination, unfiltered and by brand or status
+        Index("ix_audits_user_created_id", "user_id", "created_at", "id"),
+        Index("ix_audits_user_brand_created_id", "user_id", "brand_name", "created_at", "id"),
+        Index("ix_audits_user_status_created_id", "user_id", "status", "created_at", "id"),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="audits")
     brand = relationship("Brand", back_populates="audits")
@@ -108,18 +133,21 @@ class Mention(Base):
     __tablename__ = "mentions"
     
     id = Column(Integer, primary_key=True, index=True)
-    audit_id = Column(Integer, ForeignKey("audits.id"), nullable=False)
+    audit_id = Column(Integer, ForeignKey("audits.id"), nullable=False, index=True)
     source = Column(String(50), nullable=False)  # chatgpt, gemini, perplexity
     query_type = Column(String(50))  # industry, reputation, comparison
     query = Column(Text, nullable=False)
     response_text = Column(Text)
     brand_mentioned = Column(Boolean, default=False)
     mention_context = Column(Text)  # The specific text where brand is mentioned
+    contexts = Column(JSON, default=list)  # Every snippet around a brand mention
     sentiment = Column(String(20))  # positive, neutral, negative
     sentiment_score = Column(Float)  # -1.0 to 1.0
     competitors_mentioned = Column(JSON, default=list)
     citations = Column(JSON, default=list)
     is_mock = Column(Boolean, default=False)
+    truncated = Column(Boolean, default=False)  # streamed answer cut off early
+    error = Column(Text)  # provider failure, if any
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -131,7 +159,7 @@ class CitationGap(Base):
     __tablename__ = "citation_gaps"
     
     id = Column(Integer, primary_key=True, index=True)
-    audit_id = Column(Integer, ForeignKey("audits.id"), nullable=False)
+    audit_id = Column(Integer, ForeignKey("audits.id"), nullable=False, index=True)
     platform = Column(String(100))  # Reddit, G2, TechCrunch, etc.
     url = Column(String(500))
     competitor_mentioned = Column(String(255))
@@ -150,7 +178,7 @@ class HallucinationAlert(Base):
     __tablename__ = "hallucination_alerts"
     
     id = Column(Integer, primary_key=True, index=True)
-    audit_id = Column(Integer, ForeignKey("audits.id"), nullable=False)
+    audit_id = Column(Integer, ForeignKey("audits.id"), nullable=False, index=True)
     source = Column(String(50))  # chatgpt, gemini, perplexity
     incorrect_claim = Column(Text)
     correct_information = Column(Text)
@@ -161,3 +189,54 @@ class HallucinationAlert(Base):
     
     # Relationships
     audit = relationship("Audit", back_populates="hallucination_alerts")
+
+
+class AuthSession(Base):
+    """Sign-in sessions, shared by every worker; tokens are stored hashed."""
+    __tablename__ = "sessions"
+    
+    token_hash = Column(String(64), primary_key=True)  # sha256 of the bearer token
+    user_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_sessions_user_id", "user_id"),  # sign out everywhere
+        Index("ix_sessions_expires_at", "expires_at"),  # expiry sweep
+    )
+
+
+class RevokedToken(Base):
+    """Signed access tokens revoked before they expire (logout)."""
+    __tablename__ = "revoked_tokens"
+    
+    id = Column(Integer, primary_key=True)  # workers pull rows above the last id they saw
+    jti = Column(String(64), nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+# Async engine and session factory
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_pre_ping=True,
+)
+async_session = async_sessionmaker(engine, expire_on_commit=False)
+
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _sqlite_pragmas(dbapi_connection, connection_record):
+        """WAL lets readers run alongside a writer, across uvicorn workers too."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={settings.DATABASE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+
+
+async def init_db() -> None:
+    """Create tables that do not exist yet."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
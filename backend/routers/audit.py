@@ -1,14 +1,17 @@
 """
 API Routes for Audit operations
 """
-from fastapi import APIRouter, Depends, HTTPException
+import json
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List
-from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime
 
-from agents import browser_scout, sentiment_agent
-from services import schema_generator
+from routers.auth import get_optional_user
+from services.audit_runner import AuditInput, execute_audit, stream_audit
+from services.audit_store import audit_store
+from services.etags import matches, not_modified, strong_etag, tag_response
 
 router = APIRouter(prefix="/api/audit", tags=["audit"])
 
@@ -37,171 +40,100 @@ class AuditResponse(BaseModel):
     created_at: str
 
 
-# In-memory storage for demo (replace with DB in production)
-audits_store = {}
-audit_counter = 0
-
-
 @router.post("/run", response_model=dict)
-async def run_audit(request: AuditRequest):
+async def run_audit(request: AuditRequest, user: Optional[dict] = Depends(get_optional_user)):
     """Run a new GEO audit for a brand."""
-    global audit_counter
-    
-    # Run browser scout to query AI platforms
-    scout_results = await browser_scout.run_audit(
-        brand_name=request.brand_name,
-        industry=request.industry,
-        use_case=request.use_case
+    return await execute_audit(AuditInput(**request.model_dump(), user_id=user["id"] if user else None))
+
+
+@router.get("/stream")
+async def stream_audit_events(
+    brand_name: str,
+    industry: str = "software",
+    use_case: str = "business operations",
+    user: Optional[dict] = Depends(get_optional_user)
+):
+    """
+    Run an audit as Server-Sent Events. Emits a `mention` event per platform
+    answer as soon as it is analyzed (with the running visibility score),
+    then a `complete` event with the stored audit.
+    """
+    audit = AuditInput(
+        brand_name=brand_name,
+        industry=industry,
+        use_case=use_case,
+        user_id=user["id"] if user else None
     )
     
-    # Analyze each response with sentiment agent
-    mentions = []
-    chatgpt_mentioned = False
-    gemini_mentioned = False
-    perplexity_mentioned = False
-    all_sentiments = []
+    async def events():
+        async for event in stream_audit(audit):
+            yield f"event: {event['event']}\ndata: {json.dumps(event)}\n\n"
     
-    for source, queries in scout_results["responses"].items():
-        for query_type, response_data in queries.items():
-            response_text = response_data.get("response", "")
-            
-            # Detect brand mention
-            mention_analysis = sentiment_agent.detect_brand_mention(
-                response_text, request.brand_name
-            )
-            
-            # Analyze sentiment
-            sentiment, score = sentiment_agent.analyze_sentiment(response_text)
-            all_sentiments.append(sentiment)
-            
-            # Track platform mentions
-            if mention_analysis["mentioned"]:
-                if source == "chatgpt":
-                    chatgpt_mentioned = True
-                elif source == "gemini":
-                    gemini_mentioned = True
-                elif source == "perplexity":
-                    perplexity_mentioned = True
-            
-            mentions.append({
-                "source": source,
-                "query_type": query_type,
-                "query": response_data.get("query", ""),
-                "response_preview": response_text[:500] + "..." if len(response_text) > 500 else response_text,
-                "brand_mentioned": mention_analysis["mentioned"],
-                "contexts": mention_analysis["contexts"],
-                "sentiment": sentiment,
-                "sentiment_score": score,
-                "is_mock": response_data.get("is_mock", False)
-            })
-    
-    # Calculate overall sentiment
-    positive_count = all_sentiments.count("positive")
-    negative_count = all_sentiments.count("negative")
-    if positive_count > negative_count:
-        overall_sentiment = "positive"
-    elif negative_count > positive_count:
-        overall_sentiment = "negative"
-    else:
-        overall_sentiment = "neutral"
-    
-    # Calculate visibility score
-    visibility_score = sentiment_agent.calculate_visibility_score(
-        chatgpt_mentioned=chatgpt_mentioned,
-        gemini_mentioned=gemini_mentioned,
-        perplexity_mentioned=perplexity_mentioned,
-        overall_sentiment=overall_sentiment,
-        citation_count=0
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
-    
-    # Generate citation gaps (mock data for demo)
-    citation_gaps = []
-    if not chatgpt_mentioned or not gemini_mentioned:
-        citation_gaps = [
-            {
-                "platform": "Reddit r/software",
-                "url": "https://reddit.com/r/software/comments/example",
-                "competitor_mentioned": "Salesforce",
-                "context": "Discussion about top CRM tools",
-                "priority": "high",
-                "pitch_template": f"Have you considered {request.brand_name}? We offer {request.use_case} with excellent support and competitive pricing."
-            },
-            {
-                "platform": "G2 Crowd",
-                "url": "https://g2.com/categories/crm",
-                "competitor_mentioned": "HubSpot",
-                "context": "CRM comparison reviews",
-                "priority": "medium",
-                "pitch_template": f"As a {request.industry} solution, {request.brand_name} provides unique value through..."
-            },
-            {
-                "platform": "TechCrunch",
-                "url": "https://techcrunch.com/category/software",
-                "competitor_mentioned": "Pipedrive",
-                "context": "Industry news coverage",
-                "priority": "medium",
-                "pitch_template": f"Press release: {request.brand_name} announces new features for {request.use_case}..."
-            }
-        ]
-    
-    # Generate hallucination alerts (mock for demo)
-    hallucination_alerts = []
-    if overall_sentiment == "negative" or not (chatgpt_mentioned and gemini_mentioned):
-        hallucination_alerts = [
-            {
-                "source": "gemini",
-                "incorrect_claim": f"{request.brand_name} discontinued their service in 2024",
-                "correct_information": f"{request.brand_name} is actively operating and continuously improving their {request.industry} solutions",
-                "severity": "critical",
-                "correction_draft": f"""# Setting the Record Straight: {request.brand_name} is Thriving in 2026
-
-We've noticed some AI systems may have outdated information. Let us clarify:
-
-**{request.brand_name} Update - February 2026**
-
-Contrary to some AI-generated content, {request.brand_name} is fully operational and growing:
-
-- ✅ Active development with weekly updates
-- ✅ Serving thousands of satisfied customers
-- ✅ Recently launched new {request.use_case} features
-- ✅ Expanding our team and capabilities
-
-For accurate information, please visit our official website or contact our support team."""
-            }
-        ]
-    
-    # Store audit result
-    audit_counter += 1
-    audit_id = audit_counter
-    
-    audit_result = {
-        "id": audit_id,
-        "brand_name": request.brand_name,
-        "visibility_score": visibility_score,
-        "chatgpt_mentioned": chatgpt_mentioned,
-        "gemini_mentioned": gemini_mentioned,
-        "perplexity_mentioned": perplexity_mentioned,
-        "overall_sentiment": overall_sentiment,
-        "mentions": mentions,
-        "citation_gaps": citation_gaps,
-        "hallucination_alerts": hallucination_alerts,
-        "created_at": datetime.utcnow().isoformat()
-    }
-    
-    audits_store[audit_id] = audit_result
-    
-    return audit_result
+
+
+@router.get("/history")
+async def audit_history(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    brand: Optional[str] = None,
+    industry: Optional[str] = None,
+    status: Optional[str] = None,
+    min_score: Optional[int] = Query(None, ge=0, le=100),
+    max_score: Optional[int] = Query(None, ge=0, le=100),
+    fields: Optional[str] = Query(None, description="Comma-separated columns; add 'mentions' for per-mention summaries"),
+    user: Optional[dict] = Depends(get_optional_user)
+):
+    """
+    Page through your audit history, newest first. Pass the returned
+    `next_cursor` as `cursor` to get the next page. Anonymous callers see
+    anonymous audits.
+    """
+    try:
+        return await audit_store.history(
+            user_id=user["id"] if user else None,
+            limit=limit,
+            cursor=cursor,
+            brand=brand,
+            industry=industry,
+            status=status,
+            min_score=min_score,
+            max_score=max_score,
+            fields=[f.strip() for f in fields.split(",") if f.strip()] if fields else None,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/{audit_id}")
-async def get_audit(audit_id: int):
-    """Get a specific audit by ID."""
-    if audit_id not in audits_store:
+async def get_audit(audit_id: int, response: Response, if_none_match: Optional[str] = Header(None)):
+    """
+    Get a specific audit by ID. Send the returned ETag back in
+    If-None-Match to get 304 Not Modified instead of the full audit.
+    """
+    version = await audit_store.version(audit_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Audit not found")
+    etag = strong_etag("audit", audit_id, version)
+    matched = matches(if_none_match, etag)
+    if matched:
+        return not_modified(matched)
+    
+    audit = await audit_store.get(audit_id)
+    if audit is None:
         raise HTTPException(status_code=404, detail="Audit not found")
-    return audits_store[audit_id]
+    tag_response(response, etag)
+    return audit
 
 
 @router.get("/")
-async def list_audits():
-    """List all audits."""
-    return list(audits_store.values())
+async def list_audits(
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0)
+):
+    """List completed audits, newest first, one page at a time."""
+    return await audit_store.list(limit=limit, offset=offset)
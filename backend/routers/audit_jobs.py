@@ -0,0 +1,99 @@
+"""
+Audit Job API Routes - submit audits as background jobs and poll for results.
+"""
+from typing import Any, Dict, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import BaseModel
+
+from models.database import Audit
+from routers.auth import get_optional_user
+from services.audit_runner import AuditInput, perform_audit
+from services.geo_audit_engine import audit_engine
+from services.job_queue import audit_jobs
+from routers.enhanced_audit import audit_result_to_dict
+
+router = APIRouter(prefix="/api/audit/jobs", tags=["Audit Jobs"])
+
+
+class AuditJobRequest(BaseModel):
+    brand_name: str
+    industry: str = "software"
+    use_case: str = "business operations"
+    url: Optional[str] = None
+    engine: Literal["scout", "enhanced"] = "scout"
+
+
+async def run_scout_job(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """Live platform queries via BrowserScout + SentimentAgent."""
+    return await perform_audit(AuditInput(
+        brand_name=parameters["brand_name"],
+        industry=parameters["industry"],
+        use_case=parameters["use_case"],
+        brand_url=parameters.get("url"),
+    ))
+
+
+async def run_enhanced_job(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """Comprehensive GEOAuditEngine audit."""
+    result = await audit_engine.run_audit_async(
+        brand_name=parameters["brand_name"],
+        industry=parameters["industry"],
+        url=parameters.get("url"),
+    )
+    return audit_result_to_dict(result)
+
+
+audit_jobs.register_runner("scout", run_scout_job)
+audit_jobs.register_runner("enhanced", run_enhanced_job)
+
+
+def job_status(job: Audit) -> Dict[str, Any]:
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "brand_name": job.brand_name,
+        "engine": (job.parameters or {}).get("engine"),
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+        "duration_seconds": job.duration_seconds,
+        "error": job.error,
+        "result_url": f"/api/audit/jobs/{job.id}/result",
+    }
+
+
+async def get_job_or_404(job_id: int, user: Optional[dict]) -> Audit:
+    """A job the caller submitted; anonymous jobs belong to anonymous callers."""
+    job = await audit_jobs.get(job_id)
+    if job is None or job.parameters is None or job.user_id != (user["id"] if user else None):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("", status_code=status.HTTP_202_ACCEPTED)
+async def submit_audit_job(request: AuditJobRequest, user: Optional[dict] = Depends(get_optional_user)):
+    """Queue an audit and return its job id immediately."""
+    parameters = request.model_dump(exclude={"engine"})
+    job = await audit_jobs.submit(request.engine, parameters, user_id=user["id"] if user else None)
+    return job_status(job)
+
+
+@router.get("/{job_id}")
+async def get_audit_job(job_id: int, user: Optional[dict] = Depends(get_optional_user)):
+    """Get the status of an audit job."""
+    return job_status(await get_job_or_404(job_id, user))
+
+
+@router.get("/{job_id}/result")
+async def get_audit_job_result(job_id: int, user: Optional[dict] = Depends(get_optional_user)):
+    """
+    Get the result of a completed audit job. A failed job returns its
+    status, with the error, instead of a result.
+    """
+    job = await get_job_or_404(job_id, user)
+    if job.status == "failed":
+        return job_status(job)
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Audit job is {job.status}")
+    return job.result
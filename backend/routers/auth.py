@@ -2,26 +2,30 @@
 Authentication router for GEO-Sight
 Handles user registration, login, and token management
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.security import APIKeyHeader, OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from pydantic import BaseModel, EmailStr
 from datetime import datetime, timedelta
 from typing import Optional
 import secrets
-import hashlib
 
-# In production, use proper libraries:
-# from passlib.context import CryptContext
-# from jose import JWTError, jwt
+from config import settings
+from services.access_tokens import access_tokens
+from services.api_quota import api_quota
+from services.password_hasher import password_hasher
+from services.session_store import session_store
+from services.user_store import user_store
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 # Configuration
-SECRET_KEY = "your-secret-key-change-in-production"  # Change this!
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days
+SECRET_KEY = settings.SECRET_KEY  # Change this!
+ALGORITHM = settings.JWT_ALGORITHM
+ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 7  # 7 days (session mode)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
+api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 
 # ============ Pydantic Models ============
@@ -53,9 +57,15 @@ class UserResponse(BaseModel):
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None  # jwt mode
+    expires_in: Optional[int] = None  # seconds until access_token expires (jwt mode)
     user: UserResponse
 
 
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
 class PasswordChange(BaseModel):
     current_password: str
     new_password: str
@@ -66,64 +76,91 @@ class ProfileUpdate(BaseModel):
     email: Optional[EmailStr] = None
 
 
-# ============ In-Memory User Store (Replace with DB) ============
+# ============ Users ============
 
-# Simple password hashing (use passlib in production)
-def hash_password(password: str) -> str:
-    return hashlib.sha256((password + SECRET_KEY).encode()).hexdigest()
+async def hash_password(password: str) -> str:
+    return await password_hasher.hash(password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return hash_password(plain_password) == hashed_password
+async def authenticate(email: str, password: str) -> Optional[dict]:
+    """
+    The user with this email and password, or None. A legacy or outdated
+    password hash is replaced with one in the configured scheme.
+    """
+    user = await get_user_by_email(email)
+    if not user:
+        return None
+    matches, replacement = await password_hasher.verify(password, user["password_hash"])
+    if not matches:
+        return None
+    if replacement:
+        user = await user_store.update(user["id"], password_hash=replacement) or user
+    return user
 
 
-def generate_token() -> str:
-    return secrets.token_urlsafe(32)
+def jwt_mode() -> bool:
+    return settings.AUTH_TOKEN_MODE == "jwt"
 
 
-# In-memory storage (replace with database)
-users_db: dict = {
-    "demo@geosight.ai": {
-        "id": 1,
-        "email": "demo@geosight.ai",
-        "password_hash": hash_password("demo123"),
-        "name": "Demo User",
-        "role": "user",
-        "tier": "pro",
-        "is_active": True,
-        "created_at": datetime.utcnow(),
-    },
-    "admin@geosight.ai": {
-        "id": 2,
-        "email": "admin@geosight.ai",
-        "password_hash": hash_password("admin123"),
-        "name": "Admin User",
-        "role": "admin",
-        "tier": "agency",
-        "is_active": True,
-        "created_at": datetime.utcnow(),
-    },
-}
+async def issue_tokens(user: dict) -> dict:
+    """
+    Token fields of a TokenResponse. Session mode: one opaque token that
+    expires after ACCESS_TOKEN_EXPIRE_MINUTES. JWT mode: a short-lived
+    signed access token plus a refresh token backed by a session.
+    """
+    if not jwt_mode():
+        return {"access_token": await session_store.create(user["id"], ACCESS_TOKEN_EXPIRE_MINUTES * 60)}
+    return {
+        "access_token": access_tokens.issue(user["id"]),
+        "refresh_token": await session_store.create(user["id"], settings.JWT_REFRESH_TOKEN_DAYS * 86400),
+        "expires_in": access_tokens.lifetime,
+    }
 
-tokens_db: dict = {}  # token -> email
-next_user_id = 3
+
+# Accounts created on first startup
+DEMO_USERS = [
+    {"email": "demo@geosight.ai", "password": "demo123", "name": "Demo User", "role": "user", "tier": "pro"},
+    {"email": "admin@geosight.ai", "password": "admin123", "name": "Admin User", "role": "admin", "tier": "agency"},
+]
+
+
+async def ensure_demo_users() -> None:
+    """Create the demo accounts if they are not in the users table yet."""
+    for demo in DEMO_USERS:
+        if not await user_store.get_by_email(demo["email"]):
+            await user_store.create(
+                demo["email"],
+                await hash_password(demo["password"]),
+                name=demo["name"],
+                role=demo["role"],
+                tier=demo["tier"],
+            )
 
 
 # ============ Helper Functions ============
 
-def get_user_by_email(email: str) -> Optional[dict]:
-    return users_db.get(email)
+async def get_user_by_email(email: str) -> Optional[dict]:
+    return await user_store.get_by_email(email)
+
 
+async def get_user_by_id(user_id: int) -> Optional[dict]:
+    return await user_store.get(user_id)
 
-def get_user_by_token(token: str) -> Optional[dict]:
-    email = tokens_db.get(token)
-    if email:
-        return users_db.get(email)
+
+async def get_user_by_token(token: str) -> Optional[dict]:
+    if jwt_mode():
+        # Signature, expiry and revocation are checked in memory
+        claims = access_tokens.verify(token)
+        user_id = int(claims["sub"]) if claims else None
+    else:
+        user_id = await session_store.verify(token)
+    if user_id is not None:
+        return await get_user_by_id(user_id)
     return None
 
 
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
-    user = get_user_by_token(token)
+    user = await get_user_by_token(token)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -147,20 +184,58 @@ async def get_current_admin(user: dict = Depends(get_current_user)) -> dict:
     return user
 
 
+async def get_api_key_user(api_key: str, request: Optional[Request] = None) -> dict:
+    """
+    The user an API key belongs to, after counting the request against
+    their tier's quota. The RateLimit headers for the response are left
+    in request.state.rate_limit.
+    """
+    user = await user_store.get_by_api_key(api_key)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid API key",
+        )
+    if not user.get("is_active"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Account is suspended",
+        )
+    if api_quota.limit_for(user["tier"]) <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="API access requires Pro or Agency plan",
+        )
+    decision = await api_quota.hit(user["id"], user["tier"])
+    if not decision.allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="API quota exceeded",
+            headers=decision.headers(),
+        )
+    if request is not None:
+        request.state.rate_limit = decision
+    return user
+
+
+async def get_optional_user(
+    request: Request,
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    api_key: Optional[str] = Depends(api_key_header),
+) -> Optional[dict]:
+    """The signed-in user or API-key client, or None for anonymous requests."""
+    if api_key:
+        return await get_api_key_user(api_key, request)
+    if not token:
+        return None
+    return await get_current_user(token)
+
+
 # ============ Routes ============
 
 @router.post("/register", response_model=TokenResponse)
 async def register(user_data: UserCreate):
     """Register a new user."""
-    global next_user_id
-    
-    # Check if user exists
-    if get_user_by_email(user_data.email):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered",
-        )
-    
     # Validate password
     if len(user_data.password) < 6:
         raise HTTPException(
@@ -168,27 +243,25 @@ async def register(user_data: UserCreate):
             detail="Password must be at least 6 characters",
         )
     
-    # Create user
-    new_user = {
-        "id": next_user_id,
-        "email": user_data.email,
-        "password_hash": hash_password(user_data.password),
-        "name": user_data.name or user_data.email.split("@")[0],
-        "role": "user",
-        "tier": "free",
-        "is_active": True,
-        "created_at": datetime.utcnow(),
-    }
-    
-    users_db[user_data.email] = new_user
-    next_user_id += 1
+    # Create user (the unique email index rejects an existing account)
+    new_user = await user_store.create(
+        user_data.email,
+        await hash_password(user_data.password),
+        name=user_data.name or user_data.email.split("@")[0],
+        role="user",
+        tier="free",
+    )
+    if new_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
     
     # Generate token
-    token = generate_token()
-    tokens_db[token] = user_data.email
+    tokens = await issue_tokens(new_user)
     
     return TokenResponse(
-        access_token=token,
+        **tokens,
         user=UserResponse(**new_user),
     )
 
@@ -196,9 +269,9 @@ async def register(user_data: UserCreate):
 @router.post("/login", response_model=TokenResponse)
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     """Login with email and password."""
-    user = get_user_by_email(form_data.username)
+    user = await authenticate(form_data.username, form_data.password)
     
-    if not user or not verify_password(form_data.password, user["password_hash"]):
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -212,11 +285,10 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
         )
     
     # Generate token
-    token = generate_token()
-    tokens_db[token] = form_data.username
+    tokens = await issue_tokens(user)
     
     return TokenResponse(
-        access_token=token,
+        **tokens,
         user=UserResponse(**user),
     )
 
@@ -224,9 +296,9 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
 @router.post("/login/json", response_model=TokenResponse)
 async def login_json(credentials: UserLogin):
     """Login with JSON body (for frontend compatibility)."""
-    user = get_user_by_email(credentials.email)
+    user = await authenticate(credentials.email, credentials.password)
     
-    if not user or not verify_password(credentials.password, user["password_hash"]):
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -239,23 +311,60 @@ async def login_json(credentials: UserLogin):
         )
     
     # Generate token
-    token = generate_token()
-    tokens_db[token] = credentials.email
+    tokens = await issue_tokens(user)
+    
+    return TokenResponse(
+        **tokens,
+        user=UserResponse(**user),
+    )
+
+
+@router.post("/refresh", response_model=TokenResponse)
+async def refresh(request: RefreshRequest):
+    """Trade a refresh token for a new access and refresh token (jwt mode)."""
+    if not jwt_mode():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Refresh tokens are not enabled",
+        )
+    
+    user_id = await session_store.verify(request.refresh_token)
+    user = await get_user_by_id(user_id) if user_id is not None else None
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+        )
+    if not user.get("is_active"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Account is suspended",
+        )
+    
+    # Refresh tokens are single use: only the request that deletes the session gets new tokens
+    if not await session_store.revoke(request.refresh_token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+        )
+    tokens = await issue_tokens(user)
     
     return TokenResponse(
-        access_token=token,
+        **tokens,
         user=UserResponse(**user),
     )
 
 
 @router.post("/logout")
-async def logout(current_user: dict = Depends(get_current_user)):
+async def logout(token: str = Depends(oauth2_scheme), current_user: dict = Depends(get_current_user)):
     """Logout and invalidate the current token."""
-    # Find and remove the token
-    email = current_user["email"]
-    tokens_to_remove = [t for t, e in tokens_db.items() if e == email]
-    for token in tokens_to_remove:
-        del tokens_db[token]
+    if jwt_mode():
+        # The access token stays signed, so it is revoked until it expires
+        claims = access_tokens.verify(token)
+        if claims:
+            await access_tokens.revoke(claims)
+    # Sessions (refresh tokens in jwt mode) are indexed by user, so this does not scan other users' tokens
+    await session_store.revoke_user(current_user["id"])
     
     return {"message": "Successfully logged out"}
 
@@ -272,29 +381,27 @@ async def update_profile(
     current_user: dict = Depends(get_current_user),
 ):
     """Update current user profile."""
-    email = current_user["email"]
+    changes = {}
     
     if profile.name:
-        users_db[email]["name"] = profile.name
+        changes["name"] = profile.name
     
-    if profile.email and profile.email != email:
-        # Check if new email is taken
-        if get_user_by_email(profile.email):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already in use",
-            )
-        # Update email (move user to new key)
-        user_data = users_db.pop(email)
-        user_data["email"] = profile.email
-        users_db[profile.email] = user_data
-        
-        # Update token mapping
-        for token, user_email in tokens_db.items():
-            if user_email == email:
-                tokens_db[token] = profile.email
+    # Sessions refer to the user id, so they stay valid across an email change
+    if profile.email and profile.email != current_user["email"]:
+        changes["email"] = profile.email
+    
+    if not changes:
+        return UserResponse(**current_user)
     
-    return UserResponse(**users_db.get(profile.email or email))
+    try:
+        user = await user_store.update(current_user["id"], **changes)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already in use",
+        )
+    
+    return UserResponse(**user)
 
 
 @router.post("/change-password")
@@ -303,9 +410,8 @@ async def change_password(
     current_user: dict = Depends(get_current_user),
 ):
     """Change user password."""
-    email = current_user["email"]
-    
-    if not verify_password(data.current_password, current_user["password_hash"]):
+    matches, _ = await password_hasher.verify(data.current_password, current_user["password_hash"])
+    if not matches:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect",
@@ -317,7 +423,7 @@ async def change_password(
             detail="New password must be at least 6 characters",
         )
     
-    users_db[email]["password_hash"] = hash_password(data.new_password)
+    await user_store.update(current_user["id"], password_hash=await hash_password(data.new_password))
     
     return {"message": "Password changed successfully"}
 
@@ -331,12 +437,10 @@ async def get_api_key(current_user: dict = Depends(get_current_user)):
             detail="API access requires Pro or Agency plan",
         )
     
-    email = current_user["email"]
+    if not current_user.get("api_key"):
+        current_user = await user_store.update(current_user["id"], api_key=f"gs_live_{secrets.token_hex(24)}")
     
-    if "api_key" not in users_db[email] or not users_db[email]["api_key"]:
-        users_db[email]["api_key"] = f"gs_live_{secrets.token_hex(24)}"
-    
-    return {"api_key": users_db[email]["api_key"]}
+    return {"api_key": current_user["api_key"]}
 
 
 @router.post("/api-key/regenerate")
@@ -348,28 +452,42 @@ async def regenerate_api_key(current_user: dict = Depends(get_current_user)):
             detail="API access requires Pro or Agency plan",
         )
     
-    email = current_user["email"]
-    users_db[email]["api_key"] = f"gs_live_{secrets.token_hex(24)}"
+    user = await user_store.update(current_user["id"], api_key=f"gs_live_{secrets.token_hex(24)}")
     
-    return {"api_key": users_db[email]["api_key"]}
+    return {"api_key": user["api_key"]}
 
 
 # ============ Admin Routes ============
 
 @router.get("/admin/users")
 async def list_users(
-    skip: int = 0,
-    limit: int = 50,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    email: Optional[str] = Query(None, description="Email prefix to search for"),
+    tier: Optional[str] = None,
+    status_filter: Optional[str] = Query(None, alias="status", pattern="^(active|suspended)$"),
     admin: dict = Depends(get_current_admin),
 ):
-    """List all users (admin only)."""
-    users_list = list(users_db.values())
-    return {
-        "total": len(users_list),
-        "users": [
-            UserResponse(**u) for u in users_list[skip : skip + limit]
-        ],
-    }
+    """
+    List users (admin only), newest first, or alphabetically when
+    searching by email prefix. Pass the returned `next_cursor` as
+    `cursor` to get the next page.
+    """
+    try:
+        page = await user_store.list(
+            limit=limit,
+            cursor=cursor,
+            email_prefix=email,
+            tier=tier,
+            is_active=None if status_filter is None else status_filter == "active",
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    page["users"] = [UserResponse(**u) for u in page["users"]]
+    return page
 
 
 @router.put("/admin/users/{user_id}/tier")
@@ -385,10 +503,8 @@ async def update_user_tier(
             detail="Invalid tier",
         )
     
-    for email, user in users_db.items():
-        if user["id"] == user_id:
-            users_db[email]["tier"] = tier
-            return {"message": f"User tier updated to {tier}"}
+    if await user_store.update(user_id, tier=tier):
+        return {"message": f"User tier updated to {tier}"}
     
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
@@ -403,11 +519,9 @@ async def update_user_status(
     admin: dict = Depends(get_current_admin),
 ):
     """Suspend or activate user (admin only)."""
-    for email, user in users_db.items():
-        if user["id"] == user_id:
-            users_db[email]["is_active"] = is_active
-            status_text = "activated" if is_active else "suspended"
-            return {"message": f"User {status_text}"}
+    if await user_store.update(user_id, is_active=is_active):
+        status_text = "activated" if is_active else "suspended"
+        return {"message": f"User {status_text}"}
     
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
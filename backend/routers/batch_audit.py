@@ -0,0 +1,119 @@
+"""
+Batch Audit API Routes - audit whole brand portfolios in one job.
+Results stream back as NDJSON while the batch runs.
+"""
+import json
+from typing import AsyncIterator, List, Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+
+from config import settings
+from routers.auth import get_optional_user
+from services.audit_runner import AuditInput, run_batch
+
+router = APIRouter(prefix="/api/audit/batch", tags=["Batch Audit"])
+
+
+class BatchAuditRecord(BaseModel):
+    """One brand in a batch."""
+    brand_name: str
+    industry: str = "software"
+    use_case: str = "business operations"
+    url: Optional[str] = None
+    description: Optional[str] = None
+
+    def to_input(self, user_id: int) -> AuditInput:
+        return AuditInput(
+            brand_name=self.brand_name,
+            industry=self.industry,
+            use_case=self.use_case,
+            brand_url=self.url,
+            description=self.description,
+            user_id=user_id,
+        )
+
+
+class BatchAuditRequest(BaseModel):
+    records: List[BatchAuditRecord] = Field(..., min_length=1)
+    concurrency: Optional[int] = Field(None, ge=1, le=settings.BATCH_MAX_CONCURRENCY)
+
+
+def max_records(user: dict) -> int:
+    return min(settings.BATCH_MAX_RECORDS, settings.BATCH_TIER_LIMITS.get(user["tier"], 0))
+
+
+async def get_batch_user(user: Optional[dict] = Depends(get_optional_user)) -> dict:
+    """The signed-in user or API-key client, if their plan includes batch audits."""
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if max_records(user) <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Batch audits require Pro or Agency plan",
+        )
+    return user
+
+
+def _check_size(count: int, user: dict) -> None:
+    limit = max_records(user)
+    if count > limit:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {count} records (max {limit})",
+        )
+
+
+def _stream(records: List[BatchAuditRecord], concurrency: Optional[int], user: dict) -> StreamingResponse:
+    async def ndjson() -> AsyncIterator[bytes]:
+        async for event in run_batch([r.to_input(user["id"]) for r in records], concurrency):
+            yield (json.dumps(event) + "\n").encode()
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@router.post("")
+async def run_batch_audit(request: BatchAuditRequest, user: dict = Depends(get_batch_user)):
+    """
+    Audit a list of brands. Streams one NDJSON event per finished audit,
+    periodic progress events and a final summary. The audits are saved
+    to the caller's history; how many a batch may hold depends on their
+    plan.
+    """
+    _check_size(len(request.records), user)
+    return _stream(request.records, request.concurrency, user)
+
+
+@router.post("/upload")
+async def upload_batch_audit(
+    file: UploadFile = File(...),
+    concurrency: Optional[int] = Query(None, ge=1, le=settings.BATCH_MAX_CONCURRENCY),
+    user: dict = Depends(get_batch_user),
+):
+    """
+    Audit brands from a JSONL upload, one record object per line:
+    {"brand_name": "...", "industry": "...", "url": "..."}
+    """
+    try:
+        content = (await file.read()).decode("utf-8")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Upload is not valid UTF-8")
+
+    records = []
+    for line_number, line in enumerate(content.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            records.append(BatchAuditRecord(**json.loads(line)))
+        except (json.JSONDecodeError, TypeError, ValidationError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid record on line {line_number}: {e}")
+        _check_size(len(records), user)
+
+    if not records:
+        raise HTTPException(status_code=400, detail="No records found in upload")
+    return _stream(records, concurrency, user)
@@ -1,14 +1,15 @@
 """
 Enhanced Audit API Routes for GEO-Sight Pro
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 import json
 
 # Import the audit engine
-from services.geo_audit_engine import audit_engine, AuditResult
+from services.geo_audit_engine import AUDIT_SECTIONS, audit_engine, AuditResult
+from services.audit_serializer import AuditJSONResponse
 
 router = APIRouter(prefix="/api/audit", tags=["Audit"])
 
@@ -26,8 +27,8 @@ class QuickAuditRequest(BaseModel):
 
 
 def audit_result_to_dict(result: AuditResult) -> Dict[str, Any]:
-    """Convert AuditResult dataclass to JSON-serializable dict"""
-    return {
+    """Convert AuditResult dataclass to JSON-serializable dict (generated sections only)"""
+    data = {
         "id": result.id,
         "brand_name": result.brand_name,
         "industry": result.industry,
@@ -121,20 +122,36 @@ def audit_result_to_dict(result: AuditResult) -> Dict[str, Any]:
         "created_at": result.created_at.isoformat(),
         "completed_at": result.completed_at.isoformat() if result.completed_at else None,
     }
+    for section in AUDIT_SECTIONS:
+        if section not in result.sections:
+            del data[section]
+    return data
 
 
-@router.post("/run")
-async def run_audit(request: AuditRequest):
+@router.post("/run", response_class=AuditJSONResponse)
+async def run_audit(
+    request: AuditRequest,
+    include: Optional[str] = Query(None, description=f"Comma-separated sections to generate: {', '.join(AUDIT_SECTIONS)}")
+):
     """
-    Run a comprehensive GEO audit
+    Run a comprehensive GEO audit. Scores and action counts are always
+    returned; `include` limits which detailed sections are generated.
     """
     try:
-        result = audit_engine.run_audit(
+        sections = audit_engine.resolve_sections(
+            [s.strip() for s in include.split(",") if s.strip()] if include is not None else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        result = await audit_engine.run_audit_async(
             brand_name=request.brand_name,
             industry=request.industry,
-            url=request.url
+            url=request.url,
+            include=sections
         )
-        return audit_result_to_dict(result)
+        return AuditJSONResponse(result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -142,12 +159,13 @@ async def run_audit(request: AuditRequest):
 @router.post("/quick")
 async def quick_audit(request: QuickAuditRequest):
     """
-    Run a quick audit with basic analysis
+    Run a quick audit with basic analysis: only the scores are computed
     """
     try:
-        result = audit_engine.run_audit(
+        result = await audit_engine.run_audit_async(
             brand_name=request.brand_name,
-            industry=request.industry or "software"
+            industry=request.industry or "software",
+            include=()
         )
         
         # Return simplified result for quick audit
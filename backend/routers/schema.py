@@ -1,11 +1,12 @@
 """
 API Routes for Schema generation
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Header, Response
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Any, Optional, List
 
 from services import schema_generator
+from services.etags import matches, not_modified, strong_etag, tag_response
 
 router = APIRouter(prefix="/api/schema", tags=["schema"])
 
@@ -25,6 +26,15 @@ class SchemaRequest(BaseModel):
     faq_items: Optional[List[dict]] = None
 
 
+def schema_etag(endpoint: str, inputs: Any) -> str:
+    """
+    Generated schemas depend only on their inputs, so the tag is derived
+    from them: a repeat GET with a matching If-None-Match gets 304
+    without the schema being generated or serialized again.
+    """
+    return strong_etag("schema", endpoint, schema_generator.VERSION, inputs)
+
+
 @router.post("/generate")
 async def generate_schema(request: SchemaRequest):
     """Generate JSON-LD schema for GEO optimization."""
@@ -64,14 +74,7 @@ async def generate_schema(request: SchemaRequest):
     }
 
 
-@router.post("/organization")
-async def generate_organization_schema(
-    name: str,
-    url: str,
-    description: Optional[str] = None,
-    logo_url: Optional[str] = None
-):
-    """Generate only Organization schema."""
+def organization_schema(name: str, url: str, description: Optional[str], logo_url: Optional[str]) -> dict:
     schema = schema_generator.generate_organization_schema(
         name=name,
         url=url,
@@ -84,6 +87,39 @@ async def generate_organization_schema(
     }
 
 
+@router.post("/organization")
+async def generate_organization_schema(
+    name: str,
+    url: str,
+    description: Optional[str] = None,
+    logo_url: Optional[str] = None
+):
+    """Generate only Organization schema."""
+    return organization_schema(name, url, description, logo_url)
+
+
+@router.get("/organization")
+async def get_organization_schema(
+    response: Response,
+    name: str,
+    url: str,
+    description: Optional[str] = None,
+    logo_url: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Organization schema as a cacheable GET. Send the returned ETag back
+    in If-None-Match to get 304 Not Modified instead of the schema.
+    """
+    etag = schema_etag("organization", [name, url, description, logo_url])
+    matched = matches(if_none_match, etag)
+    if matched:
+        return not_modified(matched)
+    
+    tag_response(response, etag)
+    return organization_schema(name, url, description, logo_url)
+
+
 @router.post("/faq")
 async def generate_faq_schema(questions_answers: List[dict]):
     """Generate FAQPage schema (Citation Bridge)."""
@@ -0,0 +1,198 @@
+"""
+Access Tokens - Short-lived signed (JWT) access tokens.
+A request is authenticated by checking the token's signature and expiry
+in memory; logouts are shared between workers through a revocation
+table that each worker folds into a Bloom filter.
+"""
+import asyncio
+import hashlib
+import math
+import secrets
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from jose import JWTError, jwt
+from sqlalchemy import delete, insert, select
+
+from config import settings
+from models.database import RevokedToken, async_session
+from services.response_cache import LRUCache
+
+
+class BloomFilter:
+    """Fixed-size set membership with false positives but no false negatives."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, key: str) -> List[int]:
+        """Bit positions of a key (the same for every filter of this size)."""
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key: str) -> None:
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def has_positions(self, positions: List[int]) -> bool:
+        if not self.count:
+            return False
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in positions)
+
+    def __contains__(self, key: str) -> bool:
+        return self.has_positions(self.positions(key))
+
+
+class RevocationList:
+    """
+    Revoked access token ids, held in two Bloom filter generations.
+
+    A revoked id only matters until its token expires, so the older
+    generation is dropped once it is older than an access token's
+    lifetime. A false positive rejects a valid access token; the client
+    then refreshes and gets a new one.
+    """
+
+    def __init__(self):
+        self.lifetime = settings.JWT_ACCESS_TOKEN_MINUTES * 60
+        self.current = self._new_filter()
+        self.previous = self._new_filter()
+        self.rotated_at = time.time()
+        self.last_id = 0  # highest revoked_tokens row folded in
+        self._syncer: Optional[asyncio.Task] = None
+
+    def _new_filter(self) -> BloomFilter:
+        return BloomFilter(settings.REVOCATION_BLOOM_CAPACITY, settings.REVOCATION_BLOOM_ERROR_RATE)
+
+    def _rotate(self, now: float) -> None:
+        if now - self.rotated_at >= self.lifetime:
+            self.previous, self.current = self.current, self._new_filter()
+            self.rotated_at = now
+
+    def add(self, jti: str) -> None:
+        self._rotate(time.time())
+        self.current.add(jti)
+
+    def __contains__(self, jti: str) -> bool:
+        if not (self.current.count or self.previous.count):
+            return False
+        # Both generations have the same size, so one hashing serves both
+        positions = self.current.positions(jti)
+        return self.current.has_positions(positions) or self.previous.has_positions(positions)
+
+    async def revoke(self, jti: str, expires_at: datetime) -> None:
+        """Revoke a token id here at once, and on other workers at their next sync."""
+        self.add(jti)
+        async with async_session() as session:
+            await session.execute(insert(RevokedToken), [{"jti": jti, "expires_at": expires_at}])
+            await session.commit()
+
+    async def sync(self) -> int:
+        """Fold in revocations recorded since the last sync; returns how many."""
+        async with async_session() as session:
+            rows = (await session.execute(
+                select(RevokedToken.id, RevokedToken.jti)
+                .where(RevokedToken.id > self.last_id, RevokedToken.expires_at > datetime.utcnow())
+                .order_by(RevokedToken.id)
+            )).all()
+            await session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow()))
+            await session.commit()
+        for row in rows:
+            self.add(row.jti)
+        if rows:
+            self.last_id = rows[-1].id
+        return len(rows)
+
+    async def _sync_forever(self) -> None:
+        while True:
+            await asyncio.sleep(settings.REVOCATION_SYNC_INTERVAL)
+            try:
+                await self.sync()
+            except Exception as e:
+                print(f"[AUTH] Revocation sync failed: {e}")
+
+    async def start(self) -> None:
+        await self.sync()
+        self._syncer = asyncio.ensure_future(self._sync_forever())
+
+    async def stop(self) -> None:
+        if self._syncer is not None:
+            self._syncer.cancel()
+            await asyncio.gather(self._syncer, return_exceptions=True)
+            self._syncer = None
+
+
+class AccessTokens:
+    """
+    Issues and verifies signed access tokens.
+
+    Verification needs no shared state: the signature and expiry are
+    checked with the secret key, then the token id against the
+    revocation filter. Tokens already verified are remembered (by their
+    exact string) in an LRU, so repeat requests skip the signature check
+    and tokens in steady use are the last to be evicted.
+    """
+
+    def __init__(self):
+        self.revoked = RevocationList()
+        self._verified = LRUCache(settings.JWT_VERIFY_CACHE_SIZE)  # token -> claims
+        self.counters = {"issued": 0, "verified": 0, "cache_hits": 0, "rejected": 0, "revoked": 0}
+
+    @property
+    def lifetime(self) -> int:
+        return settings.JWT_ACCESS_TOKEN_MINUTES * 60
+
+    def issue(self, user_id: int) -> str:
+        now = int(time.time())
+        claims = {
+            "sub": str(user_id),
+            "iat": now,
+            "exp": now + self.lifetime,
+            "jti": secrets.token_hex(16),
+            "typ": "access",
+        }
+        self.counters["issued"] += 1
+        return jwt.encode(claims, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+
+    def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        """Claims of a valid, unexpired, unrevoked access token, else None."""
+        claims = self._verified.get(token)
+        if claims is not None:
+            self.counters["cache_hits"] += 1
+        else:
+            try:
+                claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+            except JWTError:
+                self.counters["rejected"] += 1
+                return None
+            if claims.get("typ") != "access":
+                self.counters["rejected"] += 1
+                return None
+            self.counters["verified"] += 1
+            self._verified.set(token, claims)
+
+        if claims["exp"] <= time.time() or claims["jti"] in self.revoked:
+            self._verified.delete(token)
+            self.counters["rejected"] += 1
+            return None
+        return claims
+
+    async def revoke(self, claims: Dict[str, Any]) -> None:
+        self.counters["revoked"] += 1
+        await self.revoked.revoke(claims["jti"], datetime.utcfromtimestamp(claims["exp"]))
+
+    def stats(self) -> Dict:
+        revoked = self.revoked.current.count + self.revoked.previous.count
+        return {**self.counters, "cached": len(self._verified), "revocation_filter_entries": revoked}
+
+
+# Singleton instance
+access_tokens = AccessTokens()
@@ -0,0 +1,131 @@
+"""
+Analysis Cache - Memoizes text analysis results by content hash.
+The same answer text is analyzed over and over (mock answers, cached
+provider answers, industry answers shared across brands); results are
+keyed by a hash of the text, the analysis parameters and the analyzer
+version, in an in-process LRU with an optional SQLite tier.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from config import settings
+from services.response_cache import LRUCache, SQLiteStore
+
+
+class AnalysisCache:
+    """
+    Content-addressed cache of analysis results.
+
+    Results are deterministic for a given analyzer version, so memory
+    entries never expire; disk rows are purged after ANALYSIS_CACHE_TTL.
+    Disk reads are single-row lookups, done inline by the synchronous API
+    (which runs on executor threads) and on a thread by get_many(); disk
+    writes are queued to one background thread so callers never wait on
+    a commit. Cached values are shared between callers and must not be
+    mutated.
+    """
+
+    def __init__(self):
+        self.enabled = settings.ANALYSIS_CACHE_ENABLED
+        self.memory = LRUCache(settings.ANALYSIS_CACHE_MAX_ENTRIES)
+        self.disk = SQLiteStore(settings.ANALYSIS_CACHE_PATH, "analysis_cache") if settings.ANALYSIS_CACHE_PATH else None
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self.counters = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "stores": 0}
+        self.by_operation: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def make_key(operation: str, text: str, *params: Hashable) -> str:
+        raw = "\x1f".join([operation, *map(repr, params), text or ""])
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _count(self, operation: str, outcome: str) -> None:
+        self.counters[outcome] += 1
+        counts = self.by_operation.setdefault(operation, {"hits": 0, "misses": 0})
+        counts[outcome] += 1
+
+    def _disk_get(self, key: str) -> Optional[Any]:
+        row = self.disk.get(key)
+        if row is None or row[2] <= time.time():
+            return None
+        value = json.loads(row[0])
+        self.memory.set(key, value)
+        self.counters["disk_hits"] += 1
+        return value
+
+    def get(self, operation: str, key: str) -> Optional[Any]:
+        """Cached value for a key from make_key(), or None (counted as a miss). Blocks on a disk read."""
+        value = self.memory.get(key)
+        if value is not None:
+            self.counters["memory_hits"] += 1
+        elif self.disk is not None:
+            value = self._disk_get(key)
+        self._count(operation, "hits" if value is not None else "misses")
+        return value
+
+    async def get_many(self, operation: str, keys: List[str]) -> List[Optional[Any]]:
+        """Cached values for many keys; memory misses are read from disk in one thread call."""
+        values = [self.memory.get(key) for key in keys]
+        self.counters["memory_hits"] += sum(value is not None for value in values)
+        missing = [i for i, value in enumerate(values) if value is None]
+        if missing and self.disk is not None:
+            found = await asyncio.to_thread(lambda: [self._disk_get(keys[i]) for i in missing])
+            for i, value in zip(missing, found):
+                values[i] = value
+        for value in values:
+            self._count(operation, "hits" if value is not None else "misses")
+        return values
+
+    def set(self, key: str, value: Any) -> None:
+        self.memory.set(key, value)
+        self.counters["stores"] += 1
+        if self.disk is not None:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="analysis-cache")
+            now = time.time()
+            self._writer.submit(self.disk.set, key, json.dumps(value), now, now + settings.ANALYSIS_CACHE_TTL)
+
+    def get_or_compute(self, operation: str, text: str, params: tuple, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached result of `operation` on `text` with `params`,
+        or compute and cache it. Values must be JSON-serializable.
+        """
+        if not self.enabled:
+            return compute()
+        key = self.make_key(operation, text, *params)
+        value = self.get(operation, key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_rate": round(self.counters["hits"] / lookups, 4) if lookups else 0.0,
+            "operations": {
+                operation: {
+                    **counts,
+                    "hit_rate": round(counts["hits"] / (counts["hits"] + counts["misses"]), 4),
+                }
+                for operation, counts in self.by_operation.items()
+            },
+            "memory_entries": len(self.memory),
+            "disk_enabled": self.disk is not None,
+        }
+
+    def close(self) -> None:
+        """Flush queued disk writes and close the disk tier."""
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        if self.disk is not None:
+            self.disk.close()
+
+
+# Singleton instance
+analysis_cache = AnalysisCache()
@@ -0,0 +1,241 @@
+"""
+API Quota - Per-tier request quotas for API-key clients.
+Requests are counted in memory with a sliding-window estimate and the
+counts are written to the users table in batches every few seconds,
+so enforcing a quota costs no database write per request.
+"""
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import case, select, update
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings
+from models.database import User, async_session
+
+
+# Response headers describing a client's quota (browsers may read them cross-origin)
+RATE_LIMIT_HEADERS = ("RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset", "RateLimit-Policy", "Retry-After")
+
+
+@dataclass
+class QuotaCounter:
+    """One user's requests in the current and previous fixed window."""
+    window: int  # index of the current window (epoch seconds // API_QUOTA_WINDOW)
+    current: int = 0
+    previous: int = 0
+
+
+@dataclass
+class QuotaDecision:
+    """Outcome of counting one request, with what the RateLimit headers report."""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: int  # seconds until the current window ends
+    retry_after: int = 0  # seconds until a refused request would be allowed
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(self.reset),
+            "RateLimit-Policy": f"{self.limit};w={settings.API_QUOTA_WINDOW}",
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(self.retry_after)
+        return headers
+
+
+def window_end(window: int) -> datetime:
+    return datetime.utcfromtimestamp((window + 1) * settings.API_QUOTA_WINDOW)
+
+
+class APIQuota:
+    """
+    Sliding-window request counters, shared between workers by write-behind.
+
+    The usage a request is checked against is the current fixed window's
+    count plus the previous window's, weighted by how much of it still
+    overlaps the sliding window. Each worker adds its own requests to
+    users.api_requests_count every API_QUOTA_FLUSH_INTERVAL seconds and
+    reads back the total, so requests served by other workers count
+    against the quota within one flush interval.
+    """
+
+    def __init__(self):
+        self._counters: Dict[int, QuotaCounter] = {}
+        self._pending: Dict[Tuple[int, int], int] = {}  # (user id, window) -> requests not yet written
+        self._flusher: Optional[asyncio.Task] = None
+        self.counters = {"allowed": 0, "refused": 0, "flushes": 0, "rows_flushed": 0}
+
+    @staticmethod
+    def limit_for(tier: str) -> int:
+        return settings.API_QUOTAS.get(tier, 0)
+
+    async def _load(self, user_id: int, window: int) -> QuotaCounter:
+        """Seed a counter from what other workers have flushed (first request on this worker)."""
+        async with async_session() as session:
+            row = (await session.execute(
+                select(User.api_requests_count, User.api_requests_reset_at).where(User.id == user_id)
+            )).one_or_none()
+        counter = QuotaCounter(window)
+        if row is not None and row.api_requests_reset_at is not None:
+            if row.api_requests_reset_at == window_end(window):
+                counter.current = row.api_requests_count or 0
+            elif row.api_requests_reset_at == window_end(window - 1):
+                counter.previous = row.api_requests_count or 0
+        return counter
+
+    def _roll(self, counter: QuotaCounter, window: int) -> None:
+        if counter.window == window:
+            return
+        counter.previous = counter.current if counter.window == window - 1 else 0
+        counter.current = 0
+        counter.window = window
+
+    async def hit(self, user_id: int, tier: str) -> QuotaDecision:
+        """Count one request against a user's quota, unless it would exceed it."""
+        limit = self.limit_for(tier)
+        span = settings.API_QUOTA_WINDOW
+        now = time.time()
+        window = int(now // span)
+
+        counter = self._counters.get(user_id)
+        if counter is None:
+            loaded = await self._load(user_id, window)
+            # Another request may have created it while we waited
+            counter = self._counters.setdefault(user_id, loaded)
+        self._roll(counter, window)
+
+        elapsed = now - window * span
+        reset = math.ceil(span - elapsed)
+        overlap = 1 - elapsed / span
+        used = counter.previous * overlap + counter.current
+        if used + 1 > limit:
+            self.counters["refused"] += 1
+            if counter.previous and counter.current + 1 <= limit:
+                # Wait until enough of the previous window has slid out
+                retry_after = math.ceil((1 - (limit - counter.current - 1) / counter.previous) * span - elapsed)
+            else:
+                retry_after = reset
+            return QuotaDecision(False, limit, 0, reset, max(1, retry_after))
+
+        counter.current += 1
+        self._pending[(user_id, window)] = self._pending.get((user_id, window), 0) + 1
+        self.counters["allowed"] += 1
+        return QuotaDecision(True, limit, max(0, math.floor(limit - used - 1)), reset)
+
+    async def flush(self) -> int:
+        """Write pending request counts and fold in other workers'; returns users written."""
+        pending, self._pending = self._pending, {}
+        if pending:
+            try:
+                totals = await self._write(pending)
+            except Exception:
+                # Keep the counts for the next flush
+                for key, count in pending.items():
+                    self._pending[key] = self._pending.get(key, 0) + count
+                raise
+            for (user_id, window), total in totals.items():
+                counter = self._counters.get(user_id)
+                if counter is not None and counter.window == window and total is not None:
+                    # The total includes this worker's flushed requests, not ones counted since
+                    counter.current = max(counter.current, total + self._pending.get((user_id, window), 0))
+            self.counters["flushes"] += 1
+            self.counters["rows_flushed"] += len(pending)
+
+        # Users idle for a whole window no longer affect any quota
+        current = int(time.time() // settings.API_QUOTA_WINDOW)
+        for user_id in [uid for uid, c in self._counters.items() if c.window < current - 1]:
+            del self._counters[user_id]
+        return len(pending)
+
+    async def _write(self, pending: Dict[Tuple[int, int], int]) -> Dict[Tuple[int, int], Optional[int]]:
+        """One transaction for the whole batch; each row is added to, restarted or left alone by window."""
+        totals = {}
+        async with async_session() as session:
+            for (user_id, window), count in pending.items():
+                ends = window_end(window)
+                row = (await session.execute(
+                    update(User)
+                    .where(User.id == user_id)
+                    .where((User.api_requests_reset_at == None) | (User.api_requests_reset_at <= ends))  # noqa: E711
+                    .values(
+                        api_requests_count=case(
+                            (User.api_requests_reset_at == ends, User.api_requests_count + count),
+                            else_=count,
+                        ),
+                        api_requests_reset_at=ends,
+                        updated_at=User.updated_at,  # request counting is not a profile change
+                    )
+                    .returning(User.api_requests_count)
+                    .execution_options(synchronize_session=False)
+                )).one_or_none()
+                totals[(user_id, window)] = row.api_requests_count if row is not None else None
+            await session.commit()
+        return totals
+
+    async def _flush_forever(self) -> None:
+        while True:
+            await asyncio.sleep(settings.API_QUOTA_FLUSH_INTERVAL)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"[AUTH] API quota flush failed: {e}")
+
+    async def start(self) -> None:
+        self._flusher = asyncio.ensure_future(self._flush_forever())
+
+    async def stop(self) -> None:
+        """Stop the flusher and write what is still pending."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"[AUTH] API quota flush failed: {e}")
+
+    def stats(self) -> Dict:
+        return {**self.counters, "tracked_users": len(self._counters), "pending_users": len(self._pending)}
+
+
+class RateLimitHeadersMiddleware:
+    """
+    Adds the RateLimit headers of an API-key request to its response.
+
+    Authentication stores its QuotaDecision in request.state.rate_limit;
+    setting the headers here covers responses a route builds itself
+    (streams, 304s), which do not inherit headers set on the injected
+    Response.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                decision = scope.get("state", {}).get("rate_limit")
+                if decision is not None:
+                    headers = MutableHeaders(raw=message["headers"])
+                    for name, value in decision.headers().items():
+                        headers.setdefault(name, value)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+# Singleton instance
+api_quota = APIQuota()
@@ -0,0 +1,323 @@
+"""
+Audit Runner - Turns BrowserScout responses into stored audit results.
+Shared by the single-audit, batch, job and streaming endpoints.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from agents import browser_scout, sentiment_agent
+from config import settings
+from services.audit_store import audit_store
+
+
+@dataclass
+class AuditInput:
+    """Parameters of one brand audit."""
+    brand_name: str
+    industry: str = "software"
+    use_case: str = "business operations"
+    brand_url: Optional[str] = None
+    description: Optional[str] = None
+    user_id: Optional[int] = None
+
+
+async def save_audit(audit: AuditInput, audit_result: Dict) -> Dict:
+    """Persist an audit result, assigning its id."""
+    return await audit_store.save(audit_result, industry=audit.industry, user_id=audit.user_id)
+
+
+def analyze_mention(
+    source: str,
+    query_type: str,
+    response_data: Dict,
+    brand_name: str,
+    sentiment: Optional[Tuple[str, float]] = None
+) -> Dict:
+    """
+    Analyze one platform response for brand mentions and sentiment.
+    Pass a precomputed (label, score) to skip scoring inline.
+    """
+    response_text = response_data.get("response", "")
+
+    # Detect brand mention (streamed answers were matched as they arrived)
+    mention_analysis = response_data.get("mention") or sentiment_agent.detect_brand_mention(
+        response_text, brand_name, with_sentiment=False
+    )
+
+    # Analyze sentiment
+    sentiment_label, score = sentiment or sentiment_agent.analyze_sentiment(response_text)
+
+    return {
+        "source": source,
+        "query_type": query_type,
+        "query": response_data.get("query", ""),
+        "response_preview": response_text[:500] + "..." if len(response_text) > 500 else response_text,
+        "brand_mentioned": mention_analysis["mentioned"],
+        "contexts": mention_analysis["contexts"],
+        "sentiment": sentiment_label,
+        "sentiment_score": score,
+        "is_mock": response_data.get("is_mock", False),
+        "truncated": response_data.get("truncated", False),
+        "error": response_data.get("error")
+    }
+
+
+async def analyze_mentions(responses: List[Tuple[str, str, Dict]], brand_name: str) -> List[Dict]:
+    """Analyze (source, query_type, response_data) triples, scoring sentiment as one batch."""
+    sentiments = await sentiment_agent.analyze_sentiment_batch(
+        [response_data.get("response", "") for _, _, response_data in responses]
+    )
+    return [
+        analyze_mention(source, query_type, response_data, brand_name, sentiment)
+        for (source, query_type, response_data), sentiment in zip(responses, sentiments)
+    ]
+
+
+def summarize_mentions(mentions: List[Dict]) -> Dict:
+    """Compute platform flags, overall sentiment and visibility score."""
+    mentioned_sources = {m["source"] for m in mentions if m["brand_mentioned"]}
+    chatgpt_mentioned = "chatgpt" in mentioned_sources
+    gemini_mentioned = "gemini" in mentioned_sources
+    perplexity_mentioned = "perplexity" in mentioned_sources
+
+    # Calculate overall sentiment
+    all_sentiments = [m["sentiment"] for m in mentions]
+    positive_count = all_sentiments.count("positive")
+    negative_count = all_sentiments.count("negative")
+    if positive_count > negative_count:
+        overall_sentiment = "positive"
+    elif negative_count > positive_count:
+        overall_sentiment = "negative"
+    else:
+        overall_sentiment = "neutral"
+
+    # Calculate visibility score
+    visibility_score = sentiment_agent.calculate_visibility_score(
+        chatgpt_mentioned=chatgpt_mentioned,
+        gemini_mentioned=gemini_mentioned,
+        perplexity_mentioned=perplexity_mentioned,
+        overall_sentiment=overall_sentiment,
+        citation_count=0
+    )
+
+    return {
+        "visibility_score": visibility_score,
+        "chatgpt_mentioned": chatgpt_mentioned,
+        "gemini_mentioned": gemini_mentioned,
+        "perplexity_mentioned": perplexity_mentioned,
+        "overall_sentiment": overall_sentiment,
+    }
+
+
+def build_citation_gaps(audit: AuditInput, summary: Dict) -> List[Dict]:
+    """Generate citation gaps (mock data for demo)."""
+    if summary["chatgpt_mentioned"] and summary["gemini_mentioned"]:
+        return []
+    return [
+        {
+            "platform": "Reddit r/software",
+            "url": "https://reddit.com/r/software/comments/example",
+            "competitor_mentioned": "Salesforce",
+            "context": "Discussion about top CRM tools",
+            "priority": "high",
+            "pitch_template": f"Have you considered {audit.brand_name}? We offer {audit.use_case} with excellent support and competitive pricing."
+        },
+        {
+            "platform": "G2 Crowd",
+            "url": "https://g2.com/categories/crm",
+            "competitor_mentioned": "HubSpot",
+            "context": "CRM comparison reviews",
+            "priority": "medium",
+            "pitch_template": f"As a {audit.industry} solution, {audit.brand_name} provides unique value through..."
+        },
+        {
+            "platform": "TechCrunch",
+            "url": "https://techcrunch.com/category/software",
+            "competitor_mentioned": "Pipedrive",
+            "context": "Industry news coverage",
+            "priority": "medium",
+            "pitch_template": f"Press release: {audit.brand_name} announces new features for {audit.use_case}..."
+        }
+    ]
+
+
+def build_hallucination_alerts(audit: AuditInput, summary: Dict) -> List[Dict]:
+    """Generate hallucination alerts (mock for demo)."""
+    if not (summary["overall_sentiment"] == "negative"
+            or not (summary["chatgpt_mentioned"] and summary["gemini_mentioned"])):
+        return []
+    return [
+        {
+            "source": "gemini",
+            "incorrect_claim": f"{audit.brand_name} discontinued their service in 2024",
+            "correct_information": f"{audit.brand_name} is actively operating and continuously improving their {audit.industry} solutions",
+            "severity": "critical",
+            "correction_draft": f"""# Setting the Record Straight: {audit.brand_name} is Thriving in 2026
+
+We've noticed some AI systems may have outdated information. Let us clarify:
+
+**{audit.brand_name} Update - February 2026**
+
+Contrary to some AI-generated content, {audit.brand_name} is fully operational and growing:
+
+- ✅ Active development with weekly updates
+- ✅ Serving thousands of satisfied customers
+- ✅ Recently launched new {audit.use_case} features
+- ✅ Expanding our team and capabilities
+
+For accurate information, please visit our official website or contact our support team."""
+        }
+    ]
+
+
+def build_audit_result(audit: AuditInput, mentions: List[Dict]) -> Dict:
+    """Build an (unsaved) audit result from analyzed mentions."""
+    summary = summarize_mentions(mentions)
+    return {
+        "id": None,
+        "brand_name": audit.brand_name,
+        **summary,
+        "mentions": mentions,
+        "citation_gaps": build_citation_gaps(audit, summary),
+        "hallucination_alerts": build_hallucination_alerts(audit, summary),
+        "created_at": datetime.utcnow().isoformat()
+    }
+
+
+async def analyze_scout_results(audit: AuditInput, scout_results: Dict) -> Dict:
+    """Build an (unsaved) audit result from BrowserScout responses."""
+    mentions = await analyze_mentions(
+        [
+            (source, query_type, response_data)
+            for source, queries in scout_results["responses"].items()
+            for query_type, response_data in queries.items()
+        ],
+        audit.brand_name
+    )
+    return build_audit_result(audit, mentions)
+
+
+async def perform_audit(audit: AuditInput, industry_responses: Optional[Dict[str, Dict]] = None) -> Dict:
+    """Query all platforms for a brand and analyze the answers (not stored)."""
+    scout_results = await browser_scout.run_audit(
+        brand_name=audit.brand_name,
+        industry=audit.industry,
+        use_case=audit.use_case,
+        industry_responses=industry_responses
+    )
+    return await analyze_scout_results(audit, scout_results)
+
+
+async def execute_audit(audit: AuditInput, industry_responses: Optional[Dict[str, Dict]] = None) -> Dict:
+    """Run an audit and store the result."""
+    return await save_audit(audit, await perform_audit(audit, industry_responses))
+
+
+async def stream_audit(audit: AuditInput) -> AsyncIterator[Dict]:
+    """
+    Run an audit, yielding each analyzed mention as soon as its platform
+    answers, together with the running scores. The last event carries the
+    stored audit.
+    """
+    queries = browser_scout.build_queries(audit.brand_name, audit.industry, audit.use_case)
+    order = [(source, query_type) for source in browser_scout.PLATFORMS for query_type in queries]
+
+    async def query(source: str, query_type: str) -> Tuple[str, str, Dict]:
+        brand_name = audit.brand_name if query_type == "reputation" else None
+        return source, query_type, await browser_scout.query_platform(source, queries[query_type], brand_name)
+
+    tasks = [asyncio.ensure_future(query(source, query_type)) for source, query_type in order]
+    mentions: Dict[Tuple[str, str], Dict] = {}
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            source, query_type, response_data = await next_done
+            [mention] = await analyze_mentions([(source, query_type, response_data)], audit.brand_name)
+            mentions[(source, query_type)] = mention
+            yield {
+                "event": "mention",
+                "mention": mention,
+                "completed": len(mentions),
+                "total": len(tasks),
+                **summarize_mentions(list(mentions.values())),
+            }
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    # Store mentions in the same order as a non-streamed audit
+    result = await save_audit(audit, build_audit_result(audit, [mentions[key] for key in order]))
+    yield {"event": "complete", "audit": result}
+
+
+async def run_batch(audits: List[AuditInput], concurrency: Optional[int] = None) -> AsyncIterator[Dict]:
+    """
+    Audit many brands with bounded concurrency, yielding events as they finish.
+    At most BATCH_MAX_CONCURRENCY audits run at once, whatever is asked for.
+
+    The industry query is identical for every brand sharing an
+    (industry, use_case), so it is fetched once per pair and shared; the
+    first worker to need it starts it, so it counts against the limit.
+    Events are dicts with an "event" key: "result", "error", "progress"
+    and a final "summary".
+    """
+    started = time.perf_counter()
+    workers = max(1, min(concurrency or settings.BATCH_MAX_CONCURRENCY, settings.BATCH_MAX_CONCURRENCY, len(audits) or 1))
+
+    industry_tasks: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    def industry_task(audit: AuditInput) -> asyncio.Future:
+        key = (audit.industry, audit.use_case)
+        task = industry_tasks.get(key)
+        if task is None:
+            query = browser_scout.INDUSTRY_QUERY.format(industry=audit.industry, use_case=audit.use_case)
+            task = industry_tasks[key] = asyncio.ensure_future(browser_scout.query_all_platforms(query))
+        return task
+
+    pending: asyncio.Queue = asyncio.Queue()
+    for index, audit in enumerate(audits):
+        pending.put_nowait((index, audit))
+    events: asyncio.Queue = asyncio.Queue()
+
+    async def worker() -> None:
+        while True:
+            try:
+                index, audit = pending.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                industry_responses = await industry_task(audit)
+                result = await execute_audit(audit, industry_responses)
+                await events.put({"event": "result", "index": index, "audit": result})
+            except Exception as e:
+                await events.put({"event": "error", "index": index, "brand_name": audit.brand_name, "detail": str(e)})
+
+    tasks = [asyncio.ensure_future(worker()) for _ in range(workers)]
+    done = asyncio.ensure_future(asyncio.gather(*tasks))
+    done.add_done_callback(lambda _: events.put_nowait(None))
+
+    completed = failed = 0
+    try:
+        while True:
+            event = await events.get()
+            if event is None:
+                break
+            completed += 1
+            failed += event["event"] == "error"
+            yield event
+            if completed % settings.BATCH_PROGRESS_EVERY == 0:
+                yield {"event": "progress", "completed": completed, "total": len(audits)}
+    finally:
+        for task in [*tasks, *industry_tasks.values()]:
+            task.cancel()
+
+    yield {
+        "event": "summary",
+        "total": len(audits),
+        "succeeded": completed - failed,
+        "failed": failed,
+        "unique_industry_queries": len(industry_tasks),
+        "duration_seconds": round(time.perf_counter() - started, 3),
+    }
@@ -0,0 +1,105 @@
+"""
+Audit Serializer - Encodes audit results straight to JSON bytes.
+Dataclasses, enums, datetimes and column-wise mention tables are
+encoded by orjson in one native pass, skipping the intermediate dict
+and FastAPI's jsonable_encoder walk.
+"""
+import json
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+from fastapi import Response
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+from services.geo_audit_engine import AUDIT_SECTIONS, AuditResult, HallucinationAlert, MentionTable, PlatformMention
+
+
+# Dataclass fields left out of API responses
+OMITTED_FIELDS = {
+    PlatformMention: ("citations",),
+    HallucinationAlert: ("detected_at",),
+    AuditResult: ("sections",),
+}
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> Tuple[str, ...]:
+    omitted = OMITTED_FIELDS.get(cls, ())
+    return tuple(f.name for f in fields(cls) if f.name not in omitted)
+
+
+def mention_rows(table: MentionTable) -> List[Dict[str, Any]]:
+    """One response dict per mention, built column by column."""
+    platforms = [p.value for p in table.PLATFORMS]
+    categories = [c.value for c in table.CATEGORIES]
+    sentiments = [s.value for s in table.SENTIMENTS]
+    return [
+        {
+            "platform": platforms[platform],
+            "query_category": categories[category],
+            "query": query,
+            "response_preview": preview,
+            "brand_mentioned": mentioned,
+            "mention_contexts": contexts,
+            "sentiment": sentiments[sentiment],
+            "sentiment_score": score,
+            "citation_quality": quality,
+            "competitors_mentioned": competitors,
+            "ranking_position": None if ranking < 0 else ranking,
+            "is_recommended": recommended,
+            "is_mock": mock,
+        }
+        for platform, category, query, preview, mentioned, contexts, sentiment, score,
+            quality, competitors, ranking, recommended, mock in zip(
+            table.platform.tolist(), table.query_category.tolist(), table.query,
+            table.response_preview, table.brand_mentioned.tolist(), table.mention_contexts,
+            table.sentiment.tolist(), table.sentiment_score.tolist(), table.citation_quality.tolist(),
+            table.competitors_mentioned, table.ranking_position.tolist(),
+            table.is_recommended.tolist(), table.is_mock.tolist(),
+        )
+    ]
+
+
+def _default(obj: Any) -> Any:
+    """Types the encoder does not handle natively."""
+    if isinstance(obj, MentionTable):
+        return mention_rows(obj)
+    if isinstance(obj, AuditResult):
+        # Sections that were not requested are left out entirely
+        skipped = set(AUDIT_SECTIONS).difference(obj.sections)
+        return {name: getattr(obj, name) for name in _field_names(AuditResult) if name not in skipped}
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {name: getattr(obj, name) for name in _field_names(type(obj))}
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize audit results (or lists of them) to JSON bytes, with the
+    same shape as audit_result_to_dict. Falls back to the json module
+    when orjson is not installed.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_PASSTHROUGH_DATACLASS)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class AuditJSONResponse(Response):
+    """JSON response whose content is encoded with dumps()."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
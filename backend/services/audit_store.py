@@ -0,0 +1,310 @@
+"""
+Audit Store - Async persistence of audit results in the audits table and
+its mentions, citation_gaps and hallucination_alerts children.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import func, insert, select, tuple_
+from sqlalchemy.orm import selectinload
+
+from models.database import Audit, CitationGap, HallucinationAlert, Mention, async_session
+
+
+# Audit columns a history page may project
+HISTORY_FIELDS = (
+    "id",
+    "brand_name",
+    "industry",
+    "status",
+    "visibility_score",
+    "chatgpt_mentioned",
+    "gemini_mentioned",
+    "perplexity_mentioned",
+    "overall_sentiment",
+    "created_at",
+    "completed_at",
+)
+DEFAULT_HISTORY_FIELDS = HISTORY_FIELDS
+
+# Per-mention columns shipped with fields=mentions (never response bodies)
+HISTORY_MENTION_FIELDS = ("source", "query_type", "brand_mentioned", "sentiment", "sentiment_score")
+
+
+def encode_cursor(created_at: datetime, audit_id: int) -> str:
+    """Opaque cursor for the row a page ended on."""
+    raw = json.dumps([created_at.isoformat(), audit_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Inverse of encode_cursor; raises ValueError for a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, audit_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(audit_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+class AuditStore:
+    """
+    Saves and loads audit results.
+
+    An audit is written in one transaction: the audit row, then one bulk
+    INSERT per child table however many mentions, gaps or alerts it has.
+    """
+
+    def _mention_rows(self, audit_id: int, mentions: List[Dict]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "audit_id": audit_id,
+                "source": m["source"],
+                "query_type": m.get("query_type"),
+                "query": m.get("query", ""),
+                "response_text": m.get("response_preview"),
+                "brand_mentioned": m.get("brand_mentioned", False),
+                "mention_context": m["contexts"][0] if m.get("contexts") else None,
+                "contexts": m.get("contexts", []),
+                "sentiment": m.get("sentiment"),
+                "sentiment_score": m.get("sentiment_score"),
+                "is_mock": m.get("is_mock", False),
+                "truncated": m.get("truncated", False),
+                "error": m.get("error"),
+            }
+            for m in mentions
+        ]
+
+    async def save(self, result: Dict, industry: Optional[str] = None, user_id: Optional[int] = None) -> Dict:
+        """Persist an audit result; sets and returns it with its new id."""
+        created_at = datetime.fromisoformat(result["created_at"]) if result.get("created_at") else datetime.utcnow()
+        async with async_session() as session:
+            audit_id = (await session.execute(
+                insert(Audit).returning(Audit.id),
+                [{
+                    "user_id": user_id,
+                    "brand_name": result["brand_name"],
+                    "industry": industry,
+                    "visibility_score": result["visibility_score"],
+                    "chatgpt_mentioned": result["chatgpt_mentioned"],
+                    "gemini_mentioned": result["gemini_mentioned"],
+                    "perplexity_mentioned": result["perplexity_mentioned"],
+                    "overall_sentiment": result["overall_sentiment"],
+                    "status": "completed",
+                    "created_at": created_at,
+                    "completed_at": datetime.utcnow(),
+                }]
+            )).scalar_one()
+
+            if result.get("mentions"):
+                await session.execute(insert(Mention), self._mention_rows(audit_id, result["mentions"]))
+            if result.get("citation_gaps"):
+                await session.execute(insert(CitationGap), [
+                    {"audit_id": audit_id, **gap} for gap in result["citation_gaps"]
+                ])
+            if result.get("hallucination_alerts"):
+                await session.execute(insert(HallucinationAlert), [
+                    {"audit_id": audit_id, **alert} for alert in result["hallucination_alerts"]
+                ])
+            await session.commit()
+
+        result["id"] = audit_id
+        return result
+
+    def _to_dict(self, audit: Audit) -> Dict:
+        # Background jobs keep their full payload on the row
+        if audit.result is not None:
+            return audit.result
+        return {
+            "id": audit.id,
+            "brand_name": audit.brand_name,
+            "visibility_score": audit.visibility_score,
+            "chatgpt_mentioned": audit.chatgpt_mentioned,
+            "gemini_mentioned": audit.gemini_mentioned,
+            "perplexity_mentioned": audit.perplexity_mentioned,
+            "overall_sentiment": audit.overall_sentiment,
+            "mentions": [
+                {
+                    "source": m.source,
+                    "query_type": m.query_type,
+                    "query": m.query,
+                    "response_preview": m.response_text,
+                    "brand_mentioned": m.brand_mentioned,
+                    "contexts": m.contexts or [],
+                    "sentiment": m.sentiment,
+                    "sentiment_score": m.sentiment_score,
+                    "is_mock": m.is_mock,
+                    "truncated": m.truncated or False,
+                    "error": m.error,
+                }
+                for m in sorted(audit.mentions, key=lambda m: m.id)
+            ],
+            "citation_gaps": [
+                {
+                    "platform": g.platform,
+                    "url": g.url,
+                    "competitor_mentioned": g.competitor_mentioned,
+                    "context": g.context,
+                    "priority": g.priority,
+                    "pitch_template": g.pitch_template,
+                }
+                for g in sorted(audit.citation_gaps, key=lambda g: g.id)
+            ],
+            "hallucination_alerts": [
+                {
+                    "source": a.source,
+                    "incorrect_claim": a.incorrect_claim,
+                    "correct_information": a.correct_information,
+                    "severity": a.severity,
+                    "correction_draft": a.correction_draft,
+                }
+                for a in sorted(audit.hallucination_alerts, key=lambda a: a.id)
+            ],
+            "created_at": audit.created_at.isoformat() if audit.created_at else None,
+        }
+
+    async def get(self, audit_id: int) -> Optional[Dict]:
+        """Load one completed audit with its mentions, gaps and alerts."""
+        async with async_session() as session:
+            audit = (await session.execute(
+                select(Audit)
+                .where(Audit.id == audit_id, Audit.status == "completed")
+                .options(
+                    selectinload(Audit.mentions),
+                    selectinload(Audit.citation_gaps),
+                    selectinload(Audit.hallucination_alerts),
+                )
+            )).scalar_one_or_none()
+        return self._to_dict(audit) if audit is not None else None
+
+    async def version(self, audit_id: int) -> Optional[str]:
+        """
+        Version token of a completed audit, or None if there is none.
+        Completed audits are not modified, so this is when it completed.
+        """
+        async with async_session() as session:
+            row = (await session.execute(
+                select(Audit.completed_at, Audit.created_at)
+                .where(Audit.id == audit_id, Audit.status == "completed")
+            )).one_or_none()
+        if row is None:
+            return None
+        stamp = row.completed_at or row.created_at
+        return stamp.isoformat() if stamp else ""
+
+    async def list(self, limit: int = 20, offset: int = 0) -> Dict:
+        """Page of completed audit summaries, newest first."""
+        completed = Audit.status == "completed"
+        async with async_session() as session:
+            total = (await session.execute(select(func.count()).select_from(Audit).where(completed))).scalar_one()
+            rows = (await session.execute(
+                select(
+                    Audit.id,
+                    Audit.brand_name,
+                    Audit.industry,
+                    Audit.visibility_score,
+                    Audit.chatgpt_mentioned,
+                    Audit.gemini_mentioned,
+                    Audit.perplexity_mentioned,
+                    Audit.overall_sentiment,
+                    Audit.created_at,
+                )
+                .where(completed)
+                .order_by(Audit.id.desc())
+                .limit(limit)
+                .offset(offset)
+            )).all()
+        return {
+            "items": [
+                {**row._asdict(), "created_at": row.created_at.isoformat() if row.created_at else None}
+                for row in rows
+            ],
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+        }
+
+    async def history(
+        self,
+        user_id: Optional[int],
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        brand: Optional[str] = None,
+        industry: Optional[str] = None,
+        status: Optional[str] = None,
+        min_score: Optional[int] = None,
+        max_score: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Dict:
+        """
+        One page of a user's audits, newest first, keyset-paginated on
+        (user_id, created_at, id) so every page costs the same however
+        deep it is. `user_id=None` pages through anonymous audits.
+
+        `fields` picks audit columns from HISTORY_FIELDS; "mentions" adds
+        a per-mention summary without response text.
+        """
+        fields = list(fields or DEFAULT_HISTORY_FIELDS)
+        unknown = set(fields) - set(HISTORY_FIELDS) - {"mentions"}
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        columns = [f for f in HISTORY_FIELDS if f in fields]
+
+        query = select(
+            Audit.id, Audit.created_at, *(getattr(Audit, f) for f in columns if f not in ("id", "created_at"))
+        )
+        query = query.where(Audit.user_id == user_id if user_id is not None else Audit.user_id.is_(None))
+        if brand is not None:
+            query = query.where(Audit.brand_name == brand)
+        if industry is not None:
+            query = query.where(Audit.industry == industry)
+        if status is not None:
+            query = query.where(Audit.status == status)
+        if min_score is not None:
+            query = query.where(Audit.visibility_score >= min_score)
+        if max_score is not None:
+            query = query.where(Audit.visibility_score <= max_score)
+        if cursor:
+            query = query.where(tuple_(Audit.created_at, Audit.id) < tuple_(*decode_cursor(cursor)))
+        # One extra row tells us whether another page exists
+        query = query.order_by(Audit.created_at.desc(), Audit.id.desc()).limit(limit + 1)
+
+        async with async_session() as session:
+            rows = (await session.execute(query)).all()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+
+            mentions: Dict[int, List[Dict]] = {}
+            if "mentions" in fields and rows:
+                mention_rows = (await session.execute(
+                    select(Mention.audit_id, *(getattr(Mention, f) for f in HISTORY_MENTION_FIELDS))
+                    .where(Mention.audit_id.in_([row.id for row in rows]))
+                    .order_by(Mention.id)
+                )).all()
+                for m in mention_rows:
+                    mentions.setdefault(m.audit_id, []).append(
+                        {f: getattr(m, f) for f in HISTORY_MENTION_FIELDS}
+                    )
+
+        items = []
+        for row in rows:
+            item = {}
+            for field in columns:
+                value = getattr(row, field)
+                item[field] = value.isoformat() if isinstance(value, datetime) else value
+            if "mentions" in fields:
+                item["mentions"] = mentions.get(row.id, [])
+            items.append(item)
+
+        last = rows[-1] if rows else None
+        return {
+            "items": items,
+            "next_cursor": encode_cursor(last.created_at, last.id) if has_more else None,
+            "limit": limit,
+        }
+
+
+# Singleton instance
+audit_store = AuditStore()
@@ -0,0 +1,168 @@
+"""
+Response Compression - Brotli or gzip encoding of large responses.
+Picks the best encoding the client accepts, leaves responses under a
+size threshold (and event streams) untouched, and tags compressed
+representations' ETags with their encoding.
+"""
+import asyncio
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+from config import settings
+
+
+# Content encodings this middleware produces, most preferred first
+ENCODINGS = ("br", "gzip")
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """The preferred supported encoding in an Accept-Encoding header, if any."""
+    accepted = {}
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.strip()] = quality
+    for encoding in ENCODINGS:
+        if encoding == "br" and not BROTLI_AVAILABLE:
+            continue
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class Compressor:
+    """Incremental encoder for one response body."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            # wbits 16 + MAX_WBITS writes a gzip header and trailer
+            self._zlib = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        """Encode a chunk; each chunk is flushed so streamed parts reach the client."""
+        if self.encoding == "br":
+            data = self._brotli.process(body)
+            return data + (self._brotli.flush() if more_body else self._brotli.finish())
+        data = self._zlib.compress(body)
+        return data + self._zlib.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+
+
+class CompressionResponder:
+    """
+    Wraps one response: holds back its start message until the first body
+    chunk shows whether the response is worth compressing, then rewrites
+    the headers and encodes the body (on a thread for large chunks).
+    """
+
+    def __init__(self, app: ASGIApp, encoding: Optional[str], minimum_size: int, thread_minimum_size: int):
+        self.app = app
+        self.compressor = Compressor(encoding) if encoding else None
+        self.minimum_size = minimum_size
+        self.thread_minimum_size = thread_minimum_size
+        self.send: Send = None
+        self.start_message: Optional[Message] = None
+        self.started = False
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_wrapped)
+
+    async def _encode(self, body: bytes, more_body: bool) -> bytes:
+        if len(body) >= self.thread_minimum_size:
+            return await asyncio.to_thread(self.compressor.compress, body, more_body)
+        return self.compressor.compress(body, more_body)
+
+    async def send_wrapped(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            # Already encoded, or an event stream whose events must not be buffered
+            self.passthrough = (
+                "content-encoding" in headers
+                or headers.get("content-type", "").startswith("text/event-stream")
+            )
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            if not self.started and self.start_message is not None:
+                self.started = True
+                await self.send(self.start_message)
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if not self.started:
+            self.started = True
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            if len(body) < self.minimum_size and not more_body:
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+            headers.add_vary_header("Accept-Encoding")
+            if self.compressor is None:
+                self.passthrough = True
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+            coding = self.compressor.encoding
+            headers["Content-Encoding"] = coding
+            # A compressed response is a different representation
+            etag = headers.get("etag")
+            if etag and etag.startswith('"'):
+                headers["ETag"] = f'{etag[:-1]}-{coding}"'
+            body = await self._encode(body, more_body)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(body))
+            await self.send(self.start_message)
+            await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+            return
+
+        await self.send({"type": "http.response.body", "body": await self._encode(body, more_body), "more_body": more_body})
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses of at least COMPRESSION_MINIMUM_SIZE bytes with
+    brotli when the client accepts it, else gzip.
+
+    A compressed response is a different representation, so a strong
+    ETag gets its encoding appended ("abc" -> "abc-br"); etags.matches()
+    accepts either form in If-None-Match.
+    """
+
+    def __init__(self, app: ASGIApp, thread_minimum_size: int = 128 * 1024):
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MINIMUM_SIZE
+        self.thread_minimum_size = thread_minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        responder = CompressionResponder(self.app, encoding, self.minimum_size, self.thread_minimum_size)
+        await responder(scope, receive, send)
@@ -0,0 +1,60 @@
+"""
+ETags - Strong entity tags and If-None-Match handling.
+Tags are derived from what determines a response (a stored audit's
+version, a generator's inputs), so a matching request can be answered
+with 304 before the response is loaded or built.
+"""
+import hashlib
+import json
+from typing import Any, Optional
+
+from fastapi import Response
+
+from services.compression import ENCODINGS
+
+
+# Browsers keep the response but revalidate it on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def strong_etag(*parts: Any) -> str:
+    """Quoted strong ETag for JSON-serializable parts."""
+    raw = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return '"' + hashlib.sha256(raw.encode()).hexdigest()[:32] + '"'
+
+
+def _opaque(tag: str) -> str:
+    """Tag without its weak prefix or a compression suffix."""
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    for encoding in ENCODINGS:
+        suffix = f'-{encoding}"'
+        if tag.endswith(suffix):
+            return tag[:-len(suffix)] + '"'
+    return tag
+
+
+def matches(if_none_match: Optional[str], etag: str) -> Optional[str]:
+    """
+    The If-None-Match entry that matches `etag` (weak comparison, as
+    If-None-Match requires), or None. The entry is returned so a 304 can
+    echo the exact tag the client holds.
+    """
+    if not if_none_match:
+        return None
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or _opaque(tag) == etag:
+            return etag if tag == "*" else tag
+    return None
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def tag_response(response: Response, etag: str) -> None:
+    """Set the validator headers on a full response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -3,11 +3,21 @@ Enhanced GEO Audit Engine for GEO-Sight Pro
 Comprehensive multi-query analysis across AI platforms
 """
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Callable, Iterable, Iterator, Sequence, Tuple, TypeVar, Union
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, partial
+import asyncio
 import random
 from datetime import datetime
 
+import numpy as np
+
+from config import settings
+from agents import browser_scout, sentiment_agent
+
+T = TypeVar("T")
+
 
 class QueryCategory(str, Enum):
     INDUSTRY = "industry"
@@ -46,7 +56,7 @@ class QueryTemplate:
     weight: float = 1.0
 
 
-@dataclass
+@dataclass(slots=True)
 class PlatformMention:
     """Detailed mention from an AI platform"""
     platform: Platform
@@ -65,6 +75,131 @@ class PlatformMention:
     is_mock: bool = True
 
 
+class MentionTable:
+    """
+    An audit's platform mentions stored column-wise.
+    
+    Scores, flags and enum codes are NumPy arrays so audit metrics are
+    array reductions; text and list fields stay in plain lists. Rows are
+    rebuilt as PlatformMention objects only when indexed or iterated.
+    """
+    
+    PLATFORMS = tuple(Platform)
+    CATEGORIES = tuple(QueryCategory)
+    SENTIMENTS = tuple(Sentiment)
+    
+    __slots__ = (
+        "platform", "query_category", "sentiment", "brand_mentioned", "sentiment_score",
+        "citation_quality", "ranking_position", "is_recommended", "is_mock",
+        "query", "response_preview", "mention_contexts", "competitors_mentioned", "citations",
+    )
+    
+    def __init__(self, mentions: Sequence[PlatformMention] = ()):
+        """Build the columns from mention objects."""
+        codes = {member: code for members in (self.PLATFORMS, self.CATEGORIES, self.SENTIMENTS)
+                 for code, member in enumerate(members)}
+        count = len(mentions)
+        self.platform = np.fromiter((codes[m.platform] for m in mentions), np.int8, count)
+        self.query_category = np.fromiter((codes[m.query_category] for m in mentions), np.int8, count)
+        self.sentiment = np.fromiter((codes[m.sentiment] for m in mentions), np.int8, count)
+        self.brand_mentioned = np.fromiter((m.brand_mentioned for m in mentions), bool, count)
+        self.sentiment_score = np.fromiter((m.sentiment_score for m in mentions), np.float64, count)
+        self.citation_quality = np.fromiter((m.citation_quality for m in mentions), np.int16, count)
+        # -1 stands for "not ranked"
+        self.ranking_position = np.fromiter(
+            (-1 if m.ranking_position is None else m.ranking_position for m in mentions), np.int16, count
+        )
+        self.is_recommended = np.fromiter((m.is_recommended for m in mentions), bool, count)
+        self.is_mock = np.fromiter((m.is_mock for m in mentions), bool, count)
+        self.query = [m.query for m in mentions]
+        self.response_preview = [m.response_preview for m in mentions]
+        self.mention_contexts = [m.mention_contexts for m in mentions]
+        self.competitors_mentioned = [m.competitors_mentioned for m in mentions]
+        self.citations = [m.citations for m in mentions]
+    
+    @classmethod
+    def scores_only(
+        cls,
+        platform: np.ndarray,
+        query_category: np.ndarray,
+        brand_mentioned: np.ndarray,
+        sentiment: np.ndarray,
+        sentiment_score: np.ndarray,
+        citation_quality: np.ndarray,
+    ) -> "MentionTable":
+        """
+        A table of just the columns audit scores are computed from (enum
+        codes, flags and scores). Text columns are left empty, nothing is
+        ranked or recommended.
+        """
+        table = cls.__new__(cls)
+        count = len(platform)
+        table.platform = platform.astype(np.int8)
+        table.query_category = query_category.astype(np.int8)
+        table.brand_mentioned = brand_mentioned.astype(bool)
+        table.sentiment = sentiment.astype(np.int8)
+        table.sentiment_score = sentiment_score.astype(np.float64)
+        table.citation_quality = citation_quality.astype(np.int16)
+        table.ranking_position = np.full(count, -1, np.int16)
+        table.is_recommended = np.zeros(count, bool)
+        table.is_mock = np.ones(count, bool)
+        table.query = [""] * count
+        table.response_preview = [""] * count
+        table.mention_contexts = [[] for _ in range(count)]
+        table.competitors_mentioned = [[] for _ in range(count)]
+        table.citations = [[] for _ in range(count)]
+        return table
+    
+    def __len__(self) -> int:
+        return len(self.query)
+    
+    def __getitem__(self, index: int) -> PlatformMention:
+        if not -len(self) <= index < len(self):
+            raise IndexError("mention index out of range")
+        ranking_position = int(self.ranking_position[index])
+        return PlatformMention(
+            platform=self.PLATFORMS[self.platform[index]],
+            query_category=self.CATEGORIES[self.query_category[index]],
+            query=self.query[index],
+            response_preview=self.response_preview[index],
+            brand_mentioned=bool(self.brand_mentioned[index]),
+            mention_contexts=self.mention_contexts[index],
+            sentiment=self.SENTIMENTS[self.sentiment[index]],
+            sentiment_score=float(self.sentiment_score[index]),
+            citation_quality=int(self.citation_quality[index]),
+            competitors_mentioned=self.competitors_mentioned[index],
+            citations=self.citations[index],
+            ranking_position=None if ranking_position < 0 else ranking_position,
+            is_recommended=bool(self.is_recommended[index]),
+            is_mock=bool(self.is_mock[index]),
+        )
+    
+    def __iter__(self) -> Iterator[PlatformMention]:
+        return (self[i] for i in range(len(self)))
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Brand-mention metrics in a few array operations: the count, mean
+        sentiment and citation quality of mentions naming the brand, and
+        per-platform mentioned/positive flags from one platform x
+        sentiment histogram.
+        """
+        mentioned = self.brand_mentioned
+        count = int(np.count_nonzero(mentioned))
+        by_platform = np.bincount(
+            self.platform[mentioned] * len(self.SENTIMENTS) + self.sentiment[mentioned],
+            minlength=len(self.PLATFORMS) * len(self.SENTIMENTS)
+        ).reshape(len(self.PLATFORMS), len(self.SENTIMENTS))
+        positive = by_platform[:, self.SENTIMENTS.index(Sentiment.POSITIVE)]
+        return {
+            "mentioned_count": count,
+            "sentiment_score": float(self.sentiment_score @ mentioned) / max(count, 1),
+            "citation_quality": float(self.citation_quality @ mentioned) / max(count, 1),
+            "platforms_mentioned": dict(zip(self.PLATFORMS, (by_platform.sum(axis=1) > 0).tolist())),
+            "platforms_positive": int(np.count_nonzero(positive)),
+        }
+
+
 @dataclass
 class CitationGap:
     """Missing citation opportunity"""
@@ -122,6 +257,20 @@ class SchemaRecommendation:
     implementation_guide: str
 
 
+# Sections of an audit result, selectable with include=
+AUDIT_SECTIONS = (
+    "mentions",
+    "citation_gaps",
+    "hallucination_alerts",
+    "competitor_insights",
+    "content_recommendations",
+    "schema_recommendations",
+)
+
+# Sections whose items count as actions
+ACTION_SECTIONS = ("citation_gaps", "hallucination_alerts", "content_recommendations", "schema_recommendations")
+
+
 @dataclass
 class AuditResult:
     """Complete GEO audit result"""
@@ -144,7 +293,7 @@ class AuditResult:
     platforms_positive: int
     
     # Detailed Data
-    mentions: List[PlatformMention]
+    mentions: MentionTable
     citation_gaps: List[CitationGap]
     hallucination_alerts: List[HallucinationAlert]
     competitor_insights: List[CompetitorInsight]
@@ -159,6 +308,9 @@ class AuditResult:
     # Timestamps
     created_at: datetime
     completed_at: Optional[datetime]
+    
+    # Sections that were generated; the others are left empty
+    sections: Tuple[str, ...] = AUDIT_SECTIONS
 
 
 class GEOAuditEngine:
@@ -219,8 +371,80 @@ class GEOAuditEngine:
         {"name": "Twitter/X", "type": "social", "url_template": "https://x.com/search?q={query}"},
     ]
     
-    def __init__(self, use_real_apis: bool = False):
+    MENTION_TEMPLATES = 8  # templates queried per platform
+    CITATION_GAP_COUNT = 8  # citation platforms suggested per audit
+    
+    # Common hallucination patterns
+    HALLUCINATION_PATTERNS = [
+        {
+            "claim": "{brand_name} was acquired by a larger company in 2025",
+            "correct": "{brand_name} remains an independent company and continues to grow",
+            "severity": Priority.CRITICAL,
+        },
+        {
+            "claim": "{brand_name} discontinued their free tier",
+            "correct": "{brand_name} still offers a free tier with [features]",
+            "severity": Priority.HIGH,
+        },
+        {
+            "claim": "{brand_name} only supports enterprise customers",
+            "correct": "{brand_name} serves businesses of all sizes, from startups to enterprise",
+            "severity": Priority.MEDIUM,
+        },
+    ]
+    
+    CONTENT_IDEAS = [
+        {
+            "title": "Ultimate {industry_title} FAQ: {brand_name} Answers Your Top Questions",
+            "type": "faq",
+            "priority": Priority.HIGH,
+            "impact": 9,
+        },
+        {
+            "title": "{brand_name} vs Competitors: Complete Comparison Guide 2026",
+            "type": "comparison",
+            "priority": Priority.HIGH,
+            "impact": 8,
+        },
+        {
+            "title": "How to Get Started with {brand_name}: Step-by-Step Guide",
+            "type": "how-to",
+            "priority": Priority.MEDIUM,
+            "impact": 7,
+        },
+        {
+            "title": "{industry_title} Statistics: {brand_name}'s Impact on Customer Success",
+            "type": "stats",
+            "priority": Priority.MEDIUM,
+            "impact": 7,
+        },
+    ]
+    
+    SCHEMA_PRIORITIES = {"Organization": Priority.HIGH, "FAQPage": Priority.HIGH}
+    
+    def __init__(self, use_real_apis: bool = False, max_workers: Optional[int] = None):
         self.use_real_apis = use_real_apis
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._rng = np.random.default_rng()
+    
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Bounded pool for the CPU-bound parts of async audits."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers or settings.AUDIT_ENGINE_WORKERS,
+                thread_name_prefix="geo-audit"
+            )
+        return self._executor
+    
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+    
+    async def _offload(self, fn: Callable[..., T], *args) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, partial(fn, *args))
     
     def get_competitors(self, industry: str) -> List[str]:
         """Get competitors for the given industry"""
@@ -249,56 +473,179 @@ class GEOAuditEngine:
     def generate_mentions(self, brand_name: str, industry: str) -> List[PlatformMention]:
         """Generate detailed platform mentions"""
         mentions = []
+        for platform in Platform:
+            mentions.extend(self.generate_platform_mentions(platform, brand_name, industry))
+        return mentions
+    
+    def generate_platform_mentions(self, platform: Platform, brand_name: str, industry: str) -> List[PlatformMention]:
+        """Generate (simulated) mentions for one platform"""
+        mentions = []
         competitors = self.get_competitors(industry)
         
-        for platform in Platform:
-            for template in self.QUERY_TEMPLATES[:8]:  # Use first 8 templates
-                query = template.template.format(
-                    brand_name=brand_name,
-                    industry=industry
-                )
-                
-                # Simulate mention probability
-                is_mentioned = random.random() > 0.4
-                sentiment = random.choice(list(Sentiment))
-                
-                # Generate contextual response
-                if is_mentioned:
-                    contexts = [
-                        f"{brand_name} is recognized as a leading solution",
-                        f"Many users recommend {brand_name} for its features",
-                        f"{brand_name} offers competitive pricing",
-                    ]
-                    response = f"Based on my analysis, {brand_name} is one of the notable options in the {industry} space. "
-                    response += random.choice([
-                        f"It's known for reliability and good customer support.",
-                        f"Users appreciate its intuitive interface and features.",
-                        f"It competes well with alternatives like {competitors[0]}.",
-                    ])
-                else:
-                    contexts = []
-                    response = f"In the {industry} market, popular options include {', '.join(competitors[:3])}. "
-                    response += "Each has unique strengths depending on your needs."
-                
-                mentions.append(PlatformMention(
-                    platform=platform,
-                    query_category=template.category,
-                    query=query,
-                    response_preview=response[:300],
-                    brand_mentioned=is_mentioned,
-                    mention_contexts=contexts if is_mentioned else [],
-                    sentiment=sentiment if is_mentioned else Sentiment.NEUTRAL,
-                    sentiment_score=random.uniform(0.2, 0.8) if is_mentioned else 0,
-                    citation_quality=random.randint(40, 90) if is_mentioned else 0,
-                    competitors_mentioned=random.sample(competitors, min(3, len(competitors))),
-                    citations=[],
-                    ranking_position=random.randint(1, 5) if is_mentioned else None,
-                    is_recommended=is_mentioned and random.random() > 0.5,
-                    is_mock=True
-                ))
+        for template in self.QUERY_TEMPLATES[:self.MENTION_TEMPLATES]:
+            query = template.template.format(
+                brand_name=brand_name,
+                industry=industry
+            )
+            
+            # Simulate mention probability
+            is_mentioned = random.random() > 0.4
+            sentiment = random.choice(list(Sentiment))
+            
+            # Generate contextual response
+            if is_mentioned:
+                contexts = [
+                    f"{brand_name} is recognized as a leading solution",
+                    f"Many users recommend {brand_name} for its features",
+                    f"{brand_name} offers competitive pricing",
+                ]
+                response = f"Based on my analysis, {brand_name} is one of the notable options in the {industry} space. "
+                response += random.choice([
+                    f"It's known for reliability and good customer support.",
+                    f"Users appreciate its intuitive interface and features.",
+                    f"It competes well with alternatives like {competitors[0]}.",
+                ])
+            else:
+                contexts = []
+                response = f"In the {industry} market, popular options include {', '.join(competitors[:3])}. "
+                response += "Each has unique strengths depending on your needs."
+            
+            mentions.append(PlatformMention(
+                platform=platform,
+                query_category=template.category,
+                query=query,
+                response_preview=response[:300],
+                brand_mentioned=is_mentioned,
+                mention_contexts=contexts if is_mentioned else [],
+                sentiment=sentiment if is_mentioned else Sentiment.NEUTRAL,
+                sentiment_score=random.uniform(0.2, 0.8) if is_mentioned else 0,
+                citation_quality=random.randint(40, 90) if is_mentioned else 0,
+                competitors_mentioned=random.sample(competitors, min(3, len(competitors))),
+                citations=[],
+                ranking_position=random.randint(1, 5) if is_mentioned else None,
+                is_recommended=is_mentioned and random.random() > 0.5,
+                is_mock=True
+            ))
         
         return mentions
     
+    def analyze_platform_responses(
+        self,
+        platform: Platform,
+        brand_name: str,
+        industry: str,
+        templates: List[QueryTemplate],
+        responses: List[Dict],
+        sentiments: Optional[List[Tuple[str, float]]] = None
+    ) -> List[PlatformMention]:
+        """Turn live platform answers into mentions (scores sentiment unless given)"""
+        mentions = []
+        competitors = self.get_competitors(industry)
+        if sentiments is None:
+            sentiments = [sentiment_agent.analyze_sentiment(r.get("response", "")) for r in responses]
+        
+        for template, response_data, (label, score) in zip(templates, responses, sentiments):
+            text = response_data.get("response", "")
+            # One pass finds the brand and every competitor, in order of appearance
+            scan = sentiment_agent.scan_text(text, brand_name, competitors=competitors)
+            mention = response_data.get("mention") or scan
+            citations = response_data.get("citations") or []
+            
+            # Rank the brand among the competitors it is listed with
+            ranking = list(dict.fromkeys(
+                hit["name"] for hit in scan["hits"] if hit["kind"] in ("brand", "competitor")
+            ))
+            
+            mentions.append(PlatformMention(
+                platform=platform,
+                query_category=template.category,
+                query=response_data.get("query", ""),
+                response_preview=text[:300],
+                brand_mentioned=mention["mentioned"],
+                mention_contexts=mention["contexts"],
+                sentiment=Sentiment(label),
+                sentiment_score=score,
+                citation_quality=min(100, 40 + 15 * len(citations)) if mention["mentioned"] else 0,
+                competitors_mentioned=[name for name in ranking if name != brand_name],
+                citations=citations,
+                ranking_position=ranking.index(brand_name) + 1 if brand_name in ranking else None,
+                is_recommended=mention["mentioned"] and label == Sentiment.POSITIVE.value,
+                is_mock=response_data.get("is_mock", False)
+            ))
+        
+        return mentions
+    
+    async def generate_platform_mentions_async(self, platform: Platform, brand_name: str, industry: str) -> List[PlatformMention]:
+        """
+        Mentions for one platform. With real APIs, the platform's queries
+        run concurrently through BrowserScout, sentiment is scored in the
+        sentiment process pool and the rest is analyzed in the executor;
+        otherwise the simulated mentions are generated there.
+        """
+        if not (self.use_real_apis and platform.value in browser_scout.PLATFORMS):
+            return await self._offload(self.generate_platform_mentions, platform, brand_name, industry)
+        
+        templates = self.QUERY_TEMPLATES[:self.MENTION_TEMPLATES]
+        responses = await asyncio.gather(*(
+            browser_scout.query_platform(
+                platform.value,
+                template.template.format(brand_name=brand_name, industry=industry),
+                # Brand-specific queries can be matched (and cut off) as they stream
+                brand_name if "{brand_name}" in template.template else None
+            )
+            for template in templates
+        ))
+        sentiments = await sentiment_agent.analyze_sentiment_batch([r.get("response", "") for r in responses])
+        return await self._offload(
+            self.analyze_platform_responses, platform, brand_name, industry, templates, list(responses), sentiments
+        )
+    
+    async def generate_mentions_async(self, brand_name: str, industry: str) -> List[PlatformMention]:
+        """Generate mentions for every platform concurrently"""
+        per_platform = await asyncio.gather(*(
+            self.generate_platform_mentions_async(platform, brand_name, industry)
+            for platform in Platform
+        ))
+        return [mention for mentions in per_platform for mention in mentions]
+    
+    @cached_property
+    def _mention_layout(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Platform and query category codes of the mentions an audit generates, in order"""
+        templates = self.QUERY_TEMPLATES[:self.MENTION_TEMPLATES]
+        platforms = np.repeat(np.arange(len(Platform), dtype=np.int8), len(templates))
+        categories = np.tile(np.array([MentionTable.CATEGORIES.index(t.category) for t in templates], np.int8), len(Platform))
+        return platforms, categories
+    
+    def generate_mention_scores(self) -> MentionTable:
+        """
+        Just the scores of simulated mentions, drawn in one array call:
+        the same distribution as generate_platform_mentions without
+        building any query or answer text.
+        """
+        platform_codes, category_codes = self._mention_layout
+        draws = self._rng.random((4, len(platform_codes)))
+        mentioned = draws[0] > 0.4
+        neutral = MentionTable.SENTIMENTS.index(Sentiment.NEUTRAL)
+        return MentionTable.scores_only(
+            platform=platform_codes,
+            query_category=category_codes,
+            brand_mentioned=mentioned,
+            sentiment=np.where(mentioned, (draws[1] * len(Sentiment)).astype(np.int8), neutral),
+            sentiment_score=np.where(mentioned, 0.2 + 0.6 * draws[2], 0.0),
+            citation_quality=np.where(mentioned, 40 + (draws[3] * 51).astype(np.int16), 0),
+        )
+    
+    async def generate_mention_scores_async(self, brand_name: str, industry: str) -> MentionTable:
+        """Mentions to score an audit on when the mentions themselves are not wanted"""
+        if self.use_real_apis:
+            # Live answers have to be fetched and analyzed either way
+            return MentionTable(await self.generate_mentions_async(brand_name, industry))
+        return self.generate_mention_scores()
+    
+    @staticmethod
+    def citation_gap_priority(index: int) -> Priority:
+        return Priority.HIGH if index < 3 else Priority.MEDIUM if index < 6 else Priority.LOW
+    
     def generate_citation_gaps(self, brand_name: str, industry: str) -> List[CitationGap]:
         """Generate citation gap opportunities"""
         gaps = []
@@ -318,7 +665,7 @@ class GEOAuditEngine:
             "blog_comment": f"Great points! {brand_name} is another option worth considering - they excel at [strength] and offer [unique feature].",
         }
         
-        for i, platform_info in enumerate(self.CITATION_PLATFORMS[:8]):
+        for i, platform_info in enumerate(self.CITATION_PLATFORMS[:self.CITATION_GAP_COUNT]):
             competitor = random.choice(competitors)
             action_type = platform_info["type"] if platform_info["type"] in templates else "forum"
             
@@ -333,7 +680,7 @@ class GEOAuditEngine:
                 ),
                 competitor_mentioned=competitor,
                 context=templates.get(action_type, templates["forum"]).format(competitor=competitor),
-                priority=Priority.HIGH if i < 3 else Priority.MEDIUM if i < 6 else Priority.LOW,
+                priority=self.citation_gap_priority(i),
                 estimated_impact=random.randint(5, 10) if i < 3 else random.randint(3, 7),
                 pitch_template=pitches.get(action_type, pitches["forum"]),
                 action_type=action_type
@@ -341,34 +688,21 @@ class GEOAuditEngine:
         
         return gaps
     
+    def pick_hallucinations(self) -> List[Dict[str, Any]]:
+        """Randomly include 0-2 hallucination patterns"""
+        num_hallucinations = random.randint(0, 2)
+        return random.sample(self.HALLUCINATION_PATTERNS, min(num_hallucinations, len(self.HALLUCINATION_PATTERNS)))
+    
     def generate_hallucination_alerts(self, brand_name: str, industry: str) -> List[HallucinationAlert]:
         """Generate hallucination alerts"""
         alerts = []
         
-        # Common hallucination patterns
-        hallucinations = [
-            {
-                "claim": f"{brand_name} was acquired by a larger company in 2025",
-                "correct": f"{brand_name} remains an independent company and continues to grow",
-                "severity": Priority.CRITICAL,
-            },
-            {
-                "claim": f"{brand_name} discontinued their free tier",
-                "correct": f"{brand_name} still offers a free tier with [features]",
-                "severity": Priority.HIGH,
-            },
-            {
-                "claim": f"{brand_name} only supports enterprise customers",
-                "correct": f"{brand_name} serves businesses of all sizes, from startups to enterprise",
-                "severity": Priority.MEDIUM,
-            },
-        ]
-        
-        # Randomly include 0-2 hallucinations
-        num_hallucinations = random.randint(0, 2)
-        selected = random.sample(hallucinations, min(num_hallucinations, len(hallucinations)))
-        
-        for h in selected:
+        for pattern in self.pick_hallucinations():
+            h = {
+                "claim": pattern["claim"].format(brand_name=brand_name),
+                "correct": pattern["correct"].format(brand_name=brand_name),
+                "severity": pattern["severity"],
+            }
             correction_draft = f"""# Clarification: {brand_name} Facts
 
 We've noticed some AI systems may have outdated information about {brand_name}. Here's the accurate information:
@@ -428,40 +762,14 @@ For the latest accurate information, please visit our official website or contac
         """Generate content optimization recommendations"""
         recommendations = []
         
-        content_ideas = [
-            {
-                "title": f"Ultimate {industry.title()} FAQ: {brand_name} Answers Your Top Questions",
-                "type": "faq",
-                "priority": Priority.HIGH,
-                "impact": 9,
-            },
-            {
-                "title": f"{brand_name} vs Competitors: Complete Comparison Guide 2026",
-                "type": "comparison",
-                "priority": Priority.HIGH,
-                "impact": 8,
-            },
-            {
-                "title": f"How to Get Started with {brand_name}: Step-by-Step Guide",
-                "type": "how-to",
-                "priority": Priority.MEDIUM,
-                "impact": 7,
-            },
-            {
-                "title": f"{industry.title()} Statistics: {brand_name}'s Impact on Customer Success",
-                "type": "stats",
-                "priority": Priority.MEDIUM,
-                "impact": 7,
-            },
-        ]
-        
-        for idea in content_ideas:
+        for idea in self.CONTENT_IDEAS:
+            title = idea["title"].format(brand_name=brand_name, industry_title=industry.title())
             recommendations.append(ContentRecommendation(
-                title=idea["title"],
+                title=title,
                 content_type=idea["type"],
                 priority=idea["priority"],
                 estimated_impact=idea["impact"],
-                generated_content=f"[AI-generated content will appear here for: {idea['title']}]",
+                generated_content=f"[AI-generated content will appear here for: {title}]",
                 target_queries=[
                     f"What is {brand_name}?",
                     f"Best {industry} tools",
@@ -492,7 +800,7 @@ For the latest accurate information, please visit our official website or contac
         
         recommendations.append(SchemaRecommendation(
             schema_type="Organization",
-            priority=Priority.HIGH,
+            priority=self.SCHEMA_PRIORITIES["Organization"],
             generated_schema=org_schema,
             implementation_guide="Add this schema to your homepage <head> section"
         ))
@@ -523,52 +831,160 @@ For the latest accurate information, please visit our official website or contac
         
         recommendations.append(SchemaRecommendation(
             schema_type="FAQPage",
-            priority=Priority.HIGH,
+            priority=self.SCHEMA_PRIORITIES["FAQPage"],
             generated_schema=faq_schema,
             implementation_guide="Add this schema to your FAQ or About page"
         ))
         
         return recommendations
     
-    def run_audit(self, brand_name: str, industry: str, url: Optional[str] = None) -> AuditResult:
-        """Run a complete GEO audit"""
-        
-        # Generate all data
-        mentions = self.generate_mentions(brand_name, industry)
-        citation_gaps = self.generate_citation_gaps(brand_name, industry)
-        hallucination_alerts = self.generate_hallucination_alerts(brand_name, industry)
-        competitor_insights = self.generate_competitor_insights(brand_name, industry)
-        content_recommendations = self.generate_content_recommendations(brand_name, industry)
-        schema_recommendations = self.generate_schema_recommendations(brand_name, industry, url or "")
+    @staticmethod
+    def resolve_sections(include: Optional[Iterable[str]]) -> Tuple[str, ...]:
+        """Requested sections in AUDIT_SECTIONS order (all when include is None)"""
+        if include is None:
+            return AUDIT_SECTIONS
+        include = set(include)
+        unknown = include - set(AUDIT_SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown sections: {', '.join(sorted(unknown))}")
+        return tuple(section for section in AUDIT_SECTIONS if section in include)
+    
+    def section_generators(self, brand_name: str, industry: str, url: Optional[str]) -> Dict[str, Callable[[], list]]:
+        """Zero-argument generator for each report section other than mentions"""
+        return {
+            "citation_gaps": partial(self.generate_citation_gaps, brand_name, industry),
+            "hallucination_alerts": partial(self.generate_hallucination_alerts, brand_name, industry),
+            "competitor_insights": partial(self.generate_competitor_insights, brand_name, industry),
+            "content_recommendations": partial(self.generate_content_recommendations, brand_name, industry),
+            "schema_recommendations": partial(self.generate_schema_recommendations, brand_name, industry, url or ""),
+        }
+    
+    def action_priorities(self, section: str) -> List[Priority]:
+        """Priorities of the actions a section would hold, without generating it"""
+        if section == "citation_gaps":
+            return [self.citation_gap_priority(i) for i in range(len(self.CITATION_PLATFORMS[:self.CITATION_GAP_COUNT]))]
+        if section == "hallucination_alerts":
+            return [pattern["severity"] for pattern in self.pick_hallucinations()]
+        if section == "content_recommendations":
+            return [idea["priority"] for idea in self.CONTENT_IDEAS]
+        if section == "schema_recommendations":
+            return list(self.SCHEMA_PRIORITIES.values())
+        return []
+    
+    def run_audit(
+        self,
+        brand_name: str,
+        industry: str,
+        url: Optional[str] = None,
+        include: Optional[Iterable[str]] = None
+    ) -> AuditResult:
+        """Run a GEO audit, generating only the sections in `include` (all by default)"""
+        sections = self.resolve_sections(include)
+        generators = self.section_generators(brand_name, industry, url)
+        
+        return self.build_result(
+            brand_name,
+            industry,
+            url,
+            mentions=self.generate_mentions(brand_name, industry) if "mentions" in sections else self.generate_mention_scores(),
+            sections=sections,
+            **{section: generators[section]() for section in sections if section in generators}
+        )
+    
+    async def run_audit_async(
+        self,
+        brand_name: str,
+        industry: str,
+        url: Optional[str] = None,
+        include: Optional[Iterable[str]] = None
+    ) -> AuditResult:
+        """
+        Run a GEO audit without blocking the event loop, generating only
+        the sections in `include` (all by default). Platform mentions and
+        the other report sections are produced concurrently; CPU-bound
+        work runs in the bounded executor. When nothing but the scores is
+        wanted from simulated mentions, the audit is computed inline.
+        """
+        sections = self.resolve_sections(include)
+        generators = self.section_generators(brand_name, industry, url)
+        wanted = [section for section in sections if section in generators]
+        
+        if "mentions" in sections:
+            mentions = self.generate_mentions_async(brand_name, industry)
+        else:
+            mentions = self.generate_mention_scores_async(brand_name, industry)
+        if not wanted and not self.use_real_apis:
+            return self.build_result(brand_name, industry, url, mentions=await mentions, sections=sections)
+        
+        mentions, *generated = await asyncio.gather(
+            mentions, *(self._offload(generators[section]) for section in wanted)
+        )
+        return await self._offload(
+            partial(
+                self.build_result,
+                brand_name,
+                industry,
+                url,
+                mentions=mentions,
+                sections=sections,
+                **dict(zip(wanted, generated)),
+            )
+        )
+    
+    def build_result(
+        self,
+        brand_name: str,
+        industry: str,
+        url: Optional[str],
+        mentions: Union[MentionTable, List[PlatformMention]],
+        citation_gaps: Optional[List[CitationGap]] = None,
+        hallucination_alerts: Optional[List[HallucinationAlert]] = None,
+        competitor_insights: Optional[List[CompetitorInsight]] = None,
+        content_recommendations: Optional[List[ContentRecommendation]] = None,
+        schema_recommendations: Optional[List[SchemaRecommendation]] = None,
+        sections: Tuple[str, ...] = AUDIT_SECTIONS
+    ) -> AuditResult:
+        """
+        Score the generated sections into an AuditResult. Action counts
+        of sections that were not generated (None) are planned without
+        generating them; the sections themselves are left empty.
+        """
+        if not isinstance(mentions, MentionTable):
+            mentions = MentionTable(mentions)
         
         # Calculate metrics
-        mentioned_count = sum(1 for m in mentions if m.brand_mentioned)
+        summary = mentions.summary()
+        mentioned_count = summary["mentioned_count"]
         total_queries = len(mentions)
+        sentiment_score = summary["sentiment_score"]
         
         # Visibility score based on mentions, sentiment, and citations
         base_score = (mentioned_count / total_queries) * 60 if total_queries > 0 else 0
-        sentiment_bonus = sum(m.sentiment_score for m in mentions if m.brand_mentioned) / max(mentioned_count, 1) * 20
-        citation_bonus = sum(m.citation_quality for m in mentions if m.brand_mentioned) / max(mentioned_count, 1) * 0.2
+        sentiment_bonus = sentiment_score * 20
+        citation_bonus = summary["citation_quality"] * 0.2
         
         visibility_score = min(100, int(base_score + sentiment_bonus + citation_bonus))
         
         # Platform status
-        chatgpt_mentions = [m for m in mentions if m.platform == Platform.CHATGPT and m.brand_mentioned]
-        gemini_mentions = [m for m in mentions if m.platform == Platform.GEMINI and m.brand_mentioned]
-        perplexity_mentions = [m for m in mentions if m.platform == Platform.PERPLEXITY and m.brand_mentioned]
-        claude_mentions = [m for m in mentions if m.platform == Platform.CLAUDE and m.brand_mentioned]
-        
-        platforms_positive = sum([
-            1 if any(m.sentiment == Sentiment.POSITIVE for m in chatgpt_mentions) else 0,
-            1 if any(m.sentiment == Sentiment.POSITIVE for m in gemini_mentions) else 0,
-            1 if any(m.sentiment == Sentiment.POSITIVE for m in perplexity_mentions) else 0,
-            1 if any(m.sentiment == Sentiment.POSITIVE for m in claude_mentions) else 0,
-        ])
+        platforms_mentioned = summary["platforms_mentioned"]
+        platforms_positive = summary["platforms_positive"]
         
         # Count actions
-        total_actions = len(citation_gaps) + len(hallucination_alerts) + len(content_recommendations) + len(schema_recommendations)
-        critical_actions = sum(1 for c in citation_gaps if c.priority == Priority.CRITICAL)
-        critical_actions += sum(1 for h in hallucination_alerts if h.severity == Priority.CRITICAL)
+        actions = {
+            "citation_gaps": citation_gaps,
+            "hallucination_alerts": hallucination_alerts,
+            "content_recommendations": content_recommendations,
+            "schema_recommendations": schema_recommendations,
+        }
+        priorities = []
+        for section in ACTION_SECTIONS:
+            items = actions[section]
+            if items is None:
+                priorities.extend(self.action_priorities(section))
+            else:
+                priorities.extend(getattr(item, "severity", None) or item.priority for item in items)
+        total_actions = len(priorities)
+        critical_actions = priorities.count(Priority.CRITICAL)
         
         return AuditResult(
             id=random.randint(1000, 9999),
@@ -578,25 +994,26 @@ For the latest accurate information, please visit our official website or contac
             visibility_score=visibility_score,
             visibility_grade=self.calculate_visibility_grade(visibility_score),
             citation_quality_score=random.randint(40, 80),
-            sentiment_score=sum(m.sentiment_score for m in mentions if m.brand_mentioned) / max(mentioned_count, 1),
-            chatgpt_mentioned=len(chatgpt_mentions) > 0,
-            gemini_mentioned=len(gemini_mentions) > 0,
-            perplexity_mentioned=len(perplexity_mentions) > 0,
-            claude_mentioned=len(claude_mentions) > 0,
+            sentiment_score=sentiment_score,
+            chatgpt_mentioned=platforms_mentioned[Platform.CHATGPT],
+            gemini_mentioned=platforms_mentioned[Platform.GEMINI],
+            perplexity_mentioned=platforms_mentioned[Platform.PERPLEXITY],
+            claude_mentioned=platforms_mentioned[Platform.CLAUDE],
             platforms_positive=platforms_positive,
             mentions=mentions,
-            citation_gaps=citation_gaps,
-            hallucination_alerts=hallucination_alerts,
-            competitor_insights=competitor_insights,
-            content_recommendations=content_recommendations,
-            schema_recommendations=schema_recommendations,
+            citation_gaps=citation_gaps or [],
+            hallucination_alerts=hallucination_alerts or [],
+            competitor_insights=competitor_insights or [],
+            content_recommendations=content_recommendations or [],
+            schema_recommendations=schema_recommendations or [],
             total_actions=total_actions,
             critical_actions=critical_actions,
             completed_actions=0,
             created_at=datetime.utcnow(),
-            completed_at=datetime.utcnow()
+            completed_at=datetime.utcnow(),
+            sections=sections
         )
 
 
 # Singleton instance
-audit_engine = GEOAuditEngine()
+audit_engine = GEOAuditEngine(use_real_apis=settings.AUDIT_ENGINE_REAL_APIS)
@@ -0,0 +1,82 @@
+"""
+Provider HTTP Clients - Long-lived, pooled httpx clients for AI platform APIs.
+One AsyncClient per provider keeps TCP/TLS connections alive across audits
+instead of paying a fresh handshake for every query.
+"""
+from typing import Dict, Optional
+import httpx
+from config import settings
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class ProviderClients:
+    """
+    Registry of pooled AsyncClients, one per AI provider.
+    Created in the FastAPI lifespan and closed on shutdown.
+    """
+
+    PROVIDERS = {
+        "openai": "OPENAI_BASE_URL",
+        "gemini": "GEMINI_BASE_URL",
+        "perplexity": "PERPLEXITY_BASE_URL",
+    }
+
+    def __init__(self):
+        """Initialize an empty client registry."""
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    @property
+    def http2(self) -> bool:
+        """Whether HTTP/2 is both requested and supported."""
+        return settings.HTTP2_ENABLED and HTTP2_AVAILABLE
+
+    def _build_client(self, provider: str) -> httpx.AsyncClient:
+        """Create a pooled client with limits taken from settings."""
+        base_url = getattr(settings, self.PROVIDERS[provider])
+        # HTTPS negotiates HTTP/2 via ALPN; plain http needs prior knowledge
+        h2c = self.http2 and settings.HTTP2_PRIOR_KNOWLEDGE and base_url.startswith("http://")
+        return httpx.AsyncClient(
+            base_url=base_url,
+            http1=not h2c,
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT),
+        )
+
+    async def startup(self) -> None:
+        """Open one client per provider."""
+        for provider in self.PROVIDERS:
+            if provider not in self._clients:
+                self._clients[provider] = self._build_client(provider)
+
+    async def shutdown(self) -> None:
+        """Close all clients and release pooled connections."""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+    def get(self, provider: str) -> httpx.AsyncClient:
+        """
+        Get the pooled client for a provider.
+
+        Lazily creates the client when used outside the app lifespan
+        (scripts, benchmarks); it is still closed by shutdown().
+        """
+        client: Optional[httpx.AsyncClient] = self._clients.get(provider)
+        if client is None or client.is_closed:
+            client = self._build_client(provider)
+            self._clients[provider] = client
+        return client
+
+
+# Singleton instance
+provider_clients = ProviderClients()
@@ -0,0 +1,232 @@
+"""
+Audit Job Queue - Durable background audits backed by the audits table.
+Jobs are Audit rows moving pending -> running -> completed/failed, claimed
+atomically by a pool of asyncio workers so the API returns immediately.
+"""
+import asyncio
+import os
+import secrets
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import or_, select, update
+
+from config import settings
+from models.database import Audit, async_session
+
+
+JobRunner = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+# Columns copied from a finished result onto the Audit row
+SUMMARY_FIELDS = (
+    "visibility_score",
+    "chatgpt_mentioned",
+    "gemini_mentioned",
+    "perplexity_mentioned",
+    "overall_sentiment",
+)
+
+
+class AuditJobQueue:
+    """
+    SQLite-backed audit queue with a local worker pool.
+
+    Runners are registered per engine name; a job's parameters carry the
+    engine to use. Claiming is a single UPDATE ... RETURNING, so several
+    processes can share one database without double-running a job. A
+    claimed job holds a lease of JOB_LEASE_SECONDS that its worker renews
+    while it runs; only a job whose lease has lapsed (its process died)
+    is claimed again.
+    """
+
+    def __init__(self):
+        """Initialize an idle queue."""
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{secrets.token_hex(4)}"
+        self._runners: Dict[str, JobRunner] = {}
+        self._workers: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self.counters = {"submitted": 0, "completed": 0, "failed": 0}
+
+    def register_runner(self, engine: str, runner: JobRunner) -> None:
+        """Register the coroutine that executes jobs for an engine."""
+        self._runners[engine] = runner
+
+    def _lease_until(self) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+
+    async def start(self, workers: Optional[int] = None) -> None:
+        """Start the worker pool; jobs orphaned by a dead process are claimed once their lease lapses."""
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        for _ in range(workers or settings.JOB_WORKERS):
+            self._workers.append(asyncio.ensure_future(self._work()))
+
+    async def stop(self) -> None:
+        """
+        Let workers finish their current job, then cancel any still busy
+        after JOB_SHUTDOWN_TIMEOUT and hand their jobs back to the queue.
+        """
+        workers, self._workers = self._workers, []
+        self._stopping = True
+        self._wakeup.set()
+        if not workers:
+            return
+        _, busy = await asyncio.wait(workers, timeout=settings.JOB_SHUTDOWN_TIMEOUT)
+        for task in busy:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        if busy:
+            async with async_session() as session:
+                await session.execute(
+                    update(Audit)
+                    .where(Audit.claimed_by == self.worker_id, Audit.status == "running")
+                    .values(status="pending", started_at=None, claimed_by=None, lease_expires_at=None)
+                )
+                await session.commit()
+
+    async def submit(self, engine: str, parameters: Dict[str, Any], user_id: Optional[int] = None) -> Audit:
+        """Persist a pending job and wake a worker."""
+        if engine not in self._runners:
+            raise ValueError(f"Unknown audit engine: {engine}")
+        job = Audit(
+            user_id=user_id,
+            brand_name=parameters.get("brand_name"),
+            industry=parameters.get("industry"),
+            status="pending",
+            parameters={**parameters, "engine": engine},
+        )
+        async with async_session() as session:
+            session.add(job)
+            await session.commit()
+        self.counters["submitted"] += 1
+        self._wakeup.set()
+        return job
+
+    async def get(self, job_id: int) -> Optional[Audit]:
+        async with async_session() as session:
+            return await session.get(Audit, job_id)
+
+    async def _claim(self) -> Optional[Audit]:
+        """Atomically take the oldest pending job, or a running one whose lease has lapsed."""
+        now = datetime.utcnow()
+        claimable = or_(
+            Audit.status == "pending",
+            # Rows without a lease were left running before leases existed
+            (Audit.status == "running") & or_(Audit.lease_expires_at == None, Audit.lease_expires_at < now),  # noqa: E711
+        )
+        oldest = (
+            select(Audit.id)
+            .where(claimable)
+            .order_by(Audit.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        async with async_session() as session:
+            row = (await session.execute(
+                update(Audit)
+                .where(Audit.id == oldest, claimable)
+                .values(
+                    status="running",
+                    started_at=now,
+                    claimed_by=self.worker_id,
+                    lease_expires_at=self._lease_until(),
+                )
+                .returning(Audit.id, Audit.parameters)
+            )).first()
+            await session.commit()
+        if row is None:
+            return None
+        return Audit(id=row.id, parameters=row.parameters)
+
+    async def _finish(self, job_id: int, values: Dict[str, Any]) -> None:
+        # A worker that lost its lease leaves the row to the worker that took it over
+        async with async_session() as session:
+            await session.execute(
+                update(Audit)
+                .where(Audit.id == job_id, Audit.claimed_by == self.worker_id)
+                .values(**values, lease_expires_at=None)
+            )
+            await session.commit()
+
+    async def _renew_lease(self, job_id: int) -> None:
+        """Push the job's lease forward every third of JOB_LEASE_SECONDS while it runs."""
+        while True:
+            await asyncio.sleep(settings.JOB_LEASE_SECONDS / 3)
+            try:
+                async with async_session() as session:
+                    await session.execute(
+                        update(Audit)
+                        .where(Audit.id == job_id, Audit.claimed_by == self.worker_id)
+                        .values(lease_expires_at=self._lease_until())
+                    )
+                    await session.commit()
+            except Exception as e:
+                print(f"[JOBS] Lease renewal failed for job {job_id}: {e}")
+
+    async def _run(self, job: Audit) -> None:
+        started = time.perf_counter()
+        parameters = dict(job.parameters or {})
+        renewer = asyncio.ensure_future(self._renew_lease(job.id))
+        try:
+            runner = self._runners[parameters.pop("engine", "scout")]
+            result = await runner(parameters)
+        except Exception as e:
+            error: Optional[Exception] = e
+        else:
+            error = None
+        finally:
+            renewer.cancel()
+
+        if error is not None:
+            await self._finish(job.id, {
+                "status": "failed",
+                "error": str(error),
+                "completed_at": datetime.utcnow(),
+                "duration_seconds": time.perf_counter() - started,
+            })
+            self.counters["failed"] += 1
+            return
+
+        result["id"] = job.id
+        await self._finish(job.id, {
+            **{field: result[field] for field in SUMMARY_FIELDS if field in result},
+            "status": "completed",
+            "result": result,
+            "completed_at": datetime.utcnow(),
+            "duration_seconds": time.perf_counter() - started,
+        })
+        self.counters["completed"] += 1
+
+    async def _work(self) -> None:
+        while not self._stopping:
+            try:
+                job = await self._claim()
+            except Exception as e:
+                print(f"[JOBS] Claim failed: {e}")
+                await asyncio.sleep(settings.JOB_POLL_INTERVAL)
+                continue
+            if job is not None:
+                try:
+                    await self._run(job)
+                except Exception as e:
+                    # Left running under a lease nobody renews, so it is claimed again once that lapses
+                    print(f"[JOBS] Job {job.id} could not be finished: {e}")
+                continue
+            if self._stopping:
+                return
+            # Idle: wait for a submit in this process, or poll for other writers
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.JOB_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "workers": sum(not task.done() for task in self._workers)}
+
+
+# Singleton instance
+audit_jobs = AuditJobQueue()
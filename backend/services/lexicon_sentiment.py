@@ -0,0 +1,311 @@
+"""
+Lexicon Sentiment - Vectorized polarity scoring with NumPy.
+Compiles TextBlob's polarity lexicon and SentimentAgent's indicator words
+into per-token arrays and scores a whole batch of texts at once, applying
+the same modifier, negation and exclamation rules as TextBlob.
+"""
+import importlib.util
+import os
+import re
+import xml.etree.ElementTree as ElementTree
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Polarity given to indicator words the lexicon does not know
+INDICATOR_POLARITY = 0.5
+
+NEGATIONS = ("no", "not", "n't", "never")
+
+# Token ids below FIRST_WORD_ID are classes of words outside the vocabulary
+BOUNDARY, SHORT, MEDIUM, LONG, EXCLAMATION = range(5)
+FIRST_WORD_ID = 5
+
+# Marks the start of each text in a batch; never part of a token
+SEPARATOR = "\x00"
+
+# Out-of-vocabulary tokens remembered per scorer before the cache is reset
+MAX_CACHED_TOKENS = 200_000
+
+# A word starts and ends with a non-punctuation character and may carry one
+# trailing period, which _TokenIds keeps only for abbreviations; quotes split
+_PUNCTUATION = re.escape(".,;:!?()[]{}`@#$^&*+-|=~_")
+_QUOTES = "'\"‘’“”"
+_WORD_CHAR = rf"[^\s{_QUOTES}{_PUNCTUATION}]"
+TOKEN_PATTERN = re.compile(rf"{_WORD_CHAR}(?:[^\s{_QUOTES}]*{_WORD_CHAR})?(?:\.(?!\.))?|!|\.\.\.")
+ABBREVIATION_PATTERN = re.compile(
+    r"(?:[a-z]\.)+|[bcdfghj-np-tv-z]+\."
+    r"|(?:adj|adv|al|comp|conf|def|ed|esp|etc|ex|fig|gen|id|int|orig|pred|pres|ref)\."
+)
+
+
+def textblob_lexicon_path() -> Optional[str]:
+    """Location of TextBlob's en-sentiment.xml, found without importing TextBlob."""
+    spec = importlib.util.find_spec("textblob")
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    path = os.path.join(list(spec.submodule_search_locations)[0], "en", "en-sentiment.xml")
+    return path if os.path.exists(path) else None
+
+
+def load_lexicon(path: str) -> Dict[str, Dict]:
+    """
+    Read the lexicon as TextBlob does: every sense of a word is averaged
+    per part of speech, then across parts of speech, and each adjective
+    lends its scores to an "-ly" adverb.
+
+    Returns {word: {"polarity", "intensity", "modifier"}}.
+    """
+    senses: Dict[str, Dict[Optional[str], List]] = {}
+    for node in ElementTree.parse(path).getroot().iter("word"):
+        form = node.get("form")
+        if form:
+            senses.setdefault(form, {}).setdefault(node.get("pos"), []).append(
+                (float(node.get("polarity", 0.0)), float(node.get("intensity", 1.0)))
+            )
+
+    words: Dict[str, Dict[Optional[str], tuple]] = {}
+    for form, by_pos in senses.items():
+        words[form] = {pos: tuple(np.mean(scores, axis=0)) for pos, scores in by_pos.items()}
+        words[form][None] = tuple(np.mean(list(words[form].values()), axis=0))
+
+    for form, by_pos in list(words.items()):
+        if "JJ" in by_pos:
+            stem = form[:-1] + "i" if form.endswith("y") else form
+            stem = stem[:-2] if stem.endswith("le") else stem
+            adverb = words.setdefault(stem + "ly", {})
+            adverb["RB"] = adverb[None] = by_pos["JJ"]
+
+    return {
+        form: {"polarity": by_pos[None][0], "intensity": by_pos[None][1], "modifier": "RB" in by_pos}
+        for form, by_pos in words.items()
+        if " " not in form
+    }
+
+
+class _TokenIds(dict):
+    """Token -> id map that assigns out-of-vocabulary tokens their length class."""
+
+    def __missing__(self, token: str) -> int:
+        if token.endswith(".") and len(token) > 1 and not ABBREVIATION_PATTERN.fullmatch(token):
+            # A sentence-final period; on its own it would not affect the score
+            token_id = self[token[:-1]]
+        else:
+            token_id = min(len(token), LONG)
+        self[token] = token_id
+        return token_id
+
+
+class LexiconSentiment:
+    """
+    Batch polarity scorer over a compiled lexicon.
+
+    Each known word has an id indexing the `polarity`, `intensity`,
+    `known` and `modifier` arrays; other tokens get one of the reserved
+    class ids, which encode how TextBlob lets them interrupt a pending
+    modifier or negation. A batch becomes one id array and every rule is
+    an array operation over it.
+    """
+
+    def __init__(self, path: Optional[str] = None, indicators: bool = True):
+        """Compile the lexicon at `path` (TextBlob's by default)."""
+        path = path or textblob_lexicon_path()
+        if path is None:
+            raise RuntimeError("TextBlob's sentiment lexicon was not found; install textblob")
+        lexicon = load_lexicon(path)
+
+        phrases: List[str] = []
+        if indicators:
+            from agents.sentiment_agent import SentimentAgent
+
+            for words, polarity in (
+                (SentimentAgent.POSITIVE_INDICATORS, INDICATOR_POLARITY),
+                (SentimentAgent.NEGATIVE_INDICATORS, -INDICATOR_POLARITY),
+                (SentimentAgent.NEUTRAL_INDICATORS, 0.0),
+            ):
+                for word in words:
+                    if " " in word:
+                        phrases.append(word)
+                        word = word.replace(" ", "_")
+                    lexicon.setdefault(word, {"polarity": polarity, "intensity": 1.0, "modifier": False})
+        # Multi-word indicators are joined into one token before tokenizing
+        self._phrase_list = phrases
+        self._phrases = re.compile(
+            "|".join(rf"\b{re.escape(p)}\b" for p in sorted(phrases, key=len, reverse=True))
+        ) if phrases else None
+
+        self.vocab: Dict[str, int] = {SEPARATOR: BOUNDARY, "!": EXCLAMATION, "...": LONG}
+        words = list(lexicon) + [word for word in NEGATIONS if word not in lexicon]
+        size = FIRST_WORD_ID + len(words)
+        self.polarity = np.zeros(size)
+        self.intensity = np.ones(size)
+        self.known = np.zeros(size, dtype=bool)
+        self.modifier = np.zeros(size, dtype=bool)
+        self.negation = np.zeros(size, dtype=bool)
+        self.long = np.zeros(size, dtype=bool)
+        self.long[LONG] = True
+        for word_id, word in enumerate(words, start=FIRST_WORD_ID):
+            self.vocab[word] = word_id
+            self.negation[word_id] = word in NEGATIONS
+            self.long[word_id] = len(word) > 2
+            if word in lexicon:
+                self.polarity[word_id] = lexicon[word]["polarity"]
+                self.intensity[word_id] = lexicon[word]["intensity"]
+                self.known[word_id] = True
+                self.modifier[word_id] = lexicon[word]["modifier"]
+        # Only an "-ly" adverb takes up a negation that follows it ("really not good")
+        self.ly_modifier = self.modifier & np.array(
+            [False] * FIRST_WORD_ID + [word.endswith("ly") for word in words]
+        )
+
+        # Unknown words end a pending modifier when longer than two letters
+        # ("really is a good") and a pending negation when longer than one
+        # ("not a good")
+        self.clears_modifier = self.known | self.long
+        self.clears_modifier[BOUNDARY] = True
+        self.clears_negation = self.known | self.long
+        self.clears_negation[[BOUNDARY, MEDIUM]] = True
+        self._ids = _TokenIds(self.vocab)
+
+    def _prepare(self, text_lower: str) -> str:
+        """Split off "n't" and join multi-word indicators into single tokens."""
+        text = text_lower.replace("n't", " n't")
+        if self._phrases is not None and any(phrase in text for phrase in self._phrase_list):
+            text = self._phrases.sub(lambda m: m.group(0).replace(" ", "_"), text)
+        return text
+
+    def tokenize(self, text: str) -> List[str]:
+        """Lowercased tokens, split as TextBlob's tokenizer splits them."""
+        return TOKEN_PATTERN.findall(self._prepare(text.lower()))
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Token ids of all texts, each text opened by a BOUNDARY token."""
+        tokens = self.tokenize(" ".join(f"{SEPARATOR} {text.replace(SEPARATOR, ' ')}" for text in texts))
+        if len(self._ids) > MAX_CACHED_TOKENS:
+            self._ids = _TokenIds(self.vocab)
+        return np.fromiter(map(self._ids.__getitem__, tokens), dtype=np.int64, count=len(tokens))
+
+    def polarities(self, texts: List[str]) -> np.ndarray:
+        """Polarity (-1..1) of each text; 0.0 when it has no known words."""
+        if not texts:
+            return np.zeros(0)
+        ids = self._encode(texts)
+        doc = np.cumsum(ids == BOUNDARY) - 1
+        at, values = self._assess(ids)
+        counts = np.bincount(doc[at], minlength=len(texts))
+        sums = np.bincount(doc[at], weights=values, minlength=len(texts))
+        return np.divide(sums, counts, out=np.zeros(len(texts)), where=counts > 0)
+
+    def assessments(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Offsets into text.lower() and polarities of the assessments in one
+        text, in order; an assessment sits at the word that completed it.
+        """
+        text_lower = text.lower()
+        prepared = self._prepare(text_lower)
+        matches = list(TOKEN_PATTERN.finditer(prepared))
+        ids = np.fromiter(
+            (self._ids[m.group()] for m in matches), dtype=np.int64, count=len(matches)
+        )
+        at, values = self._assess(np.concatenate(([BOUNDARY], ids)))
+        starts = np.fromiter((m.start() for m in matches), dtype=np.int64, count=len(matches))[at - 1]
+
+        # Undo the space _prepare inserted before each "n't"
+        spaces = [i + k for k, i in enumerate(m.start() for m in re.finditer("n't", text_lower))]
+        offsets = starts - np.searchsorted(np.array(spaces, dtype=np.int64), starts, side="right")
+        return offsets, values
+
+    def window_polarities(
+        self,
+        text: str,
+        span_groups: Sequence[Sequence[Tuple[int, int]]],
+        window: int,
+    ) -> List[float]:
+        """
+        Polarity near each group of (start, end) spans of text.lower():
+        the mean of the assessments within `window` characters of any of
+        the group's spans, from prefix sums over one scoring of the text.
+        """
+        offsets, values = self.assessments(text)
+        sums = np.concatenate(([0.0], np.cumsum(values)))
+        polarities = []
+        for spans in span_groups:
+            # Merge overlapping windows so an assessment near two mentions counts once
+            merged: List[List[int]] = []
+            for start, end in sorted(spans):
+                if merged and start - window <= merged[-1][1]:
+                    merged[-1][1] = max(merged[-1][1], end + window)
+                else:
+                    merged.append([start - window, end + window])
+            lo = np.searchsorted(offsets, [start for start, _ in merged], side="left")
+            hi = np.searchsorted(offsets, [end for _, end in merged], side="left")
+            count = int((hi - lo).sum())
+            polarities.append(float((sums[hi] - sums[lo]).sum() / count) if count else 0.0)
+        return polarities
+
+    def _assess(self, ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Positions (last word) and final polarities of the assessments in an id array."""
+        positions = np.arange(len(ids))
+        known = self.known[ids]
+
+        def previous(events: np.ndarray) -> np.ndarray:
+            # Index of the last event strictly before each token (every text opens with one)
+            last = np.maximum.accumulate(np.where(events, positions, 0))
+            return np.concatenate(([0], last[:-1]))
+
+        # A known adverb modifies the next known word unless a longer
+        # unknown word intervenes; a negation only keeps an "-ly" adverb
+        negation_word = self.negation[ids] & ~known
+        events = self.clears_modifier[ids] & ~negation_word
+        modifier_at = previous(events)
+        ly_modified = self.ly_modifier[ids[modifier_at]]
+        events |= negation_word & self.long[ids] & ~ly_modified
+        modifier_at = previous(events)
+        modified = self.modifier[ids[modifier_at]]
+
+        # A negation word negates the next known word, or the "-ly" adverb it follows
+        consumed = negation_word & self.ly_modifier[ids[modifier_at]]
+        negation_at = previous(self.clears_negation[ids] | negation_word)
+        negated = negation_word[negation_at] & ~consumed[negation_at] & known
+
+        # A modified word merges into its modifier's assessment: follow the chain to its head
+        merged = known & modified
+        head = np.where(merged, modifier_at, positions)
+        while True:
+            step = head[head]
+            if np.array_equal(step, head):
+                break
+            head = step
+
+        # Negating an assessment inverts its intensity for the word it modifies next
+        intensity = np.where(negated, 1.0 / self.intensity[ids], self.intensity[ids])
+        value = np.where(merged, np.clip(self.polarity[ids] * intensity[modifier_at], -1.0, 1.0), self.polarity[ids])
+
+        flipped = np.zeros(len(ids), dtype=bool)
+        flipped[head[known & negated]] = True
+        flipped[head[modifier_at[consumed]]] = True
+
+        # The last word of each chain carries the assessment's final value
+        superseded = np.zeros(len(ids), dtype=bool)
+        superseded[modifier_at[merged]] = True
+        tails = known & ~superseded
+
+        # "!" boosts the assessment just before it
+        boosts = np.zeros(len(ids))
+        exclaimed = previous(known | (ids == BOUNDARY))[ids == EXCLAMATION]
+        np.add.at(boosts, exclaimed[known[exclaimed]], 1.0)
+        value = np.clip(value * 1.25 ** boosts, -1.0, 1.0)
+
+        value = np.where(flipped[head], value * -0.5, value)
+        return positions[tails], value[tails]
+
+
+_scorer: Optional[LexiconSentiment] = None
+
+
+def get_lexicon_sentiment() -> LexiconSentiment:
+    """The process-wide scorer, compiled on first use."""
+    global _scorer
+    if _scorer is None:
+        _scorer = LexiconSentiment()
+    return _scorer
@@ -0,0 +1,173 @@
+"""
+Password Hasher - Memory-hard password hashing off the event loop.
+Passwords are hashed with Argon2id (or scrypt) on a small thread pool,
+so a burst of logins queues for the pool instead of stalling every
+other request. Legacy salted SHA-256 hashes still verify and are
+replaced on the user's next successful login.
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+try:
+    from argon2 import PasswordHasher as Argon2Hasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+    ARGON2_AVAILABLE = True
+except ImportError:
+    Argon2Hasher = None
+    ARGON2_AVAILABLE = False
+
+from config import settings
+
+
+SCHEMES = ("argon2", "scrypt")
+
+# hex(sha256(password + SECRET_KEY)), written before KDF hashing
+LEGACY_HASH = re.compile(r"^[0-9a-f]{64}$")
+
+# $scrypt$ln=<log2 N>,r=<r>,p=<p>$<salt>$<key>, unpadded base64
+SCRYPT_HASH = re.compile(r"^\$scrypt\$ln=(\d+),r=(\d+),p=(\d+)\$([A-Za-z0-9+/]+)\$([A-Za-z0-9+/]+)$")
+SCRYPT_SALT_BYTES = 16
+SCRYPT_KEY_BYTES = 32
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.b64encode(raw).decode().rstrip("=")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _scrypt(password: str, salt: bytes, log_n: int, r: int, p: int) -> bytes:
+    # Each hash needs 128 * N * r bytes; hashlib refuses more than maxmem
+    n = 1 << log_n
+    return hashlib.scrypt(
+        password.encode(), salt=salt, n=n, r=r, p=p,
+        maxmem=128 * n * r * (p + 1), dklen=SCRYPT_KEY_BYTES,
+    )
+
+
+def configured_scheme() -> str:
+    """PASSWORD_HASH_SCHEME, falling back to scrypt when argon2-cffi is missing."""
+    if settings.PASSWORD_HASH_SCHEME not in SCHEMES:
+        raise ValueError(f"Unknown PASSWORD_HASH_SCHEME: {settings.PASSWORD_HASH_SCHEME!r}")
+    if settings.PASSWORD_HASH_SCHEME == "argon2" and not ARGON2_AVAILABLE:
+        return "scrypt"
+    return settings.PASSWORD_HASH_SCHEME
+
+
+class PasswordHasher:
+    """
+    Hashes and verifies passwords on a ThreadPoolExecutor.
+
+    Both KDFs release the GIL, so PASSWORD_HASH_WORKERS hashes run in
+    parallel while the event loop keeps serving. The pool size also caps
+    the memory held by hashes in flight: each one needs its full memory
+    cost until it finishes.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """Create a hasher; the pool's threads start on first use."""
+        self.max_workers = max_workers or settings.PASSWORD_HASH_WORKERS
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._argon2 = None
+        self.counters = {"hashed": 0, "verified": 0, "rejected": 0, "rehashed": 0}
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        return self._pool
+
+    @property
+    def argon2(self):
+        if self._argon2 is None:
+            self._argon2 = Argon2Hasher(
+                time_cost=settings.ARGON2_TIME_COST,
+                memory_cost=settings.ARGON2_MEMORY_COST,
+                parallelism=settings.ARGON2_PARALLELISM,
+            )
+        return self._argon2
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    # Synchronous primitives (run on the pool)
+
+    def hash_sync(self, password: str) -> str:
+        if configured_scheme() == "argon2":
+            return self.argon2.hash(password)
+        salt = os.urandom(SCRYPT_SALT_BYTES)
+        log_n, r, p = settings.SCRYPT_LOG_N, settings.SCRYPT_R, settings.SCRYPT_P
+        key = _scrypt(password, salt, log_n, r, p)
+        return f"$scrypt$ln={log_n},r={r},p={p}${_b64encode(salt)}${_b64encode(key)}"
+
+    def verify_sync(self, password: str, stored: str) -> bool:
+        """Whether a password matches a hash in any supported format."""
+        if stored.startswith("$argon2"):
+            if not ARGON2_AVAILABLE:
+                return False
+            try:
+                return self.argon2.verify(stored, password)
+            except (VerificationError, InvalidHashError):
+                return False
+        match = SCRYPT_HASH.match(stored)
+        if match:
+            log_n, r, p = (int(group) for group in match.groups()[:3])
+            key = _scrypt(password, _b64decode(match.group(4)), log_n, r, p)
+            return hmac.compare_digest(key, _b64decode(match.group(5)))
+        if LEGACY_HASH.match(stored):
+            legacy = hashlib.sha256((password + settings.SECRET_KEY).encode()).hexdigest()
+            return hmac.compare_digest(legacy, stored)
+        return False
+
+    def needs_rehash(self, stored: str) -> bool:
+        """Whether a hash is not in the configured scheme with the configured cost."""
+        if configured_scheme() == "argon2":
+            return not stored.startswith("$argon2") or self.argon2.check_needs_rehash(stored)
+        match = SCRYPT_HASH.match(stored)
+        return not match or tuple(int(group) for group in match.groups()[:3]) != (
+            settings.SCRYPT_LOG_N, settings.SCRYPT_R, settings.SCRYPT_P,
+        )
+
+    def _verify_and_update(self, password: str, stored: str) -> Tuple[bool, Optional[str]]:
+        if not self.verify_sync(password, stored):
+            return False, None
+        # The plaintext is only at hand on a successful login, so upgrade now
+        return True, self.hash_sync(password) if self.needs_rehash(stored) else None
+
+    # Async API
+
+    async def hash(self, password: str) -> str:
+        loop = asyncio.get_running_loop()
+        hashed = await loop.run_in_executor(self.pool, self.hash_sync, password)
+        self.counters["hashed"] += 1
+        return hashed
+
+    async def verify(self, password: str, stored: str) -> Tuple[bool, Optional[str]]:
+        """
+        Check a password against a stored hash. Returns (matches,
+        replacement): replacement is a fresh hash to store when the old
+        one is legacy SHA-256 or uses an outdated scheme or cost.
+        """
+        loop = asyncio.get_running_loop()
+        ok, replacement = await loop.run_in_executor(self.pool, self._verify_and_update, password, stored)
+        self.counters["verified" if ok else "rejected"] += 1
+        if replacement is not None:
+            self.counters["rehashed"] += 1
+        return ok, replacement
+
+    def stats(self) -> Dict:
+        return {**self.counters, "scheme": configured_scheme(), "workers": self.max_workers}
+
+
+# Singleton instance
+password_hasher = PasswordHasher()
@@ -0,0 +1,219 @@
+"""
+Provider Rate Limiter - Token-bucket quotas, bounded concurrency and
+Retry-After aware exponential backoff for AI platform calls.
+Keeps throughput at each provider's quota ceiling instead of tripping it.
+"""
+import asyncio
+import math
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from config import settings, ProviderLimits
+
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Async token bucket refilled continuously at `per_minute` tokens/minute.
+    A rate of 0 disables the bucket.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Wait until `amount` tokens are available; returns seconds waited."""
+        if not self.enabled:
+            return 0.0
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        # The lock makes waiters queue FIFO instead of racing for refills
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def adjust(self, amount: float) -> None:
+        """Debit (positive) or credit (negative) tokens after the fact."""
+        if self.enabled:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+
+def parse_retry_after(response: Optional[httpx.Response]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if response is None:
+        return None
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        # float() also accepts "inf" and "nan"
+        return max(0.0, seconds) if math.isfinite(seconds) else None
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        # A "-0000" zone parses as naive; HTTP-dates are always UTC
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def is_retryable(error: Exception) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS
+    return isinstance(error, (httpx.TimeoutException, httpx.TransportError))
+
+
+class ProviderGovernor:
+    """
+    Admission control for one provider: RPM and TPM buckets, a concurrency
+    semaphore, and retries with full-jitter exponential backoff. A 429 with
+    Retry-After pauses every caller for that provider, not just the one
+    that was throttled.
+    """
+
+    def __init__(self, name: str, limits: ProviderLimits):
+        self.name = name
+        self.limits = limits
+        self.requests = TokenBucket(limits.rpm)
+        self.tokens = TokenBucket(limits.tpm)
+        self.semaphore = asyncio.Semaphore(max(1, limits.max_concurrency))
+        self._paused_until = 0.0
+        self.in_flight = 0
+        self.counters = {
+            "requests": 0,
+            "retries": 0,
+            "throttled": 0,
+            "timeouts": 0,
+            "failures": 0,
+            "wait_seconds": 0.0,
+        }
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Full-jitter exponential backoff, floored at the server's Retry-After."""
+        ceiling = min(self.limits.backoff_max, self.limits.backoff_base * (2 ** attempt))
+        delay = random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = min(self.limits.backoff_max, retry_after) + random.uniform(0, self.limits.backoff_base)
+        return delay
+
+    async def _wait_if_paused(self) -> None:
+        delay = self._paused_until - time.monotonic()
+        if delay > 0:
+            self.counters["wait_seconds"] += delay
+            await asyncio.sleep(delay)
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        estimated_tokens: int = 0,
+        tokens_used: Optional[Callable[[Any], Optional[int]]] = None,
+    ) -> Any:
+        """
+        Run fn() under this provider's quotas, retrying transient failures.
+        Raises the last error once retries are exhausted.
+        """
+        attempt = 0
+        while True:
+            await self._wait_if_paused()
+            self.counters["wait_seconds"] += await self.requests.acquire(1)
+            self.counters["wait_seconds"] += await self.tokens.acquire(estimated_tokens)
+            async with self.semaphore:
+                self.in_flight += 1
+                self.counters["requests"] += 1
+                try:
+                    result = await fn()
+                except Exception as e:
+                    error = e
+                else:
+                    error = None
+                finally:
+                    self.in_flight -= 1
+
+            if error is None:
+                used = tokens_used(result) if tokens_used else None
+                if used is not None:
+                    self.tokens.adjust(used - estimated_tokens)
+                return result
+
+            # The request never produced output; hand back the reserved tokens
+            self.tokens.adjust(-estimated_tokens)
+            if isinstance(error, httpx.TimeoutException):
+                self.counters["timeouts"] += 1
+            retry_after = None
+            if isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 429:
+                self.counters["throttled"] += 1
+                retry_after = parse_retry_after(error.response)
+            if not is_retryable(error) or attempt >= self.limits.max_retries:
+                self.counters["failures"] += 1
+                raise error
+
+            delay = self.backoff_delay(attempt, retry_after)
+            if retry_after is not None:
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            self.counters["retries"] += 1
+            self.counters["wait_seconds"] += delay
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "wait_seconds": round(self.counters["wait_seconds"], 3),
+            "in_flight": self.in_flight,
+            "rpm": self.limits.rpm,
+            "tpm": self.limits.tpm,
+            "max_concurrency": self.limits.max_concurrency,
+        }
+
+
+class ProviderGovernors:
+    """Lazily created governor per provider, configured from settings."""
+
+    def __init__(self):
+        self._governors: Dict[str, ProviderGovernor] = {}
+
+    def get(self, name: str) -> ProviderGovernor:
+        governor = self._governors.get(name)
+        if governor is None:
+            limits = settings.PROVIDER_LIMITS.get(name) or ProviderLimits()
+            governor = self._governors[name] = ProviderGovernor(name, limits)
+        return governor
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: g.stats() for name, g in self._governors.items()}
+
+
+# Singleton instance
+provider_governors = ProviderGovernors()
@@ -0,0 +1,256 @@
+"""
+Response Cache - TTL cache for AI platform answers.
+Keyed by (platform, model, normalized prompt) with an in-process LRU tier
+backed by a SQLite tier, per-platform TTLs and stale-while-revalidate.
+"""
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from config import settings
+
+
+@dataclass
+class CacheEntry:
+    """Cached value with its freshness window."""
+    value: Any
+    stored_at: float
+    ttl: float
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.stored_at + self.ttl
+
+    def is_servable(self, now: float, stale_seconds: float) -> bool:
+        return now < self.stored_at + self.ttl + stale_seconds
+
+
+class LRUCache:
+    """
+    Bounded in-process LRU map. Locked, since some users (the analysis
+    cache) are called from executor threads as well as the event loop.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteStore:
+    """
+    Thread-safe key/value table in a SQLite file.
+    Calls are blocking; async callers should run them in a thread.
+    """
+
+    PURGE_EVERY = 1000
+
+    def __init__(self, path: str, table: str = "cache"):
+        self.path = path
+        self.table = table
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "stored_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{self.table}_expires_at ON {self.table} (expires_at)"
+            )
+        return self._conn
+
+    def get(self, key: str) -> Optional[tuple]:
+        """Return (value, stored_at, expires_at) or None."""
+        with self._lock:
+            return self._connect().execute(
+                f"SELECT value, stored_at, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+
+    def set(self, key: str, value: str, stored_at: float, expires_at: float) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, stored_at, expires_at) VALUES (?, ?, ?, ?)",
+                (key, value, stored_at, expires_at),
+            )
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                conn.execute(f"DELETE FROM {self.table} WHERE expires_at < ?", (time.time(),))
+            conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Case- and whitespace-insensitive form of a prompt."""
+    return " ".join(prompt.lower().split())
+
+
+class ResponseCache:
+    """
+    Two-tier TTL cache for provider responses.
+
+    Fresh entries are returned directly. Entries past their TTL but inside
+    the stale window are returned immediately while a background refresh
+    re-fetches them (stale-while-revalidate).
+    """
+
+    def __init__(self):
+        self.enabled = settings.RESPONSE_CACHE_ENABLED
+        self.stale_seconds = settings.RESPONSE_CACHE_STALE_SECONDS
+        self.memory = LRUCache(settings.RESPONSE_CACHE_MAX_ENTRIES)
+        self.disk = SQLiteStore(settings.RESPONSE_CACHE_PATH, "response_cache") if settings.RESPONSE_CACHE_PATH else None
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self.counters = {
+            "hits": 0,
+            "misses": 0,
+            "stale_hits": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "stores": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+        }
+
+    @staticmethod
+    def make_key(platform: str, model: str, prompt: str) -> str:
+        raw = f"{platform}\x1f{model}\x1f{normalize_prompt(prompt)}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def ttl_for(self, platform: str) -> float:
+        ttls = settings.RESPONSE_CACHE_TTLS
+        return float(ttls.get(platform, ttls.get("default", 3600)))
+
+    async def _lookup(self, key: str) -> Optional[CacheEntry]:
+        entry = self.memory.get(key)
+        if entry is not None:
+            self.counters["memory_hits"] += 1
+            return entry
+        if self.disk is None:
+            return None
+        row = await asyncio.to_thread(self.disk.get, key)
+        if row is None:
+            return None
+        value, stored_at, expires_at = row
+        entry = CacheEntry(json.loads(value), stored_at, expires_at - stored_at)
+        self.memory.set(key, entry)
+        self.counters["disk_hits"] += 1
+        return entry
+
+    async def _store(self, key: str, platform: str, value: Dict) -> None:
+        entry = CacheEntry(value, time.time(), self.ttl_for(platform))
+        self.memory.set(key, entry)
+        self.counters["stores"] += 1
+        if self.disk is not None:
+            await asyncio.to_thread(
+                self.disk.set, key, json.dumps(value), entry.stored_at,
+                entry.stored_at + entry.ttl + self.stale_seconds,
+            )
+
+    def _schedule_refresh(self, key: str, platform: str, fetch: Callable[[], Awaitable[Dict]]) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+
+        async def refresh() -> None:
+            try:
+                await self._store(key, platform, await fetch())
+                self.counters["refreshes"] += 1
+            except Exception:
+                self.counters["refresh_errors"] += 1
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.ensure_future(refresh())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def get_or_fetch(
+        self,
+        platform: str,
+        model: str,
+        prompt: str,
+        fetch: Callable[[], Awaitable[Dict]],
+    ) -> Dict:
+        """
+        Return a cached response or call fetch() and cache its result.
+        Exceptions from fetch() propagate and nothing is cached.
+        """
+        if not self.enabled:
+            return await fetch()
+
+        key = self.make_key(platform, model, prompt)
+        entry = await self._lookup(key)
+        now = time.time()
+        if entry is not None and entry.is_fresh(now):
+            self.counters["hits"] += 1
+            return {**entry.value, "cached": True}
+        if entry is not None and entry.is_servable(now, self.stale_seconds):
+            self.counters["stale_hits"] += 1
+            self._schedule_refresh(key, platform, fetch)
+            return {**entry.value, "cached": True, "stale": True}
+
+        self.counters["misses"] += 1
+        value = await fetch()
+        await self._store(key, platform, value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        served = self.counters["hits"] + self.counters["stale_hits"]
+        lookups = served + self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_rate": round(served / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "disk_enabled": self.disk is not None,
+        }
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
+
+
+# Singleton instance
+response_cache = ResponseCache()
@@ -9,6 +9,9 @@ from typing import Dict, List, Optional
 class SchemaGenerator:
     """Generates JSON-LD schemas for GEO (Generative Engine Optimization)."""
     
+    # Bump when generated output changes so clients drop cached schemas (ETags)
+    VERSION = 1
+    
     def generate_organization_schema(
         self,
         name: str,
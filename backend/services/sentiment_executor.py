@@ -0,0 +1,137 @@
+"""
+Sentiment Executor - Scores text sentiment off the event loop.
+TextBlob scoring is pure CPU work; running it in worker processes keeps
+it off the event loop and lets large batches use every core. The
+vectorized lexicon backend scores a whole batch in one thread call.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from textblob import TextBlob
+
+from config import settings
+from services.lexicon_sentiment import get_lexicon_sentiment
+
+
+Score = Tuple[str, float]
+
+# Polarity beyond +/- this is positive/negative, otherwise neutral
+POLARITY_THRESHOLD = 0.1
+
+
+def classify_polarity(polarity: float) -> Score:
+    """Map a -1..1 polarity to (label, polarity)."""
+    if polarity > POLARITY_THRESHOLD:
+        return "positive", polarity
+    if polarity < -POLARITY_THRESHOLD:
+        return "negative", polarity
+    return "neutral", polarity
+
+
+def lexicon_backend() -> bool:
+    """Whether SENTIMENT_BACKEND selects the vectorized lexicon scorer."""
+    if settings.SENTIMENT_BACKEND not in ("textblob", "lexicon"):
+        raise ValueError(f"Unknown SENTIMENT_BACKEND: {settings.SENTIMENT_BACKEND!r}")
+    return settings.SENTIMENT_BACKEND == "lexicon"
+
+
+def score_sentiment(text: str) -> Score:
+    """Sentiment of one text with the configured backend."""
+    if not text:
+        return "neutral", 0.0
+    if lexicon_backend():
+        return score_batch([text])[0]
+    return classify_polarity(TextBlob(text).sentiment.polarity)
+
+
+def score_batch(texts: List[str]) -> List[Score]:
+    """Score a chunk of texts (runs inside a worker process for TextBlob)."""
+    if lexicon_backend():
+        return [classify_polarity(polarity) for polarity in get_lexicon_sentiment().polarities(texts).tolist()]
+    return [score_sentiment(text) for text in texts]
+
+
+def _warm_up() -> None:
+    # First TextBlob use loads the pattern lexicon; pay it before traffic
+    score_sentiment("warm up")
+
+
+class SentimentExecutor:
+    """
+    Batch sentiment scoring on a ProcessPoolExecutor.
+
+    A batch is de-duplicated, split into chunks of SENTIMENT_BATCH_SIZE
+    texts and the chunks are scored in parallel. Workers are spawned
+    rather than forked because the server process runs threads. With the
+    lexicon backend there is no pool: the batch is one vectorized call.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """Create an executor; worker processes start on first use."""
+        self.max_workers = max_workers or settings.SENTIMENT_WORKERS or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.counters = {"batches": 0, "texts": 0, "unique_texts": 0, "chunks": 0}
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def _use_pool(self) -> bool:
+        return settings.SENTIMENT_PROCESS_POOL and not lexicon_backend()
+
+    async def startup(self) -> None:
+        """Start the worker processes and load TextBlob in each (or compile the lexicon)."""
+        if lexicon_backend():
+            await asyncio.to_thread(get_lexicon_sentiment)
+            return
+        if not self._use_pool():
+            return
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _warm_up) for _ in range(self.max_workers)))
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def analyze_batch(self, texts: List[str]) -> List[Score]:
+        """Score many texts; results are in input order."""
+        if not texts:
+            return []
+        unique = list(dict.fromkeys(texts))
+        self.counters["batches"] += 1
+        self.counters["texts"] += len(texts)
+        self.counters["unique_texts"] += len(unique)
+
+        if self._use_pool():
+            size = max(1, settings.SENTIMENT_BATCH_SIZE)
+            chunks = [unique[i:i + size] for i in range(0, len(unique), size)]
+            self.counters["chunks"] += len(chunks)
+            loop = asyncio.get_running_loop()
+            results = await asyncio.gather(*(loop.run_in_executor(self.pool, score_batch, chunk) for chunk in chunks))
+            scores = [score for chunk in results for score in chunk]
+        else:
+            scores = await asyncio.to_thread(score_batch, unique)
+
+        by_text: Dict[str, Score] = dict(zip(unique, scores))
+        return [by_text[text] for text in texts]
+
+    def stats(self) -> Dict:
+        return {
+            **self.counters,
+            "backend": settings.SENTIMENT_BACKEND,
+            "workers": self.max_workers,
+            "process_pool": self._use_pool(),
+        }
+
+
+# Singleton instance
+sentiment_executor = SentimentExecutor()
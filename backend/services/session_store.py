@@ -0,0 +1,222 @@
+"""
+Session Store - Bearer token sessions shared across uvicorn workers.
+Sessions live in the sessions table, so any worker can verify a token
+another issued; each worker keeps recently verified tokens in memory
+and expires them (and their per-user index entries) with a timer wheel.
+"""
+import asyncio
+import hashlib
+import secrets
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, List, Optional, Set
+
+from sqlalchemy import delete, insert, select
+
+from config import settings
+from models.database import AuthSession, async_session
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel: deadlines fall into one of `slots` buckets of
+    `resolution` seconds. Scheduling and cancelling are O(1); advancing
+    only visits the buckets whose time has passed. Deadlines more than a
+    revolution ahead stay in their bucket until a later pass.
+    """
+
+    def __init__(self, resolution: float = 1.0, slots: int = 512, now: Optional[float] = None):
+        self.resolution = resolution
+        self._slots: List[Set[Hashable]] = [set() for _ in range(slots)]
+        self._deadlines: Dict[Hashable, float] = {}
+        self._tick = self._tick_of(time.time() if now is None else now)
+
+    def _tick_of(self, moment: float) -> int:
+        return int(moment // self.resolution)
+
+    def _slot(self, deadline: float) -> Set[Hashable]:
+        return self._slots[self._tick_of(deadline) % len(self._slots)]
+
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        self.cancel(key)
+        self._deadlines[key] = deadline
+        self._slot(deadline).add(key)
+
+    def cancel(self, key: Hashable) -> None:
+        deadline = self._deadlines.pop(key, None)
+        if deadline is not None:
+            self._slot(deadline).discard(key)
+
+    def advance(self, now: Optional[float] = None) -> List[Hashable]:
+        """Remove and return every key whose deadline has passed."""
+        now = time.time() if now is None else now
+        target = self._tick_of(now)
+        if target <= self._tick:
+            return []
+        expired = []
+        # The last bucket visited may hold keys due later in its tick; after
+        # a long pause, one pass over every bucket is enough
+        first = max(self._tick, target - len(self._slots) + 1)
+        for tick in range(first, target + 1):
+            bucket = self._slots[tick % len(self._slots)]
+            due = [key for key in bucket if self._deadlines[key] <= now]
+            for key in due:
+                bucket.discard(key)
+                del self._deadlines[key]
+            expired.extend(due)
+        self._tick = target
+        return expired
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+
+@dataclass
+class CachedSession:
+    """A verified session and how long this worker may trust it."""
+    user_id: int
+    expires_at: float
+    valid_until: float  # min(expires_at, verified at + SESSION_CACHE_TTL)
+
+
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class SessionStore:
+    """
+    Issues, verifies and revokes bearer tokens.
+
+    A token check is a dict lookup while its cache entry is fresh and one
+    primary-key read otherwise, so a token revoked by another worker is
+    refused within SESSION_CACHE_TTL. Revoking on this worker takes
+    effect immediately. Tokens are stored as SHA-256 hashes, so a leaked
+    table holds no usable tokens.
+    """
+
+    def __init__(self):
+        self._cache: Dict[str, CachedSession] = {}
+        self._by_user: Dict[int, Set[str]] = {}  # user id -> cached token hashes
+        self._wheel = TimerWheel()
+        self._sweeper: Optional[asyncio.Task] = None
+        self.counters = {"issued": 0, "cache_hits": 0, "db_checks": 0, "rejected": 0, "revoked": 0, "swept": 0}
+
+    def _remember(self, token_hash: str, user_id: int, expires_at: float, now: float) -> None:
+        if token_hash not in self._cache and len(self._cache) >= settings.SESSION_CACHE_MAX_ENTRIES:
+            return
+        entry = CachedSession(user_id, expires_at, min(expires_at, now + settings.SESSION_CACHE_TTL))
+        self._cache[token_hash] = entry
+        self._by_user.setdefault(user_id, set()).add(token_hash)
+        self._wheel.schedule(token_hash, entry.valid_until)
+
+    def _forget(self, token_hash: str) -> None:
+        entry = self._cache.pop(token_hash, None)
+        if entry is None:
+            return
+        self._wheel.cancel(token_hash)
+        tokens = self._by_user.get(entry.user_id)
+        if tokens is not None:
+            tokens.discard(token_hash)
+            if not tokens:
+                del self._by_user[entry.user_id]
+
+    def _expire_cached(self, now: float) -> None:
+        for token_hash in self._wheel.advance(now):
+            self._forget(token_hash)
+
+    async def create(self, user_id: int, ttl_seconds: float) -> str:
+        """Start a session and return its bearer token."""
+        token = secrets.token_urlsafe(32)
+        token_hash = hash_token(token)
+        now = time.time()
+        created_at = datetime.utcnow()
+        async with async_session() as session:
+            await session.execute(insert(AuthSession), [{
+                "token_hash": token_hash,
+                "user_id": user_id,
+                "created_at": created_at,
+                "expires_at": created_at + timedelta(seconds=ttl_seconds),
+            }])
+            await session.commit()
+        self._remember(token_hash, user_id, now + ttl_seconds, now)
+        self.counters["issued"] += 1
+        return token
+
+    async def verify(self, token: str) -> Optional[int]:
+        """User id of a live session, or None for an unknown, expired or revoked token."""
+        now = time.time()
+        self._expire_cached(now)
+        token_hash = hash_token(token)
+        entry = self._cache.get(token_hash)
+        if entry is not None and entry.valid_until > now:
+            self.counters["cache_hits"] += 1
+            return entry.user_id
+
+        self.counters["db_checks"] += 1
+        async with async_session() as session:
+            row = (await session.execute(
+                select(AuthSession.user_id, AuthSession.expires_at).where(AuthSession.token_hash == token_hash)
+            )).one_or_none()
+        if row is None or row.expires_at <= datetime.utcnow():
+            self._forget(token_hash)
+            self.counters["rejected"] += 1
+            return None
+        expires_at = now + (row.expires_at - datetime.utcnow()).total_seconds()
+        self._remember(token_hash, row.user_id, expires_at, now)
+        return row.user_id
+
+    async def revoke(self, token: str) -> int:
+        """End one session; returns 1 if this call deleted it, 0 if it was already gone."""
+        token_hash = hash_token(token)
+        self._forget(token_hash)
+        async with async_session() as session:
+            result = await session.execute(delete(AuthSession).where(AuthSession.token_hash == token_hash))
+            await session.commit()
+        self.counters["revoked"] += result.rowcount
+        return result.rowcount
+
+    async def revoke_user(self, user_id: int) -> int:
+        """End every session of a user; returns how many there were."""
+        for token_hash in list(self._by_user.get(user_id, ())):
+            self._forget(token_hash)
+        async with async_session() as session:
+            result = await session.execute(delete(AuthSession).where(AuthSession.user_id == user_id))
+            await session.commit()
+        self.counters["revoked"] += result.rowcount
+        return result.rowcount
+
+    async def sweep(self) -> int:
+        """Drop expired cache entries and delete expired session rows."""
+        self._expire_cached(time.time())
+        async with async_session() as session:
+            result = await session.execute(delete(AuthSession).where(AuthSession.expires_at <= datetime.utcnow()))
+            await session.commit()
+        self.counters["swept"] += result.rowcount
+        return result.rowcount
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            await asyncio.sleep(settings.SESSION_SWEEP_INTERVAL)
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f"[AUTH] Session sweep failed: {e}")
+
+    async def start(self) -> None:
+        """Sweep expired sessions now and every SESSION_SWEEP_INTERVAL seconds."""
+        await self.sweep()
+        self._sweeper = asyncio.ensure_future(self._sweep_forever())
+
+    async def stop(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+
+    def stats(self) -> Dict:
+        return {**self.counters, "cached": len(self._cache), "cached_users": len(self._by_user)}
+
+
+# Singleton instance
+session_store = SessionStore()
@@ -0,0 +1,57 @@
+"""
+Single Flight - Coalesces identical in-flight async calls.
+Concurrent callers asking for the same key share one outbound request.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls by key.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it is running await the same task. The task is shielded so one
+    caller's cancellation does not fail the others.
+    """
+
+    def __init__(self):
+        """Initialize the in-flight registry and counters."""
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.counters = {
+            "calls": 0,
+            "executions": 0,
+            "coalesced": 0,
+            "errors": 0,
+        }
+
+    def _on_done(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.counters["errors"] += 1
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn() once for all concurrent callers with the same key."""
+        self.counters["calls"] += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_done(key, t))
+            self.counters["executions"] += 1
+        else:
+            self.counters["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self.counters["calls"]
+        return {
+            **self.counters,
+            "in_flight": len(self._inflight),
+            "coalesce_rate": round(self.counters["coalesced"] / calls, 4) if calls else 0.0,
+        }
+
+
+# Singleton instance for provider queries
+provider_flights = SingleFlight()
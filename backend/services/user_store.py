@@ -0,0 +1,182 @@
+"""
+User Store - User accounts in the users table.
+Every lookup is by an indexed column (id, email or api_key), and the
+admin listing is keyset-paginated so any page of any filter costs the
+same however many accounts there are.
+"""
+import base64
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from config import settings
+from models.database import User, async_session
+from services.response_cache import LRUCache
+
+
+# Columns loaded into a user dict
+USER_FIELDS = ("id", "email", "password_hash", "name", "role", "tier", "is_active", "api_key", "created_at")
+USER_COLUMNS = tuple(getattr(User, field) for field in USER_FIELDS)
+
+# Columns update() may change
+UPDATABLE_FIELDS = {"email", "password_hash", "name", "role", "tier", "is_active", "api_key", "last_login_at"}
+
+
+def encode_cursor(order: str, value: Any) -> str:
+    """Opaque cursor for the row a page ended on."""
+    raw = json.dumps([order, value]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order: str) -> Any:
+    """Inverse of encode_cursor; raises ValueError for a malformed cursor or another ordering's."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_order, value = json.loads(raw)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+    if cursor_order != order:
+        raise ValueError("Cursor does not match the search")
+    return value
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+class UserStore:
+    """
+    Loads and saves users as plain dicts.
+
+    get() is called on every authenticated request, so users are cached
+    per worker for USER_CACHE_TTL seconds; changes made on this worker
+    are visible at once, changes made on another within the TTL.
+    """
+
+    def __init__(self):
+        self._cache = LRUCache(settings.USER_CACHE_MAX_ENTRIES)  # id -> (cached until, user)
+        self._api_keys = LRUCache(settings.USER_CACHE_MAX_ENTRIES)  # api key -> id
+
+    def _to_dict(self, row) -> Dict[str, Any]:
+        return {field: getattr(row, field) for field in USER_FIELDS}
+
+    async def _one(self, *conditions) -> Optional[Dict[str, Any]]:
+        async with async_session() as session:
+            row = (await session.execute(
+                select(*USER_COLUMNS).where(*conditions)
+            )).one_or_none()
+        if row is None:
+            return None
+        user = self._to_dict(row)
+        self._cache.set(user["id"], (time.time() + settings.USER_CACHE_TTL, user))
+        return user
+
+    async def get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        cached = self._cache.get(user_id)
+        if cached is not None and cached[0] > time.time():
+            return cached[1]
+        return await self._one(User.id == user_id)
+
+    async def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        return await self._one(User.email == normalize_email(email))
+
+    async def get_by_api_key(self, api_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Checked on every API request, so a known key costs what get() does.
+        A hit is checked against the cached user's api_key, so a key
+        regenerated (or an account suspended) on another worker keeps
+        working here for up to USER_CACHE_TTL seconds; on this worker
+        update() takes effect at once.
+        """
+        user_id = self._api_keys.get(api_key)
+        if user_id is not None:
+            user = await self.get(user_id)
+            if user is not None and user["api_key"] == api_key:
+                return user
+            self._api_keys.delete(api_key)  # regenerated
+        user = await self._one(User.api_key == api_key)
+        if user is not None:
+            self._api_keys.set(api_key, user["id"])
+        return user
+
+    async def create(self, email: str, password_hash: str, name: Optional[str] = None, **fields) -> Optional[Dict[str, Any]]:
+        """Insert a user; returns None if the email is already registered."""
+        values = {"email": normalize_email(email), "password_hash": password_hash, "name": name, **fields}
+        try:
+            async with async_session() as session:
+                user_id = (await session.execute(insert(User).returning(User.id), [values])).scalar_one()
+                await session.commit()
+        except IntegrityError:
+            return None
+        return await self._one(User.id == user_id)
+
+    async def update(self, user_id: int, **fields) -> Optional[Dict[str, Any]]:
+        """
+        Change columns of a user and return it, or None if there is no
+        such user. Raises ValueError for an email or api_key in use.
+        """
+        unknown = set(fields) - UPDATABLE_FIELDS
+        if unknown:
+            raise ValueError(f"Cannot update: {', '.join(sorted(unknown))}")
+        if "email" in fields:
+            fields["email"] = normalize_email(fields["email"])
+        self._cache.delete(user_id)
+        try:
+            async with async_session() as session:
+                result = await session.execute(update(User).where(User.id == user_id).values(**fields))
+                await session.commit()
+        except IntegrityError as e:
+            raise ValueError("Email or API key already in use") from e
+        if result.rowcount == 0:
+            return None
+        return await self._one(User.id == user_id)
+
+    async def list(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        email_prefix: Optional[str] = None,
+        tier: Optional[str] = None,
+        is_active: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """
+        One page of users. Without a search, newest first on the primary
+        key; with an email prefix, alphabetically as a range scan of the
+        email index. Pass the returned `next_cursor` as `cursor` for the
+        next page of the same search.
+        """
+        query = select(*USER_COLUMNS)
+        if email_prefix:
+            order = "email"
+            prefix = normalize_email(email_prefix)
+            query = query.where(User.email >= prefix, User.email < prefix + "\U0010ffff").order_by(User.email)
+            if cursor:
+                query = query.where(User.email > decode_cursor(cursor, order))
+        else:
+            order = "id"
+            query = query.order_by(User.id.desc())
+            if cursor:
+                query = query.where(User.id < decode_cursor(cursor, order))
+        if tier is not None:
+            query = query.where(User.tier == tier)
+        if is_active is not None:
+            query = query.where(User.is_active == is_active)
+        # One extra row tells us whether another page exists
+        query = query.limit(limit + 1)
+
+        async with async_session() as session:
+            rows = (await session.execute(query)).all()
+        has_more = len(rows) > limit
+        users: List[Dict[str, Any]] = [self._to_dict(row) for row in rows[:limit]]
+        return {
+            "users": users,
+            "next_cursor": encode_cursor(order, users[-1][order]) if has_more else None,
+            "limit": limit,
+        }
+
+
+# Singleton instance
+user_store = UserStore()